@@ -0,0 +1,144 @@
+"""
+Latency vs. jitter benchmark for the FilterBank smoothing modes.
+Run inside Blender (filters import mathutils), e.g.:
+
+    blender --background --python benchmarks/bench_filters.py
+    blender --background --python benchmarks/bench_filters.py -- stream.npz
+
+Without arguments a synthetic stream is used: idle segments and fast arm
+swings with added landmark noise, so the clean signal is known. With a
+recorded landmark stream (.npz with 'pose' (N, 33, 4) and 'timestamps',
+or a bare .npy pose array) the raw stream is the reference instead.
+
+Reported per filter configuration:
+    jitter  - RMS noise left while idle, relative to the raw input
+              (recorded streams: RMS second difference, relative to raw)
+    latency - lag in frames that best aligns filtered and reference
+              velocity during motion
+    time    - filter cost per frame for all slots
+"""
+
+import sys
+import time
+
+import numpy as np
+
+from live_mocap_addon.runtime.filters import FilterBank
+
+
+FRAME_TIME = 1.0 / 30.0
+MAX_LAG = 15
+
+CONFIGURATIONS = [
+    ("EWMA 0.3", dict(mode='EWMA', smoothing_alpha=0.3)),
+    ("EWMA 0.5", dict(mode='EWMA', smoothing_alpha=0.5)),
+    ("EWMA 0.8", dict(mode='EWMA', smoothing_alpha=0.8)),
+    ("One Euro 1.0/0.5", dict(mode='ONE_EURO', min_cutoff=1.0, beta=0.5)),
+    ("One Euro 0.5/1.0", dict(mode='ONE_EURO', min_cutoff=0.5, beta=1.0)),
+    ("One Euro 1.0/2.0", dict(mode='ONE_EURO', min_cutoff=1.0, beta=2.0)),
+]
+
+
+def make_synthetic_stream(frames=900, slots=16, noise=0.01, seed=0):
+    """
+    Idle/swing trajectories with Gaussian noise.
+
+    Returns:
+        (clean, noisy, moving, settled) with shapes (frames, slots, 3) for
+        the streams and (frames,) bool for the masks. settled marks idle
+        frames at least 0.5 s after a swing.
+    """
+    rng = np.random.default_rng(seed)
+    t = np.arange(frames) * FRAME_TIME
+
+    # Alternate 2 s idle / 1 s fast swing
+    moving = (t % 3.0) >= 2.0
+    phase = np.where(moving, (t % 3.0) - 2.0, 0.0)
+    swing = np.where(moving, np.sin(np.pi * phase) ** 2, 0.0)
+
+    base = rng.uniform(-0.5, 0.5, size=(1, slots, 3))
+    amplitude = rng.uniform(0.2, 0.6, size=(1, slots, 3))
+    clean = base + amplitude * swing[:, np.newaxis, np.newaxis]
+    noisy = clean + rng.normal(scale=noise, size=clean.shape)
+    settled = ((t % 3.0) >= 0.5) & ~moving
+    return clean, noisy, moving, settled
+
+
+def load_recorded_stream(path):
+    """Load a recorded pose stream as (positions, timestamps)."""
+    data = np.load(path, mmap_mode='r') if path.endswith('.npy') else np.load(path)
+    if isinstance(data, np.ndarray):
+        pose = np.asarray(data)
+        timestamps = np.arange(len(pose)) * FRAME_TIME
+    else:
+        pose = np.asarray(data['pose'])
+        timestamps = np.asarray(data['timestamps'], dtype=np.float64)
+    return pose[..., :3].astype(np.float64), timestamps
+
+
+def run_filter(stream, timestamps, options):
+    """Filter a (frames, slots, 3) stream. Returns (filtered, seconds per frame)."""
+    frames, slots, _ = stream.shape
+    bank = FilterBank(slots, min_confidence=0.0, **options)
+    confidences = np.ones(slots)
+    filtered = np.empty_like(stream)
+
+    t0 = time.perf_counter()
+    for i in range(frames):
+        filtered[i], _ = bank.filter_positions(stream[i], confidences, timestamp=timestamps[i])
+    return filtered, (time.perf_counter() - t0) / frames
+
+
+def estimate_lag(filtered, reference, frames_mask):
+    """Lag in frames maximizing velocity correlation over the masked frames."""
+    v_filtered = np.diff(filtered, axis=0)[frames_mask[1:]].ravel()
+    v_reference = np.diff(reference, axis=0)
+    best_lag, best_score = 0, -np.inf
+    for lag in range(MAX_LAG + 1):
+        shifted = np.roll(v_reference, lag, axis=0)[frames_mask[1:]].ravel()
+        score = np.dot(v_filtered, shifted)
+        if score > best_score:
+            best_lag, best_score = lag, score
+    return best_lag
+
+
+def rms(values):
+    return float(np.sqrt(np.mean(np.square(values))))
+
+
+def benchmark_synthetic():
+    clean, noisy, moving, idle = make_synthetic_stream()
+    timestamps = np.arange(len(clean)) * FRAME_TIME
+    raw_jitter = rms((noisy - clean)[idle])
+
+    print(f"\nSynthetic stream: {clean.shape[0]} frames x {clean.shape[1]} slots")
+    for name, options in CONFIGURATIONS:
+        filtered, per_frame = run_filter(noisy, timestamps, options)
+        jitter = rms((filtered - clean)[idle]) / raw_jitter
+        lag = estimate_lag(filtered, clean, moving)
+        print(f"  {name:<18} jitter {jitter:6.1%} | latency {lag:2d} frames | {per_frame * 1e6:7.1f} us/frame")
+
+
+def benchmark_recorded(path):
+    stream, timestamps = load_recorded_stream(path)
+    raw_jitter = rms(np.diff(stream, n=2, axis=0))
+    everywhere = np.ones(len(stream), dtype=bool)
+
+    print(f"\nRecorded stream '{path}': {stream.shape[0]} frames x {stream.shape[1]} landmarks")
+    for name, options in CONFIGURATIONS:
+        filtered, per_frame = run_filter(stream, timestamps, options)
+        jitter = rms(np.diff(filtered, n=2, axis=0)) / raw_jitter
+        lag = estimate_lag(filtered, stream, everywhere)
+        print(f"  {name:<18} jitter {jitter:6.1%} | latency {lag:2d} frames | {per_frame * 1e6:7.1f} us/frame")
+
+
+if __name__ == "__main__":
+    print("=" * 60)
+    print("FILTER LATENCY / JITTER")
+    print("=" * 60)
+    argv = sys.argv[sys.argv.index("--") + 1:] if "--" in sys.argv else []
+    if argv:
+        for stream_path in argv:
+            benchmark_recorded(stream_path)
+    else:
+        benchmark_synthetic()
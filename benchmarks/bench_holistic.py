@@ -0,0 +1,96 @@
+"""
+Per-frame cost of the Holistic and pose-guided crop tracker modes against
+separate pose, hands and face solutions (runtime/trackers.py). Run inside
+Blender with the add-on's dependencies installed, e.g.:
+
+    blender --background --python benchmarks/bench_holistic.py -- clip.mp4
+    blender --background --python benchmarks/bench_holistic.py -- clip.mp4 300 1
+
+Arguments are a video file, the number of frames (default 300) and the
+model complexity (default 1). The frames are decoded up front, so only
+inference is timed. All modes track pose, hands and face:
+
+    separate  - Pose, Hands and FaceMesh, each on the full frame
+    holistic  - one Holistic graph; hands and face are cropped from the pose
+    crops     - separate solutions, hands and face on pose-guided crops
+                resized to the model input (skipped when not visible)
+
+Reported per mode:
+    ms/frame   - mean and 95th percentile process_frame time
+    detected   - fraction of frames with pose, at least one hand, and face
+"""
+
+import sys
+import time
+
+import numpy as np
+
+from live_mocap_addon.runtime.capture import VideoFileSource
+from live_mocap_addon.runtime.trackers import MediaPipeTrackers
+
+
+def load_frames(path, frame_count):
+    source = VideoFileSource(path, realtime=False)
+    if not source.open():
+        raise SystemExit(f"Failed to open {path}")
+    frames = []
+    while len(frames) < frame_count:
+        result = source.read_frame()
+        if not result:
+            if source.is_finished():
+                break
+            time.sleep(0.001)
+            continue
+        frames.append(result[2].copy())
+    source.release()
+    return frames
+
+
+def run(trackers, frames):
+    if not trackers.initialize():
+        raise SystemExit("Failed to initialize MediaPipe")
+
+    times = np.empty(len(frames))
+    detected = np.zeros((len(frames), 3), dtype=bool)
+    for i, frame in enumerate(frames):
+        t0 = time.perf_counter()
+        result = trackers.process_frame(frame)
+        times[i] = time.perf_counter() - t0
+        detected[i] = (bool(result.pose_landmarks), bool(result.hand_landmarks), bool(result.face_landmarks))
+    trackers.cleanup()
+    return times, detected.mean(axis=0)
+
+
+def benchmark(path, frame_count, model_complexity):
+    frames = load_frames(path, frame_count)
+    height, width = frames[0].shape[:2]
+    print(f"\nVideo: {path}, {len(frames)} frames at {width}x{height}, model complexity {model_complexity}")
+
+    options = dict(use_pose=True, use_hands=True, use_face=True, model_complexity=model_complexity)
+    results = {}
+    modes = (
+        ("separate", dict()),
+        ("holistic", dict(use_holistic=True)),
+        ("crops", dict(use_roi_crops=True)),
+    )
+    for name, mode in modes:
+        times, rates = run(MediaPipeTrackers(**mode, **options), frames)
+        results[name] = times.mean()
+        print(f"  {name:<9} {times.mean() * 1e3:6.1f} ms/frame (p95 {np.percentile(times, 95) * 1e3:6.1f} ms) | "
+              f"detected pose {rates[0]:4.0%} hands {rates[1]:4.0%} face {rates[2]:4.0%}")
+
+    for name in ("holistic", "crops"):
+        print(f"  {name} speedup {results['separate'] / results[name]:.2f}x")
+
+
+if __name__ == "__main__":
+    print("=" * 60)
+    print("HOLISTIC AND CROPS VS SEPARATE SOLUTIONS")
+    print("=" * 60)
+    argv = sys.argv[sys.argv.index("--") + 1:] if "--" in sys.argv else sys.argv[1:]
+    if not argv:
+        print("Usage: blender --background --python benchmarks/bench_holistic.py -- clip.mp4 [frames] [complexity]")
+        sys.exit(1)
+    frame_count = int(argv[1]) if len(argv) > 1 else 300
+    model_complexity = int(argv[2]) if len(argv) > 2 else 1
+    benchmark(argv[0], frame_count, model_complexity)
@@ -0,0 +1,185 @@
+"""
+Stutter benchmark for the Rokoko jitter buffer (core/jitter_buffer.py).
+Runs with plain Python, no Blender needed:
+
+    python benchmarks/bench_jitter_buffer.py
+    python benchmarks/bench_jitter_buffer.py capture.bin
+
+A UdpReplay stand-in for Rokoko Studio sends packets to a local port
+with random network jitter. The receiver thread decodes them, and a
+simulated modal timer ticks at the receiver FPS and plays either the
+newest packet or the jitter buffer output.
+
+Without arguments a synthetic JSON v3 stream is sent: one actor whose
+hip rotates at a constant rate. With a capture written by
+jitter_buffer.save_packets, that stream is replayed instead.
+
+Reported per configuration:
+    stutter  - RMS deviation of the per-tick Studio time step from the
+               ideal tick length (lower is smoother)
+    repeats  - ticks that applied no newer pose than the previous tick
+    latency  - mean local delay of the played Studio time
+    buffer   - underruns and late packets of the jitter buffer
+"""
+
+import importlib
+import json
+import math
+import os
+import socket
+import sys
+import threading
+import time
+import types
+
+import numpy as np
+
+CORE_PATH = os.path.join(
+    os.path.dirname(os.path.dirname(os.path.abspath(__file__))),
+    "rokoko-studio-live-blender-master", "core"
+)
+
+STREAM_FPS = 60
+TICK_FPS = 60
+DURATION = 5.0
+PORT = 14143
+
+CONFIGURATIONS = [
+    ("newest packet, 0 ms jitter", 0.000, None),
+    ("newest packet, 20 ms jitter", 0.020, None),
+    ("buffer 30 ms, 20 ms jitter", 0.020, 0.030),
+    ("buffer 50 ms, 20 ms jitter", 0.020, 0.050),
+    ("newest packet, 40 ms jitter", 0.040, None),
+    ("buffer 60 ms, 40 ms jitter", 0.040, 0.060),
+]
+
+
+def load_core():
+    # Load the bpy-free core modules without running the add-on's core/__init__.py
+    package = types.ModuleType("rokoko_core")
+    package.__path__ = [CORE_PATH]
+    sys.modules["rokoko_core"] = package
+    return importlib.import_module("rokoko_core.jitter_buffer"), importlib.import_module("rokoko_core.live_data_manager")
+
+
+def make_packets(duration, fps):
+    packets = []
+    for i in range(int(duration * fps)):
+        timestamp = i / fps
+        angle = 0.5 * math.pi * timestamp
+        data = {
+            'version': 3,
+            'fps': fps,
+            'scene': {
+                'timestamp': timestamp,
+                'actors': [{
+                    'name': 'Actor',
+                    'meta': {'hasFace': False},
+                    'body': {'hip': {
+                        'position': {'x': 0.0, 'y': 1.0, 'z': timestamp},
+                        'rotation': {'x': 0.0, 'y': math.sin(angle / 2), 'z': 0.0, 'w': math.cos(angle / 2)},
+                    }},
+                }],
+                'props': [],
+            },
+        }
+        packets.append((timestamp, json.dumps(data).encode()))
+    return packets
+
+
+class TickReceiver:
+    """Minimal stand-in for core.receiver.Receiver.run_threaded without Blender."""
+
+    def __init__(self, jitter_buffer, live_data_manager, delay):
+        self.live_data_manager = live_data_manager
+        self.buffer = jitter_buffer.JitterBuffer(delay) if delay is not None else None
+        self.sock = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
+        self.sock.bind(('127.0.0.1', PORT))
+        self.sock.settimeout(0.1)
+        self.lock = threading.Lock()
+        self.newest = None
+        self.running = True
+        self.thread = threading.Thread(target=self.receive, daemon=True)
+        self.thread.start()
+
+    def receive(self):
+        get_timestamp = self.live_data_manager.get_packet_timestamp
+        while self.running:
+            try:
+                data_raw, address = self.sock.recvfrom(81920)
+            except socket.timeout:
+                continue
+            except OSError:
+                break
+            data = self.live_data_manager.decode_packet(data_raw)
+            if self.buffer:
+                self.buffer.push(data)
+                continue
+            with self.lock:
+                if self.newest is None or get_timestamp(data) > get_timestamp(self.newest):
+                    self.newest = data
+
+    def tick(self):
+        if self.buffer:
+            return self.buffer.sample()
+        with self.lock:
+            data, self.newest = self.newest, None
+        return data
+
+    def stop(self):
+        self.running = False
+        self.thread.join(1)
+        self.sock.close()
+
+
+def run_configuration(jitter_buffer, live_data_manager, packets, jitter, delay):
+    receiver = TickReceiver(jitter_buffer, live_data_manager, delay)
+    replay = jitter_buffer.UdpReplay(packets, PORT, jitter=jitter)
+    start = time.perf_counter()
+    replay.start()
+
+    played = []
+    tick = 1.0 / TICK_FPS
+    next_tick = start + tick
+    end = start + packets[-1][0] - packets[0][0] + jitter + 0.2
+    while next_tick < end:
+        time.sleep(max(0.0, next_tick - time.perf_counter()))
+        data = receiver.tick()
+        now = time.perf_counter()
+        timestamp = live_data_manager.get_packet_timestamp(data) if data else (played[-1][1] if played else None)
+        if timestamp is not None:
+            played.append((now - start, timestamp))
+        next_tick += tick
+
+    replay.stop()
+    receiver.stop()
+
+    # Skip the start-up second
+    played = np.array([p for p in played if p[0] > 1.0])
+    steps = np.diff(played[:, 1])
+    stutter = np.sqrt(np.mean((steps - tick) ** 2)) * 1000
+    repeats = int(np.count_nonzero(steps <= 0))
+    first_timestamp = live_data_manager.get_packet_timestamp(live_data_manager.decode_packet(packets[0][1]))
+    latency = np.mean(played[:, 0] - (played[:, 1] - first_timestamp)) * 1000
+    stats = receiver.buffer.get_stats() if receiver.buffer else None
+    return stutter, repeats, latency, stats
+
+
+def benchmark(packets):
+    jitter_buffer, live_data_manager = load_core()
+    print(f"\nStream: {len(packets)} packets, ticks at {TICK_FPS} Hz")
+    for name, jitter, delay in CONFIGURATIONS:
+        stutter, repeats, latency, stats = run_configuration(jitter_buffer, live_data_manager, packets, jitter, delay)
+        buffer = f" | underruns {stats[2]:3d} | late {stats[3]:3d}" if stats else ""
+        print(f"  {name:<28} stutter {stutter:5.1f} ms | repeats {repeats:3d} | latency {latency:5.1f} ms{buffer}")
+
+
+if __name__ == "__main__":
+    print("=" * 60)
+    print("ROKOKO JITTER BUFFER")
+    print("=" * 60)
+    if len(sys.argv) > 1:
+        jitter_buffer, live_data_manager = load_core()
+        benchmark(jitter_buffer.load_packets(sys.argv[1]))
+    else:
+        benchmark(make_packets(DURATION, STREAM_FPS))
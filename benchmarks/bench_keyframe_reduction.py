@@ -0,0 +1,160 @@
+"""
+Keyframe reduction benchmark for recording.clean_fcurves.
+Run inside Blender (recording imports bpy), e.g.:
+
+    blender --background --python benchmarks/bench_keyframe_reduction.py
+    blender --background --python benchmarks/bench_keyframe_reduction.py -- 36000
+
+Builds a throwaway armature with BONES bones and a long synthetic take
+(one quaternion key per bone per frame, as live recording writes it):
+slow drifts, idle holds, fast swings and residual filter jitter.
+
+Reported per rotation tolerance:
+    keys     - key count before and after, and the reduction ratio
+    error    - largest angular error of the reduced curves over all frames
+    reduce   - time spent in clean_fcurves
+    playback - scene.frame_set cost per frame before and after
+"""
+
+import sys
+import time
+
+import bpy
+import numpy as np
+
+from live_mocap_addon.runtime.recording import clean_fcurves, get_action_fcurves
+
+
+FRAME_TIME = 1.0 / 30.0
+BONES = 20
+TOLERANCES_DEG = [0.1, 0.25, 0.5, 1.0]
+PLAYBACK_FRAMES = 600
+
+
+def make_take(frames, bones, jitter_deg=0.05, seed=0):
+    """Synthetic (frames, bones, 4) quaternion take."""
+    rng = np.random.default_rng(seed)
+    t = np.arange(frames) * FRAME_TIME
+
+    # 4 s hold / 2 s slow drift / 1 s fast swing
+    phase = t % 7.0
+    drift = np.clip(phase - 4.0, 0.0, 2.0) / 2.0
+    swing = np.where(phase >= 6.0, np.sin(np.pi * (phase - 6.0)) ** 2, 0.0)
+
+    axes = rng.normal(size=(bones, 3))
+    axes /= np.linalg.norm(axes, axis=1, keepdims=True)
+    drift_amplitude = rng.uniform(0.1, 0.5, size=bones)
+    swing_amplitude = rng.uniform(0.3, 1.2, size=bones)
+    cycle = np.floor(t / 7.0)
+
+    angle = (
+        drift_amplitude[np.newaxis] * (cycle[:, np.newaxis] % 2 + drift[:, np.newaxis])
+        + swing_amplitude[np.newaxis] * swing[:, np.newaxis]
+        + np.radians(jitter_deg) * rng.normal(size=(frames, bones))
+    )
+    half = 0.5 * angle[..., np.newaxis]
+    return np.concatenate([np.cos(half), np.sin(half) * axes[np.newaxis]], axis=-1)
+
+
+def make_rig(bones):
+    """Armature object with a chain of bones, linked to the scene."""
+    armature = bpy.data.armatures.new("BenchRig")
+    rig = bpy.data.objects.new("BenchRig", armature)
+    bpy.context.scene.collection.objects.link(rig)
+    bpy.context.view_layer.objects.active = rig
+
+    bpy.ops.object.mode_set(mode='EDIT')
+    for i in range(bones):
+        bone = armature.edit_bones.new(f"bone{i:02d}")
+        bone.head = (0.0, 0.0, 0.1 * i)
+        bone.tail = (0.0, 0.0, 0.1 * i + 0.1)
+    bpy.ops.object.mode_set(mode='OBJECT')
+
+    for pose_bone in rig.pose.bones:
+        pose_bone.rotation_mode = 'QUATERNION'
+    rig.animation_data_create()
+    return rig
+
+
+def write_take(rig, take):
+    """Write the take as one key per frame and return the F-Curves."""
+    action = bpy.data.actions.new("BenchTake")
+    rig.animation_data.action = action
+    fcurves = get_action_fcurves(rig, action)
+
+    frames = np.arange(1, len(take) + 1, dtype=np.float32)
+    co = np.empty((len(take), 2), dtype=np.float32)
+    co[:, 0] = frames
+    for b, pose_bone in enumerate(rig.pose.bones):
+        data_path = pose_bone.path_from_id("rotation_quaternion")
+        for index in range(4):
+            fcurve = fcurves.new(data_path, index=index, action_group=pose_bone.name)
+            co[:, 1] = take[:, b, index]
+            fcurve.keyframe_points.add(len(co))
+            fcurve.keyframe_points.foreach_set("co", co.ravel())
+            fcurve.update()
+    return action, fcurves
+
+
+def count_keys(fcurves):
+    return sum(len(fcurve.keyframe_points) for fcurve in fcurves)
+
+
+def max_angular_error(rig, fcurves, take):
+    """Largest angle between the original and the evaluated reduced rotation."""
+    worst = 0.0
+    frames = np.arange(1, len(take) + 1)
+    for b, pose_bone in enumerate(rig.pose.bones):
+        data_path = pose_bone.path_from_id("rotation_quaternion")
+        evaluated = np.stack([
+            [fcurves.find(data_path, index=index).evaluate(frame) for frame in frames]
+            for index in range(4)
+        ], axis=1)
+        evaluated /= np.linalg.norm(evaluated, axis=1, keepdims=True)
+        dots = np.abs(np.einsum('ij,ij->i', evaluated, take[:, b]))
+        worst = max(worst, float(np.degrees(2.0 * np.arccos(np.clip(dots, 0.0, 1.0))).max()))
+    return worst
+
+
+def time_playback(frames):
+    """Average scene.frame_set cost over the first PLAYBACK_FRAMES frames."""
+    scene = bpy.context.scene
+    count = min(frames, PLAYBACK_FRAMES)
+    t0 = time.perf_counter()
+    for frame in range(1, count + 1):
+        scene.frame_set(frame)
+    return (time.perf_counter() - t0) / count
+
+
+def benchmark(frames):
+    take = make_take(frames, BONES)
+    rig = make_rig(BONES)
+    print(f"\nTake: {frames} frames ({frames * FRAME_TIME / 60.0:.1f} min) x {BONES} bones")
+
+    for tolerance in TOLERANCES_DEG:
+        action, fcurves = write_take(rig, take)
+        playback_before = time_playback(frames)
+
+        t0 = time.perf_counter()
+        keys_before, keys_after = clean_fcurves(fcurves, default_tolerance=np.radians(tolerance))
+        reduce_time = time.perf_counter() - t0
+
+        playback_after = time_playback(frames)
+        error = max_angular_error(rig, fcurves, take)
+        print(
+            f"  tol {tolerance:4.2f} deg | keys {keys_before:7d} -> {keys_after:6d} "
+            f"({keys_before / max(keys_after, 1):5.1f}x) | error {error:5.3f} deg | "
+            f"reduce {reduce_time:5.2f} s | playback {playback_before * 1e3:6.3f} -> "
+            f"{playback_after * 1e3:6.3f} ms/frame"
+        )
+
+        rig.animation_data.action = None
+        bpy.data.actions.remove(action)
+
+
+if __name__ == "__main__":
+    print("=" * 60)
+    print("KEYFRAME REDUCTION")
+    print("=" * 60)
+    argv = sys.argv[sys.argv.index("--") + 1:] if "--" in sys.argv else []
+    benchmark(int(argv[0]) if argv else 18000)
@@ -0,0 +1,242 @@
+"""
+Per-packet benchmark for the Rokoko actor retargeting (core/animations.py).
+Run inside Blender, e.g.:
+
+    blender --background --python benchmarks/bench_rokoko_actor.py
+    blender --background --python benchmarks/bench_rokoko_actor.py -- 2000 3
+
+Arguments are the number of packets and the number of actors (defaults:
+1000 packets, 3 actors). The core modules are loaded straight from their
+folder, so the Rokoko add-on does not need to be enabled; the few object
+and scene properties the retargeting reads are registered here.
+
+Every actor drives its own armature with one bone per Studio bone
+(including the glove bones) in a chain, with a T-pose saved like the
+"Set as T-Pose" operator does. Packets are synthetic JSON v3 frames with
+random bone rotations. Reported per configuration:
+    packets/s  - animate_actor calls per second for one actor
+    us/bone    - time per animated bone
+    parity     - largest difference of the resulting bone matrices
+                 against the former per-bone implementation (kept below
+                 as reference)
+"""
+
+import importlib
+import math
+import os
+import sys
+import time
+import types
+
+import bpy
+import numpy as np
+from mathutils import Matrix, Quaternion
+
+CORE_PATH = os.path.join(
+    os.path.dirname(os.path.dirname(os.path.abspath(__file__))),
+    "rokoko-studio-live-blender-master", "core"
+)
+
+
+def load_animations():
+    # Load the core modules without running the add-on's core/__init__.py
+    package = types.ModuleType("rokoko_core")
+    package.__path__ = [CORE_PATH]
+    sys.modules["rokoko_core"] = package
+    return importlib.import_module("rokoko_core.animations")
+
+
+def register_properties(animation_lists):
+    bpy.types.Scene.rsl_recording = bpy.props.BoolProperty(default=False)
+    bpy.types.Object.rsl_animations_actors = bpy.props.StringProperty()
+    for bone_name in animation_lists.get_bones().keys():
+        setattr(bpy.types.Object, 'rsl_actor_' + bone_name, bpy.props.StringProperty())
+
+
+# ---------- Former per-bone implementation (reference) ----------
+
+def reference_animate_actor(animations, obj, actor):
+    live_data = animations.live_data
+    tpose_bones = obj.get('CUSTOM').get('rsl_tpose_bones')
+
+    for bone_name, studio_reference_tpose_rot in animations.animation_lists.get_bones(with_gloves=live_data.has_gloves(actor)).items():
+        bone_name_assigned = getattr(obj, 'rsl_actor_' + bone_name)
+        bone = obj.pose.bones.get(bone_name_assigned)
+        bone_data = obj.data.bones.get(bone_name_assigned)
+        bone_tpose_data = tpose_bones.get(bone_name_assigned)
+        actor_bone_data = actor['body'][bone_name]
+        if not bone or not bone_tpose_data:
+            continue
+
+        if bone.rotation_mode == 'QUATERNION':
+            bone.rotation_mode = 'XYZ'
+        bone_data.use_inherit_rotation = False
+
+        bone_tpose_rot_global = Quaternion(bone_tpose_data['rotation_global'])
+        studio_new_pose = Quaternion((
+            float(actor_bone_data['rotation']['w']),
+            float(actor_bone_data['rotation']['x']),
+            float(actor_bone_data['rotation']['y']),
+            float(actor_bone_data['rotation']['z']),
+        ))
+
+        def rot_to_blender(rot):
+            return Quaternion((rot.w, rot.x, -rot.y, -rot.z)) @ Quaternion((0, 0, 0, 1))
+
+        mat_obj = obj.matrix_local.decompose()[1].to_matrix().to_4x4()
+        mat_default = Matrix(((1, 0, 0, 0), (0, 0, -1, 0), (0, 1, 0, 0), (0, 0, 0, 1)))
+        rot_transform = (mat_default.inverted() @ mat_obj).to_quaternion()
+
+        bone_tpose_rot_global = rot_transform @ bone_tpose_rot_global
+        rot_offset_ref = rot_to_blender(studio_reference_tpose_rot).inverted() @ bone_tpose_rot_global
+        final_rot = rot_transform.inverted() @ (rot_to_blender(studio_new_pose) @ rot_offset_ref)
+
+        orig_loc, _, _ = bone.matrix.decompose()
+        bone.matrix = Matrix.Translation(orig_loc) @ final_rot.to_matrix().to_4x4()
+
+        if bone_name == 'hip':
+            axis = 0
+            multiplier = 1
+            if round(mat_obj[2][0], 0) == round(mat_obj[2][2], 0) == 0:
+                axis = 1
+                multiplier = mat_obj[2][1]
+            if round(mat_obj[2][0], 0) == round(mat_obj[2][1], 0) == 0:
+                axis = 2
+                multiplier = mat_obj[2][2]
+
+            studio_hip_height = actor.get('dimensions').get('hipHeight') or 1
+            tpose_hip_location_y = bone_tpose_data['location_object'][axis] * multiplier
+            bone.location = animations.pos_hips_studio_to_blender(
+                actor_bone_data['position']['x'] * tpose_hip_location_y / studio_hip_height,
+                actor_bone_data['position']['y'] * tpose_hip_location_y - tpose_hip_location_y * studio_hip_height,
+                actor_bone_data['position']['z'] * tpose_hip_location_y / studio_hip_height)
+
+
+# ---------- Synthetic scene ----------
+
+def make_armature(animations, name, offset):
+    bone_names = list(animations.animation_lists.get_bones().keys())
+
+    armature = bpy.data.armatures.new(name)
+    obj = bpy.data.objects.new(name, armature)
+    bpy.context.scene.collection.objects.link(obj)
+    obj.location = (offset, 0, 0)
+    obj.rotation_euler = (0, 0, math.radians(30))
+
+    bpy.context.view_layer.objects.active = obj
+    bpy.ops.object.mode_set(mode='EDIT')
+    parent = None
+    for i, bone_name in enumerate(bone_names):
+        edit_bone = armature.edit_bones.new(bone_name)
+        edit_bone.head = (0, 0, 0.05 * i)
+        edit_bone.tail = (0, 0.01, 0.05 * i + 0.05)
+        edit_bone.parent = parent
+        parent = edit_bone
+    bpy.ops.object.mode_set(mode='OBJECT')
+
+    # Assign the bones and save the T-pose
+    obj.rsl_animations_actors = name
+    bones = {}
+    for bone_name in bone_names:
+        setattr(obj, 'rsl_actor_' + bone_name, bone_name)
+        bone = obj.pose.bones[bone_name]
+        bones[bone_name] = {
+            'location_local': bone.location,
+            'location_object': bone.matrix @ bone.location,
+            'rotation_local': bone.rotation_quaternion,
+            'rotation_global': bone.matrix.to_quaternion(),
+            'inherit_rotation': True,
+        }
+    obj['CUSTOM'] = {'rsl_tpose_bones': bones}
+    return obj
+
+
+def make_packet(animations, names, rng, timestamp):
+    bone_names = list(animations.animation_lists.get_bones().keys())
+    actors = []
+    for name in names:
+        rotations = rng.normal(size=(len(bone_names), 4))
+        rotations /= np.linalg.norm(rotations, axis=1, keepdims=True)
+        body = {
+            bone_name: {
+                'position': {'x': 0.1, 'y': 1.0, 'z': 0.2},
+                'rotation': {'w': float(w), 'x': float(x), 'y': float(y), 'z': float(z)},
+            }
+            for bone_name, (w, x, y, z) in zip(bone_names, rotations)
+        }
+        actors.append({
+            'name': name,
+            'meta': {'hasFace': False, 'hasGloves': True},
+            'dimensions': {'hipHeight': 1.0},
+            'body': body,
+        })
+    return {'version': 3, 'fps': 60, 'scene': {'timestamp': timestamp, 'actors': actors, 'props': []}}
+
+
+# ---------- Benchmarks ----------
+
+def run(animations, objects, packets, animate):
+    live_data = animations.live_data
+    t0 = time.perf_counter()
+    for packet in packets:
+        live_data.init_decoded(packet)
+        for obj in objects:
+            animate(obj)
+    return time.perf_counter() - t0
+
+
+def bone_matrices(obj):
+    return np.array([[list(row) for row in bone.matrix] for bone in obj.pose.bones])
+
+
+def benchmark(packet_count, actor_count):
+    animations = load_animations()
+    register_properties(animations.animation_lists)
+
+    names = [f"BenchActor{a}" for a in range(actor_count)]
+    objects = [make_armature(animations, name, a) for a, name in enumerate(names)]
+    bone_count = len(animations.animation_lists.get_bones())
+
+    rng = np.random.default_rng(0)
+    packets = [make_packet(animations, names, rng, i / 60) for i in range(packet_count)]
+
+    print(f"\nScene: {actor_count} actors x {bone_count} bones, {packet_count} packets")
+
+    def reference(obj):
+        reference_animate_actor(animations, obj, animations.live_data.get_actor_by_obj(obj))
+
+    def uncached(obj):
+        animations.clear_actor_solves()
+        animations.animate_actor(obj)
+
+    configurations = [
+        ("former per-bone", reference),
+        ("cache rebuilt per packet", uncached),
+        ("cached", animations.animate_actor),
+    ]
+
+    results = {}
+    for name, animate in configurations:
+        animations.clear_actor_solves()
+        elapsed = run(animations, objects, packets, animate)
+        results[name] = [bone_matrices(obj) for obj in objects]
+        per_actor = elapsed / (packet_count * actor_count)
+        print(f"  {name:<26} {1 / per_actor:9.0f} packets/s per actor | {per_actor / bone_count * 1e6:6.2f} us/bone")
+
+    error = max(np.abs(a - b).max() for a, b in zip(results["former per-bone"], results["cached"]))
+    print(f"  parity   max bone matrix difference {error:.2e}")
+
+    for obj in objects:
+        armature = obj.data
+        bpy.data.objects.remove(obj)
+        bpy.data.armatures.remove(armature)
+
+
+if __name__ == "__main__":
+    print("=" * 60)
+    print("ROKOKO ACTOR RETARGETING")
+    print("=" * 60)
+    argv = sys.argv[sys.argv.index("--") + 1:] if "--" in sys.argv else []
+    packet_count = int(argv[0]) if argv else 1000
+    actor_count = int(argv[1]) if len(argv) > 1 else 3
+    benchmark(packet_count, actor_count)
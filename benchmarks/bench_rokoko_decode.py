@@ -0,0 +1,225 @@
+"""
+Receive and decode microbenchmark for Rokoko packets (core/receiver.py,
+core/live_data_manager.py). Runs with plain Python, no Blender needed:
+
+    python benchmarks/bench_rokoko_decode.py
+    python benchmarks/bench_rokoko_decode.py capture.bin
+
+Without arguments a synthetic JSON v3 corpus is used: 3 actors with
+gloves and faces at 100 Hz, LZ4 compressed when the lz4 module is
+installed. With a capture written by jitter_buffer.save_packets, the
+captured packets are decoded instead.
+
+Every packet is sent over a local UDP socket and received either the
+former way (recvfrom into a new bytes object, decompress, json.loads) or
+through the reused receive buffer (recvfrom_into, memoryview,
+decode_packet). The buffer path runs once with the stdlib json module and
+once with orjson, when it is installed. Reported per configuration:
+    us/packet   - receive and decode time per packet
+    decode      - decode time alone, without the socket
+    gc          - garbage collections and the time spent in them
+    peak        - peak memory allocated while decoding one packet
+                  (tracemalloc, decode only)
+"""
+
+import gc
+import importlib
+import json
+import math
+import os
+import socket
+import sys
+import time
+import tracemalloc
+import types
+
+CORE_PATH = os.path.join(
+    os.path.dirname(os.path.dirname(os.path.abspath(__file__))),
+    "rokoko-studio-live-blender-master", "core"
+)
+
+PACKET_SIZE = 81920
+PORT = 14144
+ACTORS = 3
+STREAM_FPS = 100
+DURATION = 10.0
+BONES = [
+    'hip', 'spine', 'chest', 'neck', 'head',
+    'leftShoulder', 'leftUpperArm', 'leftLowerArm', 'leftHand',
+    'rightShoulder', 'rightUpperArm', 'rightLowerArm', 'rightHand',
+    'leftUpLeg', 'leftLeg', 'leftFoot', 'leftToe',
+    'rightUpLeg', 'rightLeg', 'rightFoot', 'rightToe',
+] + [
+    side + finger + joint
+    for side in ('left', 'right')
+    for finger in ('Thumb', 'Index', 'Middle', 'Ring', 'Little')
+    for joint in ('Proximal', 'Medial', 'Distal')
+]
+FACE_SHAPES = 52
+
+
+def load_live_data_manager():
+    # Load the bpy-free module without running the add-on's core/__init__.py
+    package = types.ModuleType("rokoko_core")
+    package.__path__ = [CORE_PATH]
+    sys.modules["rokoko_core"] = package
+    return importlib.import_module("rokoko_core.live_data_manager")
+
+
+def make_packets(live_data_manager, duration, fps):
+    packets = []
+    for i in range(int(duration * fps)):
+        timestamp = i / fps
+        actors = []
+        for a in range(ACTORS):
+            angle = 0.5 * math.pi * timestamp + a
+            rotation = {'x': 0.0, 'y': math.sin(angle / 2), 'z': 0.0, 'w': math.cos(angle / 2)}
+            actors.append({
+                'name': f'Actor{a}',
+                'color': [0.5, 0.5, 0.5],
+                'meta': {'hasGloves': True, 'hasLeftGlove': True, 'hasRightGlove': True, 'hasBody': True, 'hasFace': True},
+                'dimensions': {'totalHeight': 1.8, 'hipHeight': 0.95},
+                'body': {
+                    bone: {'position': {'x': 0.01 * b, 'y': 1.0, 'z': timestamp}, 'rotation': rotation}
+                    for b, bone in enumerate(BONES)
+                },
+                'face': {f'shape{s:02d}': (i + s) % 100 for s in range(FACE_SHAPES)},
+            })
+        data = {'version': 3, 'fps': fps, 'scene': {'timestamp': timestamp, 'actors': actors, 'props': []}}
+        packet = json.dumps(data).encode()
+        if live_data_manager.loaded_lz4:
+            packet = live_data_manager.frame.compress(packet)
+        packets.append((timestamp, packet))
+    return packets
+
+
+# ---------- Former receive path (reference) ----------
+
+def reference_decode(live_data_manager, data):
+    try:
+        data = live_data_manager.frame.decompress(data)
+    except (RuntimeError, AttributeError):
+        pass
+    return json.loads(data)
+
+
+class FormerReceiver:
+
+    def __init__(self, sock, live_data_manager):
+        self.sock = sock
+        self.live_data_manager = live_data_manager
+
+    def receive(self):
+        data_raw, address = self.sock.recvfrom(PACKET_SIZE)
+        return reference_decode(self.live_data_manager, data_raw)
+
+
+class BufferReceiver:
+
+    def __init__(self, sock, live_data_manager):
+        self.sock = sock
+        self.live_data_manager = live_data_manager
+        self.buffer = bytearray(PACKET_SIZE)
+        self.buffer_view = memoryview(self.buffer)
+
+    def receive(self):
+        size, address = self.sock.recvfrom_into(self.buffer)
+        return self.live_data_manager.decode_packet(self.buffer_view[:size])
+
+
+# ---------- Benchmarks ----------
+
+class GcMonitor:
+
+    def __init__(self):
+        self.collections = 0
+        self.time = 0.0
+        self.start = 0.0
+
+    def __call__(self, phase, info):
+        if phase == 'start':
+            self.start = time.perf_counter()
+        else:
+            self.collections += 1
+            self.time += time.perf_counter() - self.start
+
+
+def run_socket(receiver_class, live_data_manager, packets):
+    receiver_sock = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
+    receiver_sock.bind(('127.0.0.1', PORT))
+    sender_sock = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
+    receiver = receiver_class(receiver_sock, live_data_manager)
+
+    monitor = GcMonitor()
+    gc.collect()
+    gc.callbacks.append(monitor)
+    t0 = time.perf_counter()
+    for send_time, packet in packets:
+        sender_sock.sendto(packet, ('127.0.0.1', PORT))
+        receiver.receive()
+    elapsed = time.perf_counter() - t0
+    gc.callbacks.remove(monitor)
+
+    sender_sock.close()
+    receiver_sock.close()
+    return elapsed / len(packets), monitor
+
+
+def run_decode(decode, packets):
+    # The buffer path decodes from a memoryview into a reused buffer, the former path from bytes
+    t0 = time.perf_counter()
+    for send_time, packet in packets:
+        decode(packet)
+    elapsed = (time.perf_counter() - t0) / len(packets)
+
+    tracemalloc.start()
+    peak = 0
+    for send_time, packet in packets[:100]:
+        tracemalloc.reset_peak()
+        before = tracemalloc.get_traced_memory()[0]
+        decode(packet)
+        peak = max(peak, tracemalloc.get_traced_memory()[1] - before)
+    tracemalloc.stop()
+    return elapsed, peak
+
+
+def benchmark(live_data_manager, packets):
+    size = sum(len(packet) for send_time, packet in packets) / len(packets)
+    print(f"\nCorpus: {len(packets)} packets, {size / 1024:.1f} KiB on average, "
+          f"lz4 {'installed' if live_data_manager.loaded_lz4 else 'missing'}, "
+          f"orjson {'installed' if live_data_manager.loaded_orjson else 'missing'}")
+
+    buffer = bytearray(PACKET_SIZE)
+    buffer_view = memoryview(buffer)
+
+    def buffer_decode(packet):
+        buffer[:len(packet)] = packet
+        return live_data_manager.decode_packet(buffer_view[:len(packet)])
+
+    configurations = [("former recvfrom + json", FormerReceiver, lambda packet: reference_decode(live_data_manager, packet), False)]
+    configurations.append(("buffer + json", BufferReceiver, buffer_decode, False))
+    if live_data_manager.loaded_orjson:
+        configurations.append(("buffer + orjson", BufferReceiver, buffer_decode, True))
+
+    for name, receiver_class, decode, use_orjson in configurations:
+        orjson_installed = live_data_manager.loaded_orjson
+        live_data_manager.loaded_orjson = use_orjson
+        try:
+            per_packet, monitor = run_socket(receiver_class, live_data_manager, packets)
+            decode_time, peak = run_decode(decode, packets)
+        finally:
+            live_data_manager.loaded_orjson = orjson_installed
+        print(f"  {name:<24} {per_packet * 1e6:7.1f} us/packet | decode {decode_time * 1e6:7.1f} us | "
+              f"gc {monitor.collections:4d} in {monitor.time * 1e3:6.1f} ms | peak {peak / 1024:6.1f} KiB")
+
+
+if __name__ == "__main__":
+    print("=" * 60)
+    print("ROKOKO RECEIVE AND DECODE")
+    print("=" * 60)
+    live_data_manager = load_live_data_manager()
+    jitter_buffer = importlib.import_module("rokoko_core.jitter_buffer")
+    if len(sys.argv) > 1:
+        benchmark(live_data_manager, jitter_buffer.load_packets(sys.argv[1]))
+    else:
+        benchmark(live_data_manager, make_packets(live_data_manager, DURATION, STREAM_FPS))
@@ -0,0 +1,158 @@
+"""
+Per-packet benchmark for the Rokoko face animation (core/animations.py).
+Run inside Blender, e.g.:
+
+    blender --background --python benchmarks/bench_rokoko_face.py
+    blender --background --python benchmarks/bench_rokoko_face.py -- 2000 4
+
+Arguments are the number of packets and the number of characters
+(defaults: 1000 packets, 4 characters). The core modules are loaded
+straight from their folder, so the Rokoko add-on does not need to be
+enabled; the few properties the face animation reads are registered here.
+
+Every character is a mesh with a basis and one shapekey per face shape,
+plus some unassigned shapekeys, driven by its own face in synthetic
+JSON v3 packets. Reported per configuration:
+    ms/packet  - time to animate all characters for one packet, against
+                 the 1 ms budget
+    parity     - largest difference of the resulting shapekey values
+                 against the former per-shapekey implementation (kept
+                 below as reference)
+"""
+
+import importlib
+import os
+import sys
+import time
+import types
+
+import bpy
+import numpy as np
+
+CORE_PATH = os.path.join(
+    os.path.dirname(os.path.dirname(os.path.abspath(__file__))),
+    "rokoko-studio-live-blender-master", "core"
+)
+
+BUDGET = 0.001
+EXTRA_SHAPEKEYS = 20
+
+
+def load_animations():
+    # Load the core modules without running the add-on's core/__init__.py
+    package = types.ModuleType("rokoko_core")
+    package.__path__ = [CORE_PATH]
+    sys.modules["rokoko_core"] = package
+    return importlib.import_module("rokoko_core.animations")
+
+
+def register_properties(animation_lists):
+    bpy.types.Scene.rsl_recording = bpy.props.BoolProperty(default=False)
+    bpy.types.Object.rsl_animations_faces = bpy.props.StringProperty()
+    for shape in animation_lists.face_shapes:
+        setattr(bpy.types.Object, 'rsl_face_' + shape, bpy.props.StringProperty())
+
+
+# ---------- Former per-shapekey implementation (reference) ----------
+
+def reference_animate_face(animations, obj):
+    face = animations.live_data.get_face_by_obj(obj)
+    for shapekey_name in animations.animation_lists.face_shapes:
+        shapekey = obj.data.shape_keys.key_blocks.get(getattr(obj, 'rsl_face_' + shapekey_name))
+        if shapekey:
+            shapekey.slider_min = -1
+            shapekey.value = face[shapekey_name] / 100
+
+
+# ---------- Synthetic scene ----------
+
+def make_face(animations, name):
+    mesh = bpy.data.meshes.new(name)
+    mesh.from_pydata([(0, 0, 0), (1, 0, 0), (1, 1, 0), (0, 1, 0)], [], [(0, 1, 2, 3)])
+    obj = bpy.data.objects.new(name, mesh)
+    bpy.context.scene.collection.objects.link(obj)
+
+    obj.shape_key_add(name='Basis')
+    shapes = list(animations.animation_lists.face_shapes)
+    for i in range(EXTRA_SHAPEKEYS):
+        obj.shape_key_add(name=f'Extra{i:02d}')
+    for shape in shapes:
+        obj.shape_key_add(name='Key_' + shape)
+        setattr(obj, 'rsl_face_' + shape, 'Key_' + shape)
+
+    obj.rsl_animations_faces = name
+    return obj
+
+
+def make_packet(animations, names, rng, timestamp):
+    shapes = animations.animation_lists.face_shapes
+    actors = []
+    for name in names:
+        values = rng.uniform(0, 100, size=len(shapes))
+        actors.append({
+            'name': name,
+            'meta': {'hasFace': True, 'hasGloves': False},
+            'dimensions': {'hipHeight': 1.0},
+            'body': {},
+            'face': {shape: float(value) for shape, value in zip(shapes, values)},
+        })
+    return {'version': 3, 'fps': 60, 'scene': {'timestamp': timestamp, 'actors': actors, 'props': []}}
+
+
+def shapekey_values(obj):
+    key_blocks = obj.data.shape_keys.key_blocks
+    values = np.zeros(len(key_blocks), dtype=np.float32)
+    key_blocks.foreach_get('value', values)
+    return values
+
+
+def benchmark(packet_count, character_count):
+    animations = load_animations()
+    register_properties(animations.animation_lists)
+
+    names = [f"BenchFace{c}" for c in range(character_count)]
+    objects = [make_face(animations, name) for name in names]
+
+    rng = np.random.default_rng(0)
+    packets = [make_packet(animations, names, rng, i / 60) for i in range(packet_count)]
+
+    print(f"\nScene: {character_count} characters x {len(animations.animation_lists.face_shapes)} "
+          f"face shapes (+{EXTRA_SHAPEKEYS} unassigned shapekeys), {packet_count} packets")
+
+    configurations = [
+        ("former per-shapekey", lambda obj: reference_animate_face(animations, obj)),
+        ("mapped foreach_set", animations.animate_face),
+    ]
+
+    results = {}
+    for name, animate in configurations:
+        animations.clear_face_solves()
+        elapsed = 0.0
+        for packet in packets:
+            animations.live_data.init_decoded(packet)
+            t0 = time.perf_counter()
+            for obj in objects:
+                animate(obj)
+            elapsed += time.perf_counter() - t0
+        results[name] = [shapekey_values(obj) for obj in objects]
+        per_packet = elapsed / packet_count
+        status = "within" if per_packet <= BUDGET else "over"
+        print(f"  {name:<22} {per_packet * 1e3:7.3f} ms/packet ({status} the {BUDGET * 1e3:.0f} ms budget)")
+
+    error = max(np.abs(a - b).max() for a, b in zip(results["former per-shapekey"], results["mapped foreach_set"]))
+    print(f"  parity   max shapekey value difference {error:.2e}")
+
+    for obj in objects:
+        mesh = obj.data
+        bpy.data.objects.remove(obj)
+        bpy.data.meshes.remove(mesh)
+
+
+if __name__ == "__main__":
+    print("=" * 60)
+    print("ROKOKO FACE ANIMATION")
+    print("=" * 60)
+    argv = sys.argv[sys.argv.index("--") + 1:] if "--" in sys.argv else []
+    packet_count = int(argv[0]) if argv else 1000
+    character_count = int(argv[1]) if len(argv) > 1 else 4
+    benchmark(packet_count, character_count)
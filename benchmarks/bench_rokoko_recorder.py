@@ -0,0 +1,231 @@
+"""
+Stop-time benchmark for the Rokoko live recorder (core/recorder.py).
+Run inside Blender (the recorder builds actions through bpy), e.g.:
+
+    blender --background --python benchmarks/bench_rokoko_recorder.py
+    blender --background --python benchmarks/bench_rokoko_recorder.py -- 10 3
+
+Arguments are the take length in minutes and the number of actors
+(defaults: 10 minutes, 3 actors). The recorder module is loaded straight
+from its file, so the Rokoko add-on does not need to be enabled.
+
+A synthetic take at RECEIVER_FPS with jittered packet timestamps is
+written into the recorder's channels: per actor one Euler rotation
+channel for every bone, with wrapping angles, plus the hip location,
+and one face with all shape keys. Reported:
+    record  - cost of record_bone per sample (measured on a short run)
+    memory  - size of the recorded arrays
+    stop    - stop_recorder time, split into frame mapping, Euler
+              unwrapping and fcurve creation
+    parity  - frame mapping and unwrapped angles against the former
+              per-sample implementation (kept below as reference)
+"""
+
+import importlib.util
+import math
+import os
+import sys
+import time
+
+import bpy
+import numpy as np
+
+
+RECEIVER_FPS = 60
+ACTOR_BONES = 52
+FACE_SHAPES = 52
+
+RECORDER_PATH = os.path.join(
+    os.path.dirname(os.path.dirname(os.path.abspath(__file__))),
+    "rokoko-studio-live-blender-master", "core", "recorder.py"
+)
+
+
+def load_recorder():
+    spec = importlib.util.spec_from_file_location("rokoko_recorder", RECORDER_PATH)
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    return module
+
+
+# ---------- Former per-sample implementation (reference) ----------
+
+def reference_frames(timestamps, fps):
+    def get_frame(i):
+        return int(round((timestamps[i] - timestamps[0]) * fps, 0))
+
+    frames = []
+    for i in range(len(timestamps)):
+        curr_frame = get_frame(i)
+        if 0 < i < len(timestamps) - 1:
+            prev_frame = get_frame(i - 1)
+            next_frame = get_frame(i + 1)
+            if prev_frame == curr_frame and next_frame == curr_frame + 2:
+                curr_frame += 1
+            if next_frame == curr_frame and prev_frame == curr_frame - 2:
+                curr_frame -= 1
+        if i == len(timestamps) - 1 and i > 0:
+            if get_frame(i - 1) == curr_frame:
+                curr_frame += 1
+        frames.append(curr_frame)
+    return np.array(frames, dtype=np.float32)
+
+
+def reference_unwrap(angles):
+    result = []
+    rotation_mod = 0
+    axis_prev = None
+    for angle in angles:
+        axis = math.degrees(angle) + rotation_mod
+        if axis_prev is None:
+            axis_prev = axis
+        if abs(axis - axis_prev) > 180:
+            step = 360 if axis_prev > axis else -360
+            while abs(axis - axis_prev) > 180:
+                axis += step
+                rotation_mod += step
+        result.append(math.radians(axis))
+        axis_prev = axis
+    return np.array(result, dtype=np.float32)
+
+
+# ---------- Synthetic take ----------
+
+def make_timestamps(packets, seed=0):
+    rng = np.random.default_rng(seed)
+    jitter = rng.normal(scale=0.15 / RECEIVER_FPS, size=packets)
+    return 1000.0 + np.arange(packets) / RECEIVER_FPS + jitter
+
+
+def make_rotations(packets, rng):
+    # Random walk wrapped into [-pi, pi), as Euler angles read back from Blender
+    walk = np.cumsum(rng.normal(scale=0.05, size=(packets, 3)), axis=0)
+    return ((walk + np.pi) % (2.0 * np.pi) - np.pi).astype(np.float32)
+
+
+def fill_channel(channel, packets, values):
+    channel.count = len(packets)
+    channel.packets = np.ascontiguousarray(packets, dtype=np.int32)
+    channel.values = np.ascontiguousarray(values, dtype=np.float32)
+
+
+def fill_recording(recorder, packets, actors, seed=0):
+    rng = np.random.default_rng(seed)
+    timestamps = make_timestamps(packets, seed)
+    recorder.clear_recording()
+    recorder.recorded_timestamps = timestamps
+    recorder.recorded_packet_count = packets
+    packet_numbers = np.arange(packets)
+
+    for a in range(actors):
+        name = f"BenchActor{a}"
+        for b in range(ACTOR_BONES):
+            channel = recorder.get_channel('actors', name, (f"bone{b:02d}", 'rotation'), 3)
+            fill_channel(channel, packet_numbers, make_rotations(packets, rng))
+        channel = recorder.get_channel('actors', name, ("bone00", 'location'), 3)
+        fill_channel(channel, packet_numbers, rng.normal(size=(packets, 3)))
+
+    for s in range(FACE_SHAPES):
+        channel = recorder.get_channel('faces', "BenchFace", f"shape{s:02d}", 1)
+        fill_channel(channel, packet_numbers, rng.uniform(size=(packets, 1)))
+    return timestamps
+
+
+def make_objects(actors):
+    names = [f"BenchActor{a}" for a in range(actors)] + ["BenchFace"]
+    return [bpy.data.objects.new(name, None) for name in names]
+
+
+def remove_bench_data(objects):
+    for obj in objects:
+        bpy.data.objects.remove(obj)
+    for action in list(bpy.data.actions):
+        if action.name.startswith(("Anim Arm BenchActor", "Anim Face BenchFace")):
+            bpy.data.actions.remove(action)
+
+
+# ---------- Benchmarks ----------
+
+def benchmark_record(recorder, samples=20000):
+    recorder.clear_recording()
+    rotation = (0.1, 0.2, 0.3)
+    t0 = time.perf_counter()
+    for i in range(samples):
+        recorder.record_bone(1000.0 + (i // ACTOR_BONES) / RECEIVER_FPS, "BenchActor0", f"bone{i % ACTOR_BONES:02d}", rotation)
+    per_sample = (time.perf_counter() - t0) / samples
+    recorder.clear_recording()
+    return per_sample
+
+
+def recording_bytes(recorder):
+    total = recorder.recorded_timestamps.nbytes
+    for objects in recorder.recorded_data.values():
+        for channels in objects.values():
+            for channel in channels.values():
+                total += channel.packets.nbytes + channel.values.nbytes
+    return total
+
+
+def benchmark_stop(recorder, minutes, actors):
+    packets = int(minutes * 60 * RECEIVER_FPS)
+    timestamps = fill_recording(recorder, packets, actors)
+    print(f"\nTake: {minutes} min at {RECEIVER_FPS} Hz ({packets} packets), "
+          f"{actors} actors x {ACTOR_BONES} bones + {FACE_SHAPES} face shapes")
+    print(f"  memory   {recording_bytes(recorder) / 2 ** 20:8.1f} MiB")
+
+    # Parts of the stop path
+    bpy.context.scene.rsl_receiver_fps = RECEIVER_FPS
+    t0 = time.perf_counter()
+    frames = recorder.convert_timestamps_to_keyframes()
+    map_time = time.perf_counter() - t0
+
+    t0 = time.perf_counter()
+    for obj_name, channels in recorder.recorded_data['actors'].items():
+        for (bone_name, channel_type), channel in channels.items():
+            if channel_type == 'rotation':
+                recorder.unwrap_rotations(channel.get_values())
+    unwrap_time = time.perf_counter() - t0
+
+    # Parity with the former implementation on a slice of the take
+    check = min(packets, 20000)
+    # (the last frame of the slice is not the last of the take, skip it)
+    frame_errors = np.count_nonzero(reference_frames(timestamps[:check], RECEIVER_FPS)[:-1] != frames[:check - 1])
+    angles = recorder.recorded_data['actors']["BenchActor0"][("bone00", 'rotation')].get_values()[:check]
+    unwrap_error = np.abs(reference_unwrap(angles[:, 0]) - recorder.unwrap_rotations(angles)[:, 0]).max()
+
+    t0 = time.perf_counter()
+    reference_frames(timestamps[:check], RECEIVER_FPS)
+    reference_map_time = (time.perf_counter() - t0) / check
+    t0 = time.perf_counter()
+    reference_unwrap(angles[:, 0])
+    reference_unwrap_time = (time.perf_counter() - t0) / check
+
+    # Full stop including fcurve creation
+    objects = make_objects(actors)
+    t0 = time.perf_counter()
+    recorder.stop_recorder(bpy.context)
+    stop_time = time.perf_counter() - t0
+    remove_bench_data(objects)
+
+    rotation_channels = actors * ACTOR_BONES * 3
+    print(f"  stop     {stop_time:8.2f} s total | frame map {map_time * 1e3:.1f} ms | "
+          f"unwrap {unwrap_time * 1e3:.1f} ms")
+    reference_estimate = packets * (reference_map_time + reference_unwrap_time * rotation_channels)
+    print(f"  former   ~{reference_estimate:8.1f} s estimated for frame map + unwrap alone")
+    print(f"  parity   {frame_errors} frame mismatches | unwrap max error {unwrap_error:.2e} rad")
+
+
+if __name__ == "__main__":
+    print("=" * 60)
+    print("ROKOKO RECORDER STOP TIME")
+    print("=" * 60)
+    argv = sys.argv[sys.argv.index("--") + 1:] if "--" in sys.argv else []
+    minutes = float(argv[0]) if argv else 10.0
+    actors = int(argv[1]) if len(argv) > 1 else 3
+
+    if not hasattr(bpy.types.Scene, "rsl_receiver_fps"):
+        bpy.types.Scene.rsl_receiver_fps = bpy.props.IntProperty(default=RECEIVER_FPS)
+
+    recorder = load_recorder()
+    print(f"\n  record   {benchmark_record(recorder) * 1e6:8.2f} us per record_bone call")
+    benchmark_stop(recorder, minutes, actors)
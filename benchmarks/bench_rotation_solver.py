@@ -0,0 +1,138 @@
+"""
+Parity check and benchmark for the batched rotation solver.
+Run inside Blender (needs mathutils), e.g.:
+
+    blender --background --python benchmarks/bench_rotation_solver.py
+
+Compares utils.coords.directions_to_quaternions / quaternions_from_two_vectors
+and runtime.retarget.compute_bone_rotations_from_chains against the scalar
+mathutils implementations, including degenerate and parallel inputs, then
+times both paths. The same parity checks for utils.coords run outside
+Blender as tests (tests/test_rotation_solver.py).
+"""
+
+import sys
+import time
+
+import numpy as np
+from mathutils import Vector
+
+from live_mocap_addon.utils import coords
+from live_mocap_addon.runtime import retarget
+
+
+TOLERANCE = 1e-4  # mathutils works in float32
+
+
+def make_directions(count, seed=0):
+    """Random directions plus the edge cases the scalar code special-cases."""
+    rng = np.random.default_rng(seed)
+    directions = rng.normal(size=(count, 3))
+    directions[0] = (0.0, 0.0, 1.0)        # parallel to default up
+    directions[1] = (0.0, 0.0, -3.0)       # anti-parallel to default up
+    directions[2] = (0.0, 0.0, 0.0)        # degenerate
+    directions[3] = (0.0005, 0.0, 0.0)     # below length threshold
+    directions[4] = (1.0, 0.0, 0.0)
+    return directions
+
+
+def quaternion_error(q_batch, q_scalar):
+    """Sign-invariant distance between two quaternions (q and -q are equal)."""
+    q_scalar = np.array(tuple(q_scalar))
+    return min(np.abs(q_batch - q_scalar).max(), np.abs(q_batch + q_scalar).max())
+
+
+def check_directions(directions, up_hints=None):
+    """Compare batched and scalar direction_to_quaternion."""
+    batch = coords.directions_to_quaternions(directions, up_hints)
+    worst = 0.0
+    for i, direction in enumerate(directions):
+        up = None
+        if up_hints is not None:
+            up = Vector(up_hints if np.ndim(up_hints) == 1 else up_hints[i])
+        scalar = coords.direction_to_quaternion(Vector(direction), up)
+        worst = max(worst, quaternion_error(batch[i], scalar))
+    return worst
+
+
+def check_chains(starts, ends):
+    """Compare batched and scalar compute_bone_rotation_from_chain."""
+    batch = retarget.compute_bone_rotations_from_chains(starts, ends)
+    worst = 0.0
+    for i in range(len(starts)):
+        scalar = retarget.compute_bone_rotation_from_chain(Vector(starts[i]), Vector(ends[i]))
+        worst = max(worst, quaternion_error(batch[i], scalar))
+    return worst
+
+
+def check_two_vectors(vec_from, vec_to):
+    """Compare batched and scalar quaternion_from_two_vectors."""
+    batch = coords.quaternions_from_two_vectors(vec_from, vec_to)
+    worst = 0.0
+    for i in range(len(vec_from)):
+        scalar = coords.quaternion_from_two_vectors(Vector(vec_from[i]), Vector(vec_to[i]))
+        worst = max(worst, quaternion_error(batch[i], scalar))
+    return worst
+
+
+def run_parity():
+    """Run all parity checks. Returns True if everything matches."""
+    print("\n--- Parity ---")
+    rng = np.random.default_rng(1)
+    directions = make_directions(2000)
+
+    starts = rng.normal(size=(2000, 3))
+    ends = starts + make_directions(2000, seed=2)
+
+    vec_from = rng.normal(size=(2000, 3))
+    vec_to = rng.normal(size=(2000, 3))
+    vec_to[:10] = vec_from[:10] * 2.0       # parallel
+    vec_to[10:20] = -vec_from[10:20]        # opposite
+
+    results = {
+        "direction_to_quaternion (default up)": check_directions(directions),
+        "direction_to_quaternion (fixed up)": check_directions(directions, np.array((1.0, 0.0, 0.0))),
+        "direction_to_quaternion (per-row up)": check_directions(directions, rng.normal(size=(2000, 3))),
+        "compute_bone_rotation_from_chain": check_chains(starts, ends),
+        "quaternion_from_two_vectors": check_two_vectors(vec_from, vec_to),
+    }
+
+    ok = True
+    for name, error in results.items():
+        passed = error < TOLERANCE
+        ok = ok and passed
+        print(f"  {'PASS' if passed else 'FAIL'}  {name}: max error {error:.2e}")
+    return ok
+
+
+def run_benchmark(bone_counts=(16, 64, 1024, 30 * 60 * 16)):
+    """Time scalar loop vs. one batched call for several batch sizes."""
+    print("\n--- Benchmark ---")
+    rng = np.random.default_rng(3)
+    for count in bone_counts:
+        starts = rng.normal(size=(count, 3))
+        ends = starts + rng.normal(size=(count, 3))
+
+        start_vectors = [Vector(p) for p in starts]
+        end_vectors = [Vector(p) for p in ends]
+        t0 = time.perf_counter()
+        for start, end in zip(start_vectors, end_vectors):
+            retarget.compute_bone_rotation_from_chain(start, end)
+        scalar_time = time.perf_counter() - t0
+
+        t0 = time.perf_counter()
+        retarget.compute_bone_rotations_from_chains(starts, ends)
+        batch_time = time.perf_counter() - t0
+
+        print(f"  {count:>7} bones: scalar {scalar_time * 1000:8.2f} ms | "
+              f"batched {batch_time * 1000:8.2f} ms | x{scalar_time / max(batch_time, 1e-9):.1f}")
+
+
+if __name__ == "__main__":
+    print("=" * 60)
+    print("BATCHED ROTATION SOLVER")
+    print("=" * 60)
+    parity_ok = run_parity()
+    run_benchmark()
+    if not parity_ok:
+        sys.exit(1)
@@ -0,0 +1,92 @@
+"""
+Throughput and latency benchmark for the tracker backends
+(runtime/trackers.py). Run inside Blender with the add-on's dependencies
+installed, e.g.:
+
+    blender --background --python benchmarks/bench_trackers.py -- clip.mp4
+    blender --background --python benchmarks/bench_trackers.py -- clip.mp4 300 hands
+
+Arguments are a video file, the number of frames to process (default: the
+whole clip) and optionally 'hands' and/or 'face' to track them as well as
+the pose. The video is decoded as fast as possible by a VideoFileSource
+and every backend runs behind the same CaptureWorker the add-on uses:
+
+    solutions            - legacy mp.solutions, blocking process()
+    tasks video          - Tasks landmarkers in VIDEO mode, one frame at a time
+    tasks live stream    - Tasks landmarkers, detect_async + callbacks
+
+Reported per backend:
+    results/s  - landmark results published per second
+    latency    - capture-to-result time of the published results
+                 (mean / 95th percentile)
+    dropped    - frames skipped by the backend or overwritten before use
+"""
+
+import sys
+import time
+
+import numpy as np
+
+from live_mocap_addon.runtime.capture import VideoFileSource
+from live_mocap_addon.runtime.pipeline import CaptureWorker
+from live_mocap_addon.runtime.trackers import MediaPipeTrackers, TasksTrackers
+
+
+def run(trackers, path, frame_count):
+    source = VideoFileSource(path, realtime=False)
+    worker = CaptureWorker(source, trackers)
+    if not worker.start(timeout=120.0):
+        print(f"  failed to start: {worker.error_message}")
+        return None
+
+    latencies = []
+    t0 = time.perf_counter()
+    while worker.is_running() and worker.mailbox.produced < frame_count:
+        packet = worker.mailbox.take()
+        if packet is None:
+            time.sleep(0.0005)
+            continue
+        latencies.append(packet.inference_time)
+    elapsed = time.perf_counter() - t0
+
+    produced = worker.mailbox.produced
+    dropped = worker.get_dropped_frames()
+    worker.stop()
+    return produced / elapsed, np.array(latencies), dropped
+
+
+def benchmark(path, frame_count, use_hands, use_face):
+    options = dict(use_pose=True, use_hands=use_hands, use_face=use_face,
+                   model_complexity=1, delegate='CPU')
+
+    print(f"\nVideo: {path}, {frame_count} frames, pose"
+          f"{' + hands' if use_hands else ''}{' + face' if use_face else ''}")
+
+    configurations = [
+        ("solutions", lambda: MediaPipeTrackers(**{k: v for k, v in options.items() if k != 'delegate'})),
+        ("tasks video", lambda: TasksTrackers(live_stream=False, **options)),
+        ("tasks live stream", lambda: TasksTrackers(**options)),
+    ]
+
+    for name, create in configurations:
+        result = run(create(), path, frame_count)
+        if result is None:
+            continue
+        throughput, latencies, dropped = result
+        if not len(latencies):
+            print(f"  {name:<18} no results")
+            continue
+        print(f"  {name:<18} {throughput:6.1f} results/s | latency {latencies.mean() * 1e3:6.1f} ms "
+              f"(p95 {np.percentile(latencies, 95) * 1e3:6.1f} ms) | dropped {dropped}")
+
+
+if __name__ == "__main__":
+    print("=" * 60)
+    print("TRACKER BACKENDS")
+    print("=" * 60)
+    argv = sys.argv[sys.argv.index("--") + 1:] if "--" in sys.argv else sys.argv[1:]
+    if not argv:
+        print("Usage: blender --background --python benchmarks/bench_trackers.py -- clip.mp4 [frames] [hands] [face]")
+        sys.exit(1)
+    frame_count = int(argv[1]) if len(argv) > 1 and argv[1].isdigit() else 10 ** 9
+    benchmark(argv[0], frame_count, 'hands' in argv, 'face' in argv)
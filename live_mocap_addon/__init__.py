@@ -60,6 +60,7 @@ classes_panels = [
 classes_properties = [
     properties.MOCAP_PG_BoneMapping,
     properties.MOCAP_PG_CameraIndex,
+    properties.MOCAP_PG_Performer,
     properties.MOCAP_PG_Settings,
     properties.MOCAP_UL_BoneMappingList,
 ]
@@ -74,8 +75,11 @@ classes_operators = [
     operators.remove_mapping.MOCAP_OT_RemoveBoneMapping,
     operators.add_camera_index.MOCAP_OT_AddCameraIndex,
     operators.remove_camera_index.MOCAP_OT_RemoveCameraIndex,
+    operators.add_performer.MOCAP_OT_AddPerformer,
+    operators.remove_performer.MOCAP_OT_RemovePerformer,
     operators.capture_start.MOCAP_OT_CaptureStart,
     operators.capture_stop.MOCAP_OT_CaptureStop,
+    operators.batch_process.MOCAP_OT_BatchProcess,
     operators.record_start.MOCAP_OT_RecordStart,
     operators.record_stop.MOCAP_OT_RecordStop,
     operators.bake_action.MOCAP_OT_BakeAction,
@@ -15,8 +15,11 @@ from . import add_mapping
 from . import remove_mapping
 from . import add_camera_index
 from . import remove_camera_index
+from . import add_performer
+from . import remove_performer
 from . import capture_start
 from . import capture_stop
+from . import batch_process
 from . import record_start
 from . import record_stop
 from . import bake_action
@@ -39,8 +42,11 @@ else:
     importlib.reload(remove_mapping)
     importlib.reload(add_camera_index)
     importlib.reload(remove_camera_index)
+    importlib.reload(add_performer)
+    importlib.reload(remove_performer)
     importlib.reload(capture_start)
     importlib.reload(capture_stop)
+    importlib.reload(batch_process)
     importlib.reload(record_start)
     importlib.reload(record_stop)
     importlib.reload(bake_action)
@@ -0,0 +1,19 @@
+"""Add performer operator."""
+import bpy
+from bpy.types import Operator
+
+
+class MOCAP_OT_AddPerformer(Operator):
+    """Add an armature for another tracked person"""
+    bl_idname = "mocap.add_performer"
+    bl_label = "Add Performer"
+    bl_description = "Add an armature driven by another tracked person (multi-person capture)"
+    bl_options = {'REGISTER', 'UNDO'}
+    
+    def execute(self, context):
+        settings = context.scene.mocap_settings
+        
+        settings.performers.add()
+        
+        self.report({'INFO'}, f"Added performer {len(settings.performers) + 1}")
+        return {'FINISHED'}
@@ -2,14 +2,14 @@
 import bpy
 from bpy.types import Operator
 
-from ..runtime.recording import create_action, bake_action
+from ..runtime.recording import bake_action, get_clean_tolerances
 
 
 class MOCAP_OT_BakeAction(Operator):
     """Bake recorded motion to an action"""
     bl_idname = "mocap.bake_action"
     bl_label = "Bake to Action"
-    bl_description = "Finalize recording as an action on the target armature"
+    bl_description = "Finalize the recorded action on the target armature and reduce its keyframes"
     bl_options = {'REGISTER', 'UNDO'}
     
     def execute(self, context):
@@ -21,13 +21,29 @@ class MOCAP_OT_BakeAction(Operator):
         
         armature = settings.target_armature
         
-        # Create action
-        action = create_action(armature)
+        # Recording writes into the armature's action; bake that one
+        if not armature.animation_data or not armature.animation_data.action:
+            self.report({'ERROR'}, "Nothing recorded on the target armature")
+            return {'CANCELLED'}
         
-        # Bake (optional cleanup)
         start_frame = settings.start_frame
         end_frame = start_frame + settings.recorded_frames
-        bake_action(armature, start_frame, end_frame, clean=True)
+        result = bake_action(
+            armature, start_frame, end_frame,
+            clean=settings.clean_keyframes,
+            rotation_tolerances=get_clean_tolerances(settings),
+            default_tolerance=settings.clean_tolerance_torso,
+            location_tolerance=settings.clean_location_tolerance
+        )
+        if result is None:
+            self.report({'ERROR'}, "Bake failed, see console for details")
+            return {'CANCELLED'}
         
-        self.report({'INFO'}, f"Created action: {action.name}")
+        keys_before, keys_after = result
+        ratio = keys_before / keys_after if keys_after else 0.0
+        self.report(
+            {'INFO'},
+            f"Baked action: {armature.animation_data.action.name} "
+            f"({keys_before} -> {keys_after} keys, {ratio:.1f}x)"
+        )
         return {'FINISHED'}
@@ -0,0 +1,169 @@
+"""Offline batch processing operator."""
+import bpy
+from bpy.types import Operator
+import os
+
+from ..runtime.capture import create_frame_source
+from ..runtime.trackers import create_trackers
+from ..runtime.landmark_stream import ReplaySource
+from ..runtime.retarget_plan import build_retarget_plan
+from ..runtime.filters import FilterBank
+from ..runtime.batch import BatchJob
+from ..runtime import dependency_check
+
+
+class MOCAP_OT_BatchProcess(Operator):
+    """Process a whole video, image sequence or landmark stream into an action"""
+    bl_idname = "mocap.batch_process"
+    bl_label = "Process Clip"
+    bl_description = "Detect, filter and retarget the whole source file and bake it to a new action (ESC to cancel)"
+    bl_options = {'REGISTER', 'UNDO'}
+    
+    _timer = None
+    _job = None
+    
+    @classmethod
+    def poll(cls, context):
+        """Check if operator can run."""
+        settings = context.scene.mocap_settings
+        return (
+            settings.source_type != 'CAMERA' and
+            bool(settings.source_path) and
+            settings.target_armature is not None and
+            len(settings.bone_mappings) > 0 and
+            not settings.is_capturing
+        )
+    
+    def create_job(self, context):
+        """Build the batch job from the current settings (None if invalid)."""
+        settings = context.scene.mocap_settings
+        
+        if settings.source_type != 'STREAM' and not dependency_check.all_dependencies_available():
+            self.report({'ERROR'}, "Missing dependencies. Check panel for details.")
+            return None
+        
+        plan = build_retarget_plan(settings.target_armature, settings.bone_mappings)
+        if not len(plan):
+            self.report({'ERROR'}, "No mapped bones found on the target armature")
+            return None
+        
+        path = bpy.path.abspath(settings.source_path)
+        if settings.source_type == 'STREAM':
+            source = ReplaySource(path, realtime=False)
+            trackers = source
+        else:
+            # Decode as fast as inference allows, never loop
+            source = create_frame_source(
+                settings.source_type,
+                path=path,
+                target_fps=settings.target_fps,
+                realtime=False,
+                frame_step=settings.source_frame_step,
+                start_frame=settings.source_start_frame
+            )
+            # Only the pose is retargeted; Tasks landmarkers run in blocking
+            # VIDEO mode, so every frame gets its result
+            trackers = create_trackers(
+                settings.tracker_backend,
+                live_stream=False,
+                use_pose=True,
+                min_confidence=settings.mp_min_detection_confidence,
+                model_complexity=int(settings.mp_model_complexity),
+                min_tracking_confidence=settings.mp_min_tracking_confidence,
+                smooth_landmarks=True,
+                min_presence_confidence=settings.mp_min_presence_confidence,
+                delegate=settings.mp_delegate
+            )
+        
+        return BatchJob(
+            plan, source, trackers,
+            FilterBank.from_settings(settings, plan),
+            scale=settings.motion_scale,
+            z_offset=settings.z_offset
+        )
+    
+    def execute(self, context):
+        """Run synchronously (scripts and background mode)."""
+        self._job = self.create_job(context)
+        if self._job is None:
+            return {'CANCELLED'}
+        
+        self._job.run(progress_callback=self.log_progress)
+        return self.finish(context)
+    
+    def invoke(self, context, event):
+        """Run on a worker thread with progress in the UI."""
+        self._job = self.create_job(context)
+        if self._job is None:
+            return {'CANCELLED'}
+        
+        self._job.start()
+        
+        wm = context.window_manager
+        wm.progress_begin(0, 100)
+        self._timer = wm.event_timer_add(0.1, window=context.window)
+        wm.modal_handler_add(self)
+        return {'RUNNING_MODAL'}
+    
+    def modal(self, context, event):
+        settings = context.scene.mocap_settings
+        job = self._job
+        
+        if event.type == 'ESC':
+            job.cancel()
+            self.cleanup(context)
+            settings.status_message = "Batch processing cancelled"
+            self.report({'WARNING'}, f"Cancelled after {job.frames_done} frames")
+            return {'CANCELLED'}
+        
+        if event.type == 'TIMER':
+            context.window_manager.progress_update(int(job.progress * 100))
+            settings.status_message = (
+                f"Processing {job.frames_done}/{job.total_frames or '?'} | {job.fps:.1f} fps"
+            )
+            
+            if job.finished:
+                self.cleanup(context)
+                return self.finish(context)
+        
+        return {'PASS_THROUGH'}
+    
+    def finish(self, context):
+        """Write the processed clip to an action."""
+        settings = context.scene.mocap_settings
+        job = self._job
+        
+        if job.error_message:
+            self.report({'ERROR'}, job.error_message)
+            return {'CANCELLED'}
+        
+        if not job.frames_done:
+            self.report({'ERROR'}, "No frames processed")
+            return {'CANCELLED'}
+        
+        name = os.path.splitext(os.path.basename(os.path.normpath(settings.source_path)))[0]
+        action, keys = job.finish(
+            settings.target_armature,
+            start_frame=context.scene.frame_start,
+            action_name=f"Mediapipe_{name}" if name else None,
+            fps=context.scene.render.fps / context.scene.render.fps_base
+        )
+        
+        settings.status_message = (
+            f"Processed {job.frames_done} frames at {job.fps:.1f} fps "
+            f"({job.frames_detected} with pose)"
+        )
+        self.report({'INFO'}, f"{settings.status_message}, {keys} keys in '{action.name}'")
+        return {'FINISHED'}
+    
+    def log_progress(self, job):
+        """Progress output for synchronous runs."""
+        print(f"Batch: {job.frames_done}/{job.total_frames or '?'} frames | {job.fps:.1f} fps")
+    
+    def cleanup(self, context):
+        """Remove timer and progress indicator."""
+        wm = context.window_manager
+        if self._timer:
+            wm.event_timer_remove(self._timer)
+            self._timer = None
+        wm.progress_end()
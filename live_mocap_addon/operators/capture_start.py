@@ -1,39 +1,57 @@
 """Start capture modal operator."""
 import bpy
 from bpy.types import Operator
+import os
 import time
+import numpy as np
 
-from ..runtime.capture import CameraCapture
-from ..runtime.trackers import MediaPipeTrackers
+from ..runtime.capture import create_frame_source
+from ..runtime.trackers import create_trackers
+from ..runtime.pipeline import CaptureWorker
+from ..runtime.multicam import MultiCameraWorker, load_calibration
+from ..runtime.landmark_stream import LandmarkStreamWriter, ReplaySource
 from ..runtime.retarget import (
-    landmarks_to_positions, normalize_skeleton_scale,
-    compute_spine_position, compute_bone_rotation_from_chain
+    landmarks_to_array, convert_landmark_array,
+    compute_bone_rotations_from_chains, SPINE_PROXY_INDEX
 )
-from ..runtime.mapping import get_next_landmark_in_chain
-from ..runtime.filters import MultiFilter
+from ..runtime.retarget_plan import build_retarget_plan, build_multi_person_plan
+from ..runtime.people import PersonTracker
+from ..runtime.filters import FilterBank
+from ..runtime.recording import get_recording_buffer, stop_recording_buffer
 from ..runtime import dependency_check
 from ..runtime import viewport_draw
 
 
+# Landmark rows per person after convert_landmark_array (landmarks + spine proxy)
+PERSON_ROWS = SPINE_PROXY_INDEX + 1
+
+
 class MOCAP_OT_CaptureStart(Operator):
-    """Start live motion capture from webcam"""
+    """Start live motion capture from webcam or a saved landmark stream"""
     bl_idname = "mocap.capture_start"
     bl_label = "Start Capture"
-    bl_description = "Start capturing motion from webcam (requires at least one camera)"
+    bl_description = "Start capturing motion from webcam (requires at least one camera) or replay a landmark stream"
     bl_options = {'REGISTER'}
     
     _timer = None
-    _camera = None
-    _trackers = None
-    _filters = {}
+    _worker = None
+    _plan = None
+    _filters = None
+    _people = None
+    _people_plan = None
+    _people_filters = None
     _frame_interval = 1.0 / 30.0
     
     @classmethod
     def poll(cls, context):
         """Check if operator can run."""
         settings = context.scene.mocap_settings
-        # Require at least one camera and at least one bone mapping in the list
-        return len(settings.camera_indices) > 0 and len(settings.bone_mappings) > 0
+        # Require a source (camera or file) and at least one bone mapping in the list
+        if settings.source_type == 'CAMERA':
+            has_source = len(settings.camera_indices) > 0
+        else:
+            has_source = bool(settings.source_path)
+        return has_source and len(settings.bone_mappings) > 0
     
     def modal(self, context, event):
         settings = context.scene.mocap_settings
@@ -50,8 +68,8 @@ class MOCAP_OT_CaptureStart(Operator):
     def invoke(self, context, event):
         settings = context.scene.mocap_settings
         
-        # Check dependencies
-        if not dependency_check.all_dependencies_available():
+        # Check dependencies (a landmark stream needs neither OpenCV nor MediaPipe)
+        if settings.source_type != 'STREAM' and not dependency_check.all_dependencies_available():
             self.report({'ERROR'}, "Missing dependencies. Check panel for details.")
             return {'CANCELLED'}
         
@@ -74,42 +92,44 @@ class MOCAP_OT_CaptureStart(Operator):
             # Switch to Pose Mode
             bpy.ops.object.mode_set(mode='POSE')
         
-        # Get camera index (use first camera from list, or default to 0)
-        camera_index = 0
-        if len(settings.camera_indices) > 0:
-            camera_index = settings.camera_indices[0].index
-        
-        # Initialize camera
-        self._camera = CameraCapture(camera_index, settings.target_fps)
-        if not self._camera.open():
-            self.report({'ERROR'}, f"Failed to open camera {camera_index}")
+        # Capture and inference run on background workers (one per camera),
+        # the modal timer only consumes the newest result
+        if settings.source_type == 'CAMERA':
+            source_name = ", ".join(
+                f"'{cam.path}'" if cam.path else f"camera {cam.index}"
+                for cam in settings.camera_indices
+            )
+        else:
+            source_name = f"'{settings.source_path}'"
+        
+        stream_writer = None
+        if settings.save_landmark_stream and settings.source_type != 'STREAM':
+            stream_writer = LandmarkStreamWriter(
+                os.path.join(
+                    bpy.path.abspath(settings.landmark_stream_dir),
+                    time.strftime("capture_%Y%m%d_%H%M%S")
+                ),
+                use_pose=settings.use_pose,
+                use_hands=settings.use_hands,
+                use_face=settings.use_face
+            )
+        
+        # Files processed as fast as possible must not skip frames
+        lossless = settings.source_type != 'CAMERA' and not settings.source_realtime
+        try:
+            self._worker = self.create_worker(settings, stream_writer, lossless)
+        except (OSError, ValueError) as e:
+            self.report({'ERROR'}, f"Invalid multi-camera calibration: {str(e)}")
             return {'CANCELLED'}
         
-        # Initialize trackers
-        self._trackers = MediaPipeTrackers(
-            use_pose=settings.use_pose,
-            use_hands=settings.use_hands,
-            use_face=settings.use_face,
-            min_confidence=settings.mp_min_detection_confidence,
-            model_complexity=int(settings.mp_model_complexity),
-            min_tracking_confidence=settings.mp_min_tracking_confidence,
-            smooth_landmarks=True
-        )
-        
-        if not self._trackers.initialize():
-            self._camera.release()
-            self.report({'ERROR'}, "Failed to initialize MediaPipe")
+        if not self._worker.start():
+            message = self._worker.error_message or f"Failed to open {source_name}"
+            self._worker = None
+            self.report({'ERROR'}, message)
             return {'CANCELLED'}
         
-        # Initialize filters for each bone
-        self._filters = {}
-        for mapping in settings.bone_mappings:
-            if mapping.enabled and mapping.bone_name:
-                self._filters[mapping.bone_name] = MultiFilter(
-                    smoothing_alpha=settings.smoothing,
-                    min_confidence=settings.min_confidence,
-                    foot_lock_threshold=settings.foot_lock_threshold
-                )
+        # Compile the retarget plan and one filter per planned bone
+        self.rebuild_plan(settings)
         
         # Register viewport draw handler if enabled
         if settings.show_camera_feed:
@@ -117,7 +137,7 @@ class MOCAP_OT_CaptureStart(Operator):
             viewport_draw.register_draw_handler()
             
             # Create camera texture for viewport
-            width, height = self._camera.get_resolution()
+            width, height = self._worker.resolution
             print(f"INFO: Camera resolution: {width}x{height}")
             if width > 0 and height > 0:
                 viewport_draw.create_camera_texture(width, height)
@@ -128,7 +148,10 @@ class MOCAP_OT_CaptureStart(Operator):
         settings.is_capturing = True
         settings.status_message = "Capturing..."
         settings.dropped_frames = 0
-        self._frame_interval = 1.0 / settings.target_fps
+        settings.frames_produced = 0
+        settings.frames_consumed = 0
+        settings.frames_overwritten = 0
+        self._frame_interval = 0.001 if lossless else 1.0 / settings.target_fps
         
         # Add timer
         wm = context.window_manager
@@ -138,37 +161,143 @@ class MOCAP_OT_CaptureStart(Operator):
         self.report({'INFO'}, "Motion capture started")
         return {'RUNNING_MODAL'}
     
+    def create_worker(self, settings, stream_writer=None, lossless=False):
+        """
+        Create the capture worker for the selected source.
+        
+        With several cameras every camera gets its own CaptureWorker, and a
+        MultiCameraWorker aligns and fuses their results.
+        
+        Returns:
+            CaptureWorker, or MultiCameraWorker for several cameras
+        
+        Raises:
+            OSError, ValueError: If the multi-camera calibration can't be used
+        """
+        if settings.source_type != 'CAMERA' or len(settings.camera_indices) < 2:
+            camera, trackers = self.create_source(settings)
+            return CaptureWorker(camera, trackers, stream_writer=stream_writer, lossless=lossless)
+        
+        calibration = None
+        if settings.multicam_calibration_path:
+            calibration = load_calibration(bpy.path.abspath(settings.multicam_calibration_path))
+        
+        workers = [
+            CaptureWorker(self.create_camera(settings, cam), self.create_trackers(settings))
+            for cam in settings.camera_indices
+        ]
+        return MultiCameraWorker(
+            workers,
+            calibration=calibration,
+            max_skew=settings.multicam_max_skew / 1000.0,
+            min_visibility=settings.min_confidence,
+            stream_writer=stream_writer,
+            lossless=lossless
+        )
+    
+    def create_camera(self, settings, cam):
+        """Create the frame source of one camera list entry (a video stands in for the webcam)."""
+        if cam.path:
+            return create_frame_source('VIDEO', path=bpy.path.abspath(cam.path))
+        return create_frame_source('CAMERA', camera_index=cam.index, target_fps=settings.target_fps)
+    
+    def create_trackers(self, settings, live_stream=True):
+        """
+        Create uninitialized trackers of the selected backend from the settings.
+        
+        Args:
+            live_stream: False for lossless file processing, which needs one
+                         result per frame (Tasks landmarkers in VIDEO mode)
+        """
+        return create_trackers(
+            settings.tracker_backend,
+            live_stream=live_stream,
+            use_pose=settings.use_pose,
+            use_hands=settings.use_hands,
+            use_face=settings.use_face,
+            min_confidence=settings.mp_min_detection_confidence,
+            model_complexity=int(settings.mp_model_complexity),
+            min_tracking_confidence=settings.mp_min_tracking_confidence,
+            smooth_landmarks=True,
+            num_poses=settings.mp_num_poses,
+            min_presence_confidence=settings.mp_min_presence_confidence,
+            delegate=settings.mp_delegate,
+            use_holistic=settings.use_holistic,
+            use_roi_crops=settings.use_roi_crops
+        )
+    
+    def create_source(self, settings):
+        """
+        Create the frame source and trackers for the selected source type.
+        
+        Returns:
+            Tuple of (source, trackers); a landmark stream replay is both
+        """
+        if settings.source_type == 'STREAM':
+            replay = ReplaySource(
+                bpy.path.abspath(settings.source_path),
+                realtime=settings.source_realtime,
+                loop=settings.source_loop
+            )
+            return replay, replay
+        
+        if settings.source_type == 'CAMERA' and len(settings.camera_indices) > 0:
+            return self.create_camera(settings, settings.camera_indices[0]), self.create_trackers(settings)
+        
+        source = create_frame_source(
+            settings.source_type,
+            camera_index=0,
+            path=bpy.path.abspath(settings.source_path),
+            target_fps=settings.target_fps,
+            realtime=settings.source_realtime,
+            frame_step=settings.source_frame_step,
+            start_frame=settings.source_start_frame,
+            loop=settings.source_loop
+        )
+        return source, self.create_trackers(settings, live_stream=settings.source_realtime)
+    
     def process_frame(self, context):
         """Process a single frame."""
         settings = context.scene.mocap_settings
         
         try:
-            # Read frame
-            frame_result = self._camera.read_frame()
-            if not frame_result:
-                settings.dropped_frames += 1
+            # Take the newest result published by the capture worker
+            mailbox = self._worker.mailbox
+            packet = mailbox.take()
+            
+            settings.frames_produced = mailbox.produced
+            settings.frames_consumed = mailbox.consumed
+            settings.frames_overwritten = mailbox.overwritten
+            settings.dropped_frames = self._worker.get_dropped_frames()
+            
+            if packet is None:
+                if not self._worker.is_running():
+                    settings.status_message = self._worker.error_message or "Capture stopped"
+                    settings.is_capturing = False
                 return
             
-            success, frame, frame_rgb = frame_result
+            frame = packet.frame
+            landmarks_result = packet.landmarks
             
             # Update viewport with camera frame if enabled
             if settings.show_camera_feed:
                 viewport_draw.update_camera_frame(frame)
             
-            # Process with MediaPipe
-            landmarks_result = self._trackers.process_frame(frame_rgb)
-            
-            # Update viewport with all landmarks if enabled
+            # Update viewport with all landmarks if enabled (fused results draw the
+            # primary camera's own landmarks over its frame)
             if settings.show_camera_feed:
+                display_result = packet.display_landmarks or landmarks_result
                 viewport_draw.update_landmarks(
-                    pose_landmarks=landmarks_result.pose_landmarks,
-                    hand_landmarks=landmarks_result.hand_landmarks,
-                    face_landmarks=landmarks_result.face_landmarks
+                    pose_landmarks=display_result.pose_landmarks,
+                    hand_landmarks=display_result.hand_landmarks,
+                    face_landmarks=display_result.face_landmarks
                 )
             
-            # Retarget if we have pose landmarks
-            if landmarks_result.pose_landmarks:
-                self.retarget_pose(context, landmarks_result.pose_landmarks)
+            # Retarget if we have pose landmarks (one armature per tracked person in multi-person mode)
+            if landmarks_result.people and settings.mp_num_poses > 1:
+                self.retarget_people(context, landmarks_result.people, packet.source_time)
+            elif landmarks_result.pose_landmarks:
+                self.retarget_pose(context, landmarks_result.pose_landmarks, packet.source_time)
             
             # Force viewport redraw if camera feed is enabled
             if settings.show_camera_feed:
@@ -176,117 +305,172 @@ class MOCAP_OT_CaptureStart(Operator):
                     if area.type == 'VIEW_3D':
                         area.tag_redraw()
             
-            # Update status
-            fps = self._camera.get_average_fps()
-            latency = self._camera.get_average_latency()
+            # Update status (latency is capture-to-retarget time)
+            fps = self._worker.camera.get_average_fps()
+            latency = (time.perf_counter() - packet.timestamp) * 1000.0
             settings.avg_latency = latency
             settings.status_message = f"Tracking | FPS: {fps:.1f} | Latency: {latency:.1f}ms"
-            
+        
         except Exception as e:
             print(f"Frame processing error: {str(e)}")
-            settings.dropped_frames += 1
     
-    def retarget_pose(self, context, landmarks):
-        """Retarget pose landmarks to bones."""
+    def rebuild_plan(self, settings):
+        """Compile the retarget plan and reset the filter bank."""
+        self._plan = build_retarget_plan(settings.target_armature, settings.bone_mappings)
+        self._filters = FilterBank.from_settings(settings, self._plan)
+        
+        if settings.mp_num_poses > 1:
+            self._people = PersonTracker(settings.mp_num_poses, min_visibility=settings.min_confidence)
+            self._people_plan = build_multi_person_plan(
+                self.get_performer_armatures(settings), settings.bone_mappings, PERSON_ROWS
+            )
+            self._people_filters = FilterBank.from_settings(settings, self._people_plan)
+    
+    def get_performer_armatures(self, settings):
+        """Armature per person slot: the target armature, then the performer list (None = unused)."""
+        armatures = [settings.target_armature] + [performer.armature for performer in settings.performers]
+        armatures = armatures[:settings.mp_num_poses]
+        return [
+            armature if armature is not None and armature.type == 'ARMATURE' else None
+            for armature in armatures
+        ]
+    
+    def retarget_people(self, context, people, timestamp=None):
+        """
+        Retarget several people, each to the armature of their track ID.
+        
+        All people are converted, filtered and solved together through one
+        combined plan, so every extra performer only adds rows to the same
+        array passes.
+        """
+        settings = context.scene.mocap_settings
+        
+        armatures = self.get_performer_armatures(settings)
+        if self._people_plan is None or not self._people_plan.is_valid_for(armatures):
+            self.rebuild_plan(settings)
+        
+        plan = self._people_plan
+        filters = self._people_filters
+        
+        # Keep every person on the same track ID (and armature) across frames
+        detections = np.stack([landmarks_to_array(landmarks)[:33] for landmarks in people])
+        ids, new_ids = self._people.update(detections)
+        
+        # A slot taken over by another person must not blend from the previous one
+        for track_id in new_ids:
+            if track_id < len(plan.slices):
+                filters.reset(plan.slices[track_id])
+        
+        if not len(plan):
+            return
+        
+        # Stack the people by track ID and convert them in one array pass
+        stacked = np.zeros((len(armatures), 33, 4), dtype=np.float32)
+        present = np.zeros(len(armatures), dtype=bool)
+        for detection, track_id in enumerate(ids):
+            if 0 <= track_id < len(armatures):
+                stacked[track_id] = detections[detection]
+                present[track_id] = True
+        
+        positions = convert_landmark_array(
+            stacked,
+            scale=settings.motion_scale,
+            z_offset=settings.z_offset
+        ).reshape(-1, 4)
+        
+        # Same passes as retarget_pose, over the bones of all performers
+        starts = positions[plan.landmark_indices]
+        ends = positions[plan.end_indices, :3]
+        
+        filtered, accepted = filters.filter_positions(
+            starts[:, :3], starts[:, 3], mask=present[plan.performer_indices], timestamp=timestamp
+        )
+        
+        solve = accepted & plan.has_chain
+        rotations, smoothed = filters.filter_rotations(
+            compute_bone_rotations_from_chains(filtered, ends), solve, timestamp=timestamp
+        )
+        
+        # Only the target armature (first performer) is recorded
+        if settings.is_recording:
+            buffer = get_recording_buffer()
+            if buffer is not None:
+                primary = plan.slices[0]
+                buffer.append(
+                    settings.start_frame + settings.recorded_frames,
+                    plan.plans[0].bone_names, rotations[primary], smoothed[primary]
+                )
+                settings.recorded_frames += 1
+        
+        rotations = rotations.tolist()
+        accepted = accepted.tolist()
+        smoothed = smoothed.tolist()
+        
+        for i, bone in enumerate(plan.pose_bones):
+            if accepted[i] and smoothed[i]:
+                bone.rotation_quaternion = rotations[i]
+    
+    def retarget_pose(self, context, landmarks, timestamp=None):
+        """Retarget pose landmarks to bones (timestamp in seconds drives One Euro)."""
         settings = context.scene.mocap_settings
         armature = settings.target_armature
         
         if not armature or armature.type != 'ARMATURE':
-            print(f"DEBUG: No armature or wrong type: armature={armature}, type={armature.type if armature else None}")
             return
         
-        print(f"DEBUG: Retargeting to armature '{armature.name}' with {len(settings.bone_mappings)} mappings")
+        # Recompile only when mappings or the armature changed
+        if self._plan is None or not self._plan.is_valid_for(armature):
+            self.rebuild_plan(settings)
+        
+        plan = self._plan
+        if not len(plan):
+            return
         
-        # Convert to positions
-        positions = landmarks_to_positions(
-            landmarks,
+        # Convert all landmarks to Blender space in one array pass
+        # (rows: x, y, z, visibility; spine proxy appended)
+        positions = convert_landmark_array(
+            landmarks_to_array(landmarks),
             scale=settings.motion_scale,
             z_offset=settings.z_offset
         )
         
-        # Normalize scale
-        if len(positions) > 12:
-            scale_factor = normalize_skeleton_scale(positions, (11, 12))
-            positions = [p * scale_factor for p in positions]
-        
-        # Build landmark dict
-        from ..runtime.trackers import POSE_LANDMARK_NAMES
-        landmark_positions = {}
-        for idx, name in POSE_LANDMARK_NAMES.items():
-            if idx < len(positions):
-                landmark_positions[name] = positions[idx]
-        
-        # Add computed landmarks
-        spine_pos = compute_spine_position(positions)
-        if spine_pos:
-            landmark_positions["SPINE_PROXY"] = spine_pos
-        
-        # Apply to bones
-        bones_updated = 0
-        for mapping in settings.bone_mappings:
-            if not mapping.enabled or not mapping.bone_name:
-                print(f"DEBUG: Skipping mapping - enabled={mapping.enabled}, bone_name={mapping.bone_name}")
-                continue
-            
-            if mapping.bone_name not in armature.pose.bones:
-                print(f"DEBUG: Bone '{mapping.bone_name}' not found in armature")
-                continue
-            
-            bone = armature.pose.bones[mapping.bone_name]
-            landmark_name = mapping.landmark_name
-            
-            if landmark_name not in landmark_positions:
-                print(f"DEBUG: Landmark '{landmark_name}' not found in landmark_positions")
-                continue
-            
-            print(f"DEBUG: Updating bone '{mapping.bone_name}' with landmark '{landmark_name}'")
-            
-            position = landmark_positions[landmark_name]
-            
-            # Apply filter
-            if mapping.bone_name in self._filters:
-                is_foot = "ankle" in mapping.bone_name.lower() or "foot" in mapping.bone_name.lower()
-                confidence = landmarks[list(POSE_LANDMARK_NAMES.keys())[list(POSE_LANDMARK_NAMES.values()).index(landmark_name)]].visibility if hasattr(landmarks[0], 'visibility') else 1.0
-                position = self._filters[mapping.bone_name].filter_position(
-                    position, confidence, is_foot
+        # Gather start/end rows for all planned bones at once
+        starts = positions[plan.landmark_indices]
+        ends = positions[plan.end_indices, :3]
+        
+        # Filter start positions for all bones at once (plan entry i uses bank slot i)
+        filtered, accepted = self._filters.filter_positions(
+            starts[:, :3], starts[:, 3], timestamp=timestamp
+        )
+        
+        # Solve rotations for all chained bones in one batch, then smooth them
+        solve = accepted & plan.has_chain
+        rotations, smoothed = self._filters.filter_rotations(
+            compute_bone_rotations_from_chains(filtered, ends), solve, timestamp=timestamp
+        )
+        # Buffer the whole frame; keyframes are written in bulk on stop
+        if settings.is_recording:
+            buffer = get_recording_buffer()
+            if buffer is not None:
+                buffer.append(
+                    settings.start_frame + settings.recorded_frames,
+                    plan.bone_names, rotations, smoothed
                 )
-            
-            if position is None:
+                settings.recorded_frames += 1
+        
+        rotations = rotations.tolist()
+        accepted = accepted.tolist()
+        smoothed = smoothed.tolist()
+        
+        for i, bone in enumerate(plan.pose_bones):
+            if not accepted[i]:
                 continue
             
             # ROTATION ONLY - Do not set location to prevent bone stretching
             # bone.location = position  # DISABLED - causes stretching
             
-            # Compute rotation from chain
-            next_landmark = get_next_landmark_in_chain(landmark_name)
-            if next_landmark and next_landmark in landmark_positions:
-                end_pos = landmark_positions[next_landmark]
-                rotation = compute_bone_rotation_from_chain(position, end_pos)
-                
-                if rotation:
-                    # Apply smoothing only (skip confidence gate to avoid slerp error)
-                    if mapping.bone_name in self._filters:
-                        try:
-                            rotation = self._filters[mapping.bone_name].smoothing.filter(rotation)
-                        except Exception as e:
-                            print(f"DEBUG: Filter error for {mapping.bone_name}: {e}")
-                    
-                    # Set rotation only
-                    bone.rotation_quaternion = rotation
-                    bones_updated += 1
-                    print(f"DEBUG: Set rotation for '{mapping.bone_name}'")
-            
-            # Insert keyframes if recording
-            if settings.is_recording:
-                # Only keyframe rotation, not location
-                bone.keyframe_insert(data_path="rotation_quaternion", frame=context.scene.frame_current)
-        
-        print(f"DEBUG: Updated {bones_updated} bones this frame")
-        
-        # Advance frame if recording
-        if settings.is_recording:
-            context.scene.frame_set(context.scene.frame_current + 1)
-            settings.recorded_frames += 1
+            if smoothed[i]:
+                bone.rotation_quaternion = rotations[i]
     
     def cancel(self, context):
         """Cleanup."""
@@ -298,15 +482,10 @@ class MOCAP_OT_CaptureStart(Operator):
             wm.event_timer_remove(self._timer)
             self._timer = None
         
-        # Cleanup camera
-        if self._camera:
-            self._camera.release()
-            self._camera = None
-        
-        # Cleanup trackers
-        if self._trackers:
-            self._trackers.cleanup()
-            self._trackers = None
+        # Stop the capture worker (releases camera and trackers)
+        if self._worker:
+            self._worker.stop()
+            self._worker = None
         
         # Unregister viewport draw handler
         viewport_draw.unregister_draw_handler()
@@ -316,6 +495,11 @@ class MOCAP_OT_CaptureStart(Operator):
             if area.type == 'VIEW_3D':
                 area.tag_redraw()
         
+        # Write out a recording still in progress
+        if settings.is_recording:
+            keys = stop_recording_buffer(settings.target_armature)
+            self.report({'INFO'}, f"Recording stopped. {settings.recorded_frames} frames, {keys} keys written.")
+        
         # Update status
         settings.is_capturing = False
         settings.is_recording = False
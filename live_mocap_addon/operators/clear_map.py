@@ -2,6 +2,8 @@
 import bpy
 from bpy.types import Operator
 
+from ..runtime.retarget_plan import invalidate_retarget_plans
+
 
 class MOCAP_OT_ClearBoneMap(Operator):
     """Clear all bone mappings"""
@@ -13,5 +15,6 @@ class MOCAP_OT_ClearBoneMap(Operator):
     def execute(self, context):
         settings = context.scene.mocap_settings
         settings.bone_mappings.clear()
+        invalidate_retarget_plans()
         self.report({'INFO'}, "Bone mappings cleared")
         return {'FINISHED'}
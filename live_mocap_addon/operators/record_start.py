@@ -2,6 +2,8 @@
 import bpy
 from bpy.types import Operator
 
+from ..runtime.recording import start_recording_buffer
+
 
 class MOCAP_OT_RecordStart(Operator):
     """Start recording keyframes"""
@@ -20,6 +22,7 @@ class MOCAP_OT_RecordStart(Operator):
         settings.is_recording = True
         settings.start_frame = context.scene.frame_current
         settings.recorded_frames = 0
+        start_recording_buffer()
         
         self.report({'INFO'}, "Recording started")
         return {'FINISHED'}
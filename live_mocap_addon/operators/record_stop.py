@@ -2,6 +2,8 @@
 import bpy
 from bpy.types import Operator
 
+from ..runtime.recording import stop_recording_buffer
+
 
 class MOCAP_OT_RecordStop(Operator):
     """Stop recording keyframes"""
@@ -14,5 +16,9 @@ class MOCAP_OT_RecordStop(Operator):
         settings = context.scene.mocap_settings
         settings.is_recording = False
         
-        self.report({'INFO'}, f"Recording stopped. {settings.recorded_frames} frames recorded.")
+        # Write all buffered frames to the action at once
+        keys = stop_recording_buffer(settings.target_armature)
+        context.scene.frame_set(settings.start_frame + settings.recorded_frames)
+        
+        self.report({'INFO'}, f"Recording stopped. {settings.recorded_frames} frames recorded ({keys} keys).")
         return {'FINISHED'}
@@ -2,6 +2,8 @@
 import bpy
 from bpy.types import Operator
 
+from ..runtime.retarget_plan import invalidate_retarget_plans
+
 
 class MOCAP_OT_RemoveBoneMapping(Operator):
     """Remove selected bone mapping entry"""
@@ -16,5 +18,6 @@ class MOCAP_OT_RemoveBoneMapping(Operator):
         if len(settings.bone_mappings) > 0:
             settings.bone_mappings.remove(settings.bone_mapping_index)
             settings.bone_mapping_index = max(0, settings.bone_mapping_index - 1)
+            invalidate_retarget_plans()
         
         return {'FINISHED'}
@@ -0,0 +1,32 @@
+"""Remove performer operator."""
+import bpy
+from bpy.types import Operator
+from bpy.props import IntProperty
+
+from ..runtime.retarget_plan import invalidate_retarget_plans
+
+
+class MOCAP_OT_RemovePerformer(Operator):
+    """Remove a performer armature from the list"""
+    bl_idname = "mocap.remove_performer"
+    bl_label = "Remove Performer"
+    bl_description = "Remove a performer armature from multi-person capture"
+    bl_options = {'REGISTER', 'UNDO'}
+    
+    index: IntProperty(
+        name="Index",
+        description="Index of performer to remove",
+        default=0
+    )
+    
+    def execute(self, context):
+        settings = context.scene.mocap_settings
+        
+        if 0 <= self.index < len(settings.performers):
+            settings.performers.remove(self.index)
+            invalidate_retarget_plans()
+            self.report({'INFO'}, f"Removed performer {self.index + 2}")
+            return {'FINISHED'}
+        else:
+            self.report({'WARNING'}, "Invalid performer index")
+            return {'CANCELLED'}
@@ -50,17 +50,17 @@ class MOCAP_PT_MainPanel(Panel):
             # Additional settings
             row = box.row()
             row.prop(settings, "coord_space")
-
+            
             row = box.row(align=True)
             row.prop(settings, "motion_scale")
             row.prop(settings, "z_offset")
-
+            
             row = box.row(align=True)
             row.operator("mocap.autofill_bone_map", text="Build Bone List", icon='BONE_DATA')
             row.operator("mocap.clear_bone_map", text="", icon='X')
             
             box.separator()
-
+            
             # Bone mapping list (only show if bones have been built)
             if len(settings.bone_mappings) > 0:
                 row = box.row()
@@ -70,14 +70,14 @@ class MOCAP_PT_MainPanel(Panel):
                     settings, "bone_mapping_index",
                     rows=1, maxrows=10
                 )
-
+                
                 # Utilities
                 row = box.row(align=True)
                 row.operator("mocap.zero_pose", icon='LOOP_BACK')
                 row.operator("mocap.apply_rest_offset", icon='ORIENTATION_GIMBAL')
-
+                
                 box.separator()
-
+                
                 row = box.row(align=True)
                 row.label(text="Bone mapping:")
                 row.operator("mocap.save_bone_map", icon='EXPORT')
@@ -88,6 +88,9 @@ class MOCAP_PT_MainPanel(Panel):
         box = layout.box()
         box.label(text="MediaPipe Settings", icon='SETTINGS')
         
+        row = box.row()
+        row.prop(settings, "tracker_backend")
+        
         row = box.row()
         row.prop(settings, "mp_delegate")
         
@@ -97,9 +100,23 @@ class MOCAP_PT_MainPanel(Panel):
         row = box.row()
         row.prop(settings, "mp_num_poses")
         
+        if settings.mp_num_poses > 1:
+            # Person 1 drives the target armature, every further person a performer armature
+            row = box.row()
+            row.label(text="Performers:")
+            row.operator("mocap.add_performer", text="", icon='ADD')
+            
+            row = box.row()
+            row.label(text="Person 1: target armature", icon='ARMATURE_DATA')
+            for idx, performer in enumerate(settings.performers):
+                row = box.row(align=True)
+                row.prop(performer, "armature", text=f"Person {idx+2}")
+                op = row.operator("mocap.remove_performer", text="", icon='X')
+                op.index = idx
+        
         box.separator()
         box.label(text="Confidence Thresholds:", icon='SHADERFX')
-
+        
         row = box.row()
         row.prop(settings, "mp_min_detection_confidence", slider=True)
         
@@ -113,8 +130,19 @@ class MOCAP_PT_MainPanel(Panel):
         box.label(text="Smoothing:", icon='SMOOTHCURVE')
         
         row = box.row()
-        row.prop(settings, "smoothing", slider=True)
-
+        row.prop(settings, "filter_mode", expand=True)
+        
+        if settings.filter_mode == 'ONE_EURO':
+            row = box.row(align=True)
+            row.prop(settings, "one_euro_min_cutoff")
+            row.prop(settings, "one_euro_beta")
+            
+            row = box.row()
+            row.prop(settings, "one_euro_d_cutoff")
+        else:
+            row = box.row()
+            row.prop(settings, "smoothing", slider=True)
+    
     def draw_capture_section(self, layout, settings, context):
         """Draw the Capture section."""
         from ..runtime import dependency_check
@@ -125,20 +153,43 @@ class MOCAP_PT_MainPanel(Panel):
         box = layout.box()
         box.label(text="Capture", icon='CAMERA_DATA')
         
-        # Camera indices list
         row = box.row()
-        row.label(text="Camera Indices:")
-        row.operator("mocap.add_camera_index", text="", icon='ADD')
+        row.prop(settings, "source_type")
         
-        if len(settings.camera_indices) > 0:
-            for idx, cam in enumerate(settings.camera_indices):
-                row = box.row(align=True)
-                row.prop(cam, "index", text=f"Camera {idx+1}")
-                op = row.operator("mocap.remove_camera_index", text="", icon='X')
-                op.index = idx
+        if settings.source_type == 'CAMERA':
+            # Camera indices list
+            row = box.row()
+            row.label(text="Camera Indices:")
+            row.operator("mocap.add_camera_index", text="", icon='ADD')
+            
+            if len(settings.camera_indices) > 0:
+                for idx, cam in enumerate(settings.camera_indices):
+                    row = box.row(align=True)
+                    row.prop(cam, "index", text=f"Camera {idx+1}")
+                    row.prop(cam, "path", text="")
+                    op = row.operator("mocap.remove_camera_index", text="", icon='X')
+                    op.index = idx
+                
+                if len(settings.camera_indices) > 1:
+                    row = box.row()
+                    row.prop(settings, "multicam_calibration_path")
+                    row = box.row()
+                    row.prop(settings, "multicam_max_skew")
+            else:
+                row = box.row()
+                row.label(text="No cameras added", icon='INFO')
         else:
             row = box.row()
-            row.label(text="No cameras added", icon='INFO')
+            row.prop(settings, "source_path")
+            
+            row = box.row(align=True)
+            row.prop(settings, "source_realtime", toggle=True)
+            row.prop(settings, "source_loop", toggle=True)
+            
+            if settings.source_type != 'STREAM':
+                row = box.row(align=True)
+                row.prop(settings, "source_start_frame")
+                row.prop(settings, "source_frame_step")
         
         box.separator()
         
@@ -148,26 +199,49 @@ class MOCAP_PT_MainPanel(Panel):
         row = box.row()
         row.prop(settings, "show_camera_feed")
         
+        row = box.row()
+        row.prop(settings, "save_landmark_stream")
+        if settings.save_landmark_stream:
+            row = box.row()
+            row.prop(settings, "landmark_stream_dir")
+        
         row = box.row(align=True)
         row.prop(settings, "use_pose", toggle=True)
         row.prop(settings, "use_hands", toggle=True)
         row.prop(settings, "use_face", toggle=True)
         
+        if settings.use_pose and (settings.use_hands or settings.use_face) and settings.tracker_backend == 'SOLUTIONS':
+            row = box.row(align=True)
+            row.prop(settings, "use_holistic", toggle=True)
+            sub = row.row(align=True)
+            sub.active = not settings.use_holistic
+            sub.prop(settings, "use_roi_crops", toggle=True)
+        
         row = box.row(align=True)
         
         if not settings.is_capturing:
             op = row.operator("mocap.capture_start", icon='PLAY')
-            # Button is enabled if dependencies are available, target armature is set,
-            # at least one camera is added, and at least one bone mapping exists
+            # Button is enabled if dependencies are available (not needed for landmark streams),
+            # target armature is set, a source is set, and at least one bone mapping exists
+            if settings.source_type == 'STREAM':
+                has_source = bool(settings.source_path)
+            elif settings.source_type == 'CAMERA':
+                has_source = dependency_check.all_dependencies_available() and len(settings.camera_indices) > 0
+            else:
+                has_source = dependency_check.all_dependencies_available() and bool(settings.source_path)
             row.enabled = (
-                dependency_check.all_dependencies_available() and 
+                has_source and
                 settings.target_armature is not None and
-                len(settings.camera_indices) > 0 and
                 len(settings.bone_mappings) > 0
             )
         else:
             row.operator("mocap.capture_stop", icon='PAUSE')
         
+        # Offline processing of file sources
+        if settings.source_type != 'CAMERA' and not settings.is_capturing:
+            row = box.row()
+            row.operator("mocap.batch_process", icon='RENDER_ANIMATION')
+        
         # Status display
         if settings.is_capturing:
             status_box = box.box()
@@ -176,6 +250,11 @@ class MOCAP_PT_MainPanel(Panel):
             row = status_box.row()
             row.label(text=f"Dropped: {settings.dropped_frames}")
             row.label(text=f"Latency: {settings.avg_latency:.1f}ms")
+            
+            row = status_box.row()
+            row.label(text=f"Produced: {settings.frames_produced}")
+            row.label(text=f"Used: {settings.frames_consumed}")
+            row.label(text=f"Skipped: {settings.frames_overwritten}")
     
     def draw_record_section(self, layout, settings):
         """Draw the Record section."""
@@ -194,4 +273,17 @@ class MOCAP_PT_MainPanel(Panel):
         
         if settings.is_recording:
             row = box.row()
-            row.label(text=f"Frames: {settings.recorded_frames}", icon='KEYFRAME')
\ No newline at end of file
+            row.label(text=f"Frames: {settings.recorded_frames}", icon='KEYFRAME')
+        
+        box.separator()
+        row = box.row()
+        row.prop(settings, "clean_keyframes")
+        
+        col = box.column(align=True)
+        col.enabled = settings.clean_keyframes
+        col.prop(settings, "clean_tolerance_head")
+        col.prop(settings, "clean_tolerance_torso")
+        col.prop(settings, "clean_tolerance_arms")
+        col.prop(settings, "clean_tolerance_hands")
+        col.prop(settings, "clean_tolerance_legs")
+        col.prop(settings, "clean_location_tolerance")
\ No newline at end of file
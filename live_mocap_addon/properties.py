@@ -3,12 +3,15 @@ Property groups for addon state and bone mappings.
 """
 
 import bpy
+import math
 from bpy.props import (
     StringProperty, IntProperty, FloatProperty, BoolProperty,
     EnumProperty, CollectionProperty, PointerProperty
 )
 from bpy.types import PropertyGroup, UIList
 
+from .runtime.retarget_plan import invalidate_retarget_plans
+
 
 class MOCAP_PG_BoneMapping(PropertyGroup):
     """Single bone mapping entry (MediaPipe landmark → Armature bone)."""
@@ -22,19 +25,22 @@ class MOCAP_PG_BoneMapping(PropertyGroup):
     landmark_name: StringProperty(
         name="Landmark",
         description="MediaPipe landmark name (auto-linked from rig bone)",
-        default=""
+        default="",
+        update=invalidate_retarget_plans
     )
     
     bone_name: StringProperty(
         name="Bone",
         description="Target armature bone name",
-        default=""
+        default="",
+        update=invalidate_retarget_plans
     )
     
     enabled: BoolProperty(
         name="Enabled",
         description="Enable this mapping",
-        default=True
+        default=True,
+        update=invalidate_retarget_plans
     )
 
 
@@ -48,6 +54,25 @@ class MOCAP_PG_CameraIndex(PropertyGroup):
         min=0,
         max=10
     )
+    
+    path: StringProperty(
+        name="Video",
+        description="Video file captured instead of the webcam (stand-in camera for testing multi-camera setups)",
+        default="",
+        subtype='FILE_PATH'
+    )
+
+
+class MOCAP_PG_Performer(PropertyGroup):
+    """Armature driven by one additional tracked person (multi-person mode)."""
+    
+    armature: PointerProperty(
+        type=bpy.types.Object,
+        name="Armature",
+        description="Armature driven by this person",
+        poll=lambda self, obj: obj.type == 'ARMATURE',
+        update=invalidate_retarget_plans
+    )
 
 
 class MOCAP_PG_Settings(PropertyGroup):
@@ -71,7 +96,8 @@ class MOCAP_PG_Settings(PropertyGroup):
         type=bpy.types.Object,
         name="Target Armature",
         description="Armature to apply motion capture to",
-        poll=lambda self, obj: obj.type == 'ARMATURE'
+        poll=lambda self, obj: obj.type == 'ARMATURE',
+        update=invalidate_retarget_plans
     )
     
     coord_space: EnumProperty(
@@ -105,9 +131,71 @@ class MOCAP_PG_Settings(PropertyGroup):
     bone_mapping_index: IntProperty(default=0)
     
     # ========== Capture Settings ==========
+    source_type: EnumProperty(
+        name="Source",
+        description="Where frames or landmarks come from",
+        items=[
+            ('CAMERA', "Camera", "Live webcam"),
+            ('VIDEO', "Video File", "Recorded video file"),
+            ('IMAGES', "Image Sequence", "Folder of images, in file name order"),
+            ('STREAM', "Landmark Stream", "Saved landmark stream (no camera or MediaPipe needed)"),
+        ],
+        default='CAMERA'
+    )
+    
+    source_path: StringProperty(
+        name="Path",
+        description="Video file, image folder, landmark stream folder or exported .npz file",
+        default="",
+        subtype='FILE_PATH'
+    )
+    
+    source_realtime: BoolProperty(
+        name="Real Time",
+        description="Play files at their frame rate (disable to process as fast as inference allows)",
+        default=True
+    )
+    
+    source_loop: BoolProperty(
+        name="Loop",
+        description="Restart the file at the end",
+        default=False
+    )
+    
+    source_frame_step: IntProperty(
+        name="Frame Step",
+        description="Process every n-th frame of the file",
+        default=1,
+        min=1,
+        max=100
+    )
+    
+    source_start_frame: IntProperty(
+        name="Start Frame",
+        description="First file frame to process",
+        default=0,
+        min=0
+    )
+    
     camera_indices: CollectionProperty(type=MOCAP_PG_CameraIndex)
     camera_index_active: IntProperty(default=0)
     
+    multicam_calibration_path: StringProperty(
+        name="Calibration",
+        description="Multi-camera calibration (JSON) used to triangulate landmarks. "
+                    "Without it the cameras' landmarks are averaged, weighted by visibility",
+        default="",
+        subtype='FILE_PATH'
+    )
+    
+    multicam_max_skew: FloatProperty(
+        name="Max Skew (ms)",
+        description="Largest time difference between camera frames fused into one pose",
+        default=20.0,
+        min=1.0,
+        max=200.0
+    )
+    
     target_fps: IntProperty(
         name="FPS",
         description="Target frames per second",
@@ -140,6 +228,34 @@ class MOCAP_PG_Settings(PropertyGroup):
         default=False
     )
     
+    use_holistic: BoolProperty(
+        name="Holistic",
+        description="Track pose, hands and face with one Holistic model that finds hands and face from the pose, "
+                    "instead of three full-frame models (Solutions backend, single person)",
+        default=False
+    )
+    
+    use_roi_crops: BoolProperty(
+        name="Pose-Guided Crops",
+        description="Run hand and face tracking on crops around the pose wrists and nose, "
+                    "and skip them when the pose says they are not visible (Solutions backend)",
+        default=False
+    )
+    
+    # ========== Landmark Streams ==========
+    save_landmark_stream: BoolProperty(
+        name="Save Landmarks",
+        description="Write raw landmarks of every captured frame to a landmark stream on disk",
+        default=False
+    )
+    
+    landmark_stream_dir: StringProperty(
+        name="Stream Folder",
+        description="Folder for saved landmark streams (one sub-folder per capture)",
+        default="//landmarks/",
+        subtype='DIR_PATH'
+    )
+    
     # ========== Status ==========
     is_capturing: BoolProperty(
         name="Is Capturing",
@@ -160,6 +276,17 @@ class MOCAP_PG_Settings(PropertyGroup):
     )
     
     # ========== MediaPipe Advanced Settings ==========
+    tracker_backend: EnumProperty(
+        name="Backend",
+        description="MediaPipe API used for tracking",
+        items=[
+            ('SOLUTIONS', "Solutions", "Legacy solutions API, blocking inference on the capture thread"),
+            ('TASKS', "Tasks (Live Stream)", "Tasks landmarkers in live stream mode: inference overlaps capture, "
+                                             "uses the delegate and presence settings (models download on first use)"),
+        ],
+        default='SOLUTIONS'
+    )
+    
     mp_delegate: EnumProperty(
         name="Inference Delegate",
         description="Hardware acceleration delegate for MediaPipe inference",
@@ -183,13 +310,17 @@ class MOCAP_PG_Settings(PropertyGroup):
     )
     
     mp_num_poses: IntProperty(
-        name="Demo Num Poses",
-        description="Maximum number of poses to detect (1-10)",
+        name="Num Poses",
+        description="Maximum number of people to track (1-10). With more than one, "
+                    "every tracked person drives their own armature",
         default=1,
         min=1,
-        max=10
+        max=10,
+        update=invalidate_retarget_plans
     )
     
+    performers: CollectionProperty(type=MOCAP_PG_Performer)
+    
     mp_min_detection_confidence: FloatProperty(
         name="Minimum Pose Detection Confidence",
         description="Minimum confidence for pose detection (initial detection)",
@@ -218,12 +349,51 @@ class MOCAP_PG_Settings(PropertyGroup):
     )
     
     # ========== Filters ==========
+    filter_mode: EnumProperty(
+        name="Filter",
+        description="Smoothing filter applied to bone positions and rotations",
+        items=[
+            ('EWMA', "EWMA", "Fixed exponential smoothing"),
+            ('ONE_EURO', "One Euro", "Speed-adaptive smoothing: low jitter at rest, low lag in fast motion"),
+        ],
+        default='EWMA',
+        update=invalidate_retarget_plans
+    )
+    
+    one_euro_min_cutoff: FloatProperty(
+        name="Min Cutoff",
+        description="One Euro cutoff frequency at rest in Hz (lower = less jitter, more lag)",
+        default=1.0,
+        min=0.01,
+        max=20.0,
+        update=invalidate_retarget_plans
+    )
+    
+    one_euro_beta: FloatProperty(
+        name="Speed Coefficient",
+        description="One Euro speed coefficient (higher = less lag in fast motion)",
+        default=0.5,
+        min=0.0,
+        max=10.0,
+        update=invalidate_retarget_plans
+    )
+    
+    one_euro_d_cutoff: FloatProperty(
+        name="Derivative Cutoff",
+        description="One Euro cutoff frequency for the speed estimate in Hz",
+        default=1.0,
+        min=0.01,
+        max=20.0,
+        update=invalidate_retarget_plans
+    )
+    
     smoothing: FloatProperty(
         name="Smoothing",
         description="EWMA smoothing factor (0=no smoothing, 1=max smoothing)",
         default=0.5,
         min=0.0,
-        max=1.0
+        max=1.0,
+        update=invalidate_retarget_plans
     )
     
     min_confidence: FloatProperty(
@@ -231,7 +401,8 @@ class MOCAP_PG_Settings(PropertyGroup):
         description="Minimum confidence threshold for landmarks",
         default=0.5,
         min=0.0,
-        max=1.0
+        max=1.0,
+        update=invalidate_retarget_plans
     )
     
     foot_lock_threshold: FloatProperty(
@@ -239,7 +410,8 @@ class MOCAP_PG_Settings(PropertyGroup):
         description="Threshold for foot locking (0=disabled)",
         default=0.0,
         min=0.0,
-        max=0.5
+        max=0.5,
+        update=invalidate_retarget_plans
     )
     
     # ========== Recording ==========
@@ -255,6 +427,68 @@ class MOCAP_PG_Settings(PropertyGroup):
         default=0
     )
     
+    # ========== Keyframe Reduction ==========
+    clean_keyframes: BoolProperty(
+        name="Reduce Keyframes",
+        description="Remove keyframes that linear interpolation reproduces within the tolerance when baking",
+        default=True
+    )
+    
+    clean_tolerance_head: FloatProperty(
+        name="Head",
+        description="Maximum rotation error of head bones after keyframe reduction",
+        subtype='ANGLE',
+        default=math.radians(0.5),
+        min=0.0,
+        max=math.radians(10.0)
+    )
+    
+    clean_tolerance_torso: FloatProperty(
+        name="Torso",
+        description="Maximum rotation error of torso bones after keyframe reduction",
+        subtype='ANGLE',
+        default=math.radians(0.25),
+        min=0.0,
+        max=math.radians(10.0)
+    )
+    
+    clean_tolerance_arms: FloatProperty(
+        name="Arms",
+        description="Maximum rotation error of arms bones after keyframe reduction",
+        subtype='ANGLE',
+        default=math.radians(0.5),
+        min=0.0,
+        max=math.radians(10.0)
+    )
+    
+    clean_tolerance_hands: FloatProperty(
+        name="Hands",
+        description="Maximum rotation error of hands bones after keyframe reduction",
+        subtype='ANGLE',
+        default=math.radians(1.0),
+        min=0.0,
+        max=math.radians(10.0)
+    )
+    
+    clean_tolerance_legs: FloatProperty(
+        name="Legs",
+        description="Maximum rotation error of legs bones after keyframe reduction",
+        subtype='ANGLE',
+        default=math.radians(0.25),
+        min=0.0,
+        max=math.radians(10.0)
+    )
+    
+    clean_location_tolerance: FloatProperty(
+        name="Location",
+        description="Maximum location error after keyframe reduction",
+        subtype='DISTANCE',
+        default=0.001,
+        min=0.0,
+        max=0.1,
+        precision=4
+    )
+    
     # ========== Performance ==========
     dropped_frames: IntProperty(
         name="Dropped Frames",
@@ -262,6 +496,24 @@ class MOCAP_PG_Settings(PropertyGroup):
         default=0
     )
     
+    frames_produced: IntProperty(
+        name="Frames Produced",
+        description="Number of frames captured and processed by the capture worker",
+        default=0
+    )
+    
+    frames_consumed: IntProperty(
+        name="Frames Consumed",
+        description="Number of processed frames retargeted by the modal operator",
+        default=0
+    )
+    
+    frames_overwritten: IntProperty(
+        name="Frames Overwritten",
+        description="Number of processed frames replaced by a newer one before being retargeted",
+        default=0
+    )
+    
     avg_latency: FloatProperty(
         name="Average Latency",
         description="Average frame processing latency in milliseconds",
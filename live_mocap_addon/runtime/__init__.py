@@ -6,9 +6,15 @@ from . import library_manager
 from . import dependency_check
 from . import capture
 from . import trackers
+from . import pipeline
+from . import multicam
+from . import people
+from . import landmark_stream
 from . import retarget
+from . import retarget_plan
 from . import mapping
 from . import recording
+from . import batch
 from . import filters
 from . import viewport_draw
 
@@ -29,9 +35,15 @@ __all__ = [
     'dependency_check',
     'capture',
     'trackers',
+    'pipeline',
+    'multicam',
+    'people',
+    'landmark_stream',
     'retarget',
+    'retarget_plan',
     'mapping',
     'recording',
+    'batch',
     'filters',
     'viewport_draw',
     'initialize',
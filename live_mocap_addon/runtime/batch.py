@@ -0,0 +1,287 @@
+"""
+Offline batch processing: clip -> landmarks -> filtered rotations -> action.
+
+Everything up to the rotation arrays is plain NumPy and runs on a worker
+thread (or the calling thread when headless). Only the final F-Curve
+write touches bpy.
+"""
+
+import threading
+import time
+from typing import Optional, Callable
+
+import numpy as np
+
+from .retarget import landmarks_to_array, convert_landmark_array, compute_bone_rotations_from_chains
+from .retarget_plan import RetargetPlan, build_retarget_plan
+from .filters import FilterBank
+from .recording import create_action, write_rotation_fcurves
+from ..utils.logging_utils import get_logger
+
+
+class BatchJob:
+    """
+    Runs a frame source through detection, filtering and the rotation solver.
+    
+    Frames are detected one by one, then converted, filtered and solved
+    in chunks of chunk_size frames. Results accumulate in growable
+    (frames, bones, 4) arrays that finish() writes to an action in bulk.
+    """
+    
+    def __init__(self, plan: RetargetPlan, source, trackers, filters: FilterBank,
+                 scale: float = 1.0, z_offset: float = 0.0, chunk_size: int = 32):
+        """
+        Initialize job.
+        
+        Args:
+            plan: Compiled retarget plan
+            source: Unopened frame source (non-realtime)
+            trackers: Uninitialized trackers (or the same ReplaySource)
+            filters: Filter bank sized for the plan
+            scale: Motion scale
+            z_offset: Vertical offset
+            chunk_size: Frames converted and solved per batch
+        """
+        self.plan = plan
+        self.source = source
+        self.trackers = trackers
+        self.filters = filters
+        self.scale = scale
+        self.z_offset = z_offset
+        self.chunk_size = max(1, chunk_size)
+        self.logger = get_logger()
+        
+        self.frames_done = 0
+        self.frames_detected = 0
+        self.total_frames = 0
+        self.elapsed = 0.0
+        self.error_message = ""
+        self.finished = False
+        
+        bone_count = len(plan)
+        self.rotations = np.zeros((0, bone_count, 4), dtype=np.float32)
+        self.valid = np.zeros((0, bone_count), dtype=bool)
+        self.timestamps = np.zeros(0)
+        self.frame_step = getattr(source, 'frame_step', 1)
+        
+        self._cancel_event = threading.Event()
+        self._thread = None
+    
+    @property
+    def fps(self) -> float:
+        """Throughput in frames per second."""
+        return self.frames_done / self.elapsed if self.elapsed > 0 else 0.0
+    
+    @property
+    def progress(self) -> float:
+        """Progress in 0..1 (0 while the frame count is unknown)."""
+        if not self.total_frames:
+            return 0.0
+        return min(1.0, self.frames_done / self.total_frames)
+    
+    def start(self):
+        """Run the job on a background thread."""
+        self._thread = threading.Thread(target=self.run, name="MocapBatch", daemon=True)
+        self._thread.start()
+    
+    def cancel(self):
+        """Request cancellation and wait for the worker to stop."""
+        self._cancel_event.set()
+        if self._thread is not None:
+            self._thread.join(5.0)
+            self._thread = None
+    
+    def is_cancelled(self) -> bool:
+        return self._cancel_event.is_set()
+    
+    def run(self, progress_callback: Optional[Callable[['BatchJob'], None]] = None):
+        """
+        Process the whole source on the calling thread.
+        
+        Args:
+            progress_callback: Called after every chunk with the job
+        """
+        start_time = time.perf_counter()
+        try:
+            if not self.source.open():
+                self.error_message = "Failed to open source"
+                return
+            if not self.trackers.initialize():
+                self.error_message = "Failed to initialize trackers"
+                return
+            
+            self.total_frames = self._source_length()
+            landmarks = np.full((self.chunk_size, 33, 4), np.nan, dtype=np.float32)
+            timestamps = np.zeros(self.chunk_size)
+            detected = np.zeros(self.chunk_size, dtype=bool)
+            count = 0
+            
+            while not self._cancel_event.is_set():
+                frame_result = self.source.read_frame()
+                if not frame_result:
+                    if self.source.is_finished():
+                        break
+                    continue
+                
+                result = self.trackers.process_frame(frame_result[2])
+                timestamps[count] = self.source.frame_timestamp
+                detected[count] = bool(result.pose_landmarks)
+                if detected[count]:
+                    landmarks[count] = landmarks_to_array(result.pose_landmarks)[:33]
+                count += 1
+                
+                if count == self.chunk_size:
+                    self._process_chunk(landmarks, timestamps, detected, count)
+                    count = 0
+                    self.elapsed = time.perf_counter() - start_time
+                    if progress_callback is not None:
+                        progress_callback(self)
+            
+            if count and not self._cancel_event.is_set():
+                self._process_chunk(landmarks, timestamps, detected, count)
+        
+        except Exception as e:
+            self.error_message = f"Batch processing error: {str(e)}"
+            self.logger.error(self.error_message)
+        
+        finally:
+            self.elapsed = time.perf_counter() - start_time
+            self.trackers.cleanup()
+            self.source.release()
+            self.finished = True
+            self.logger.info(f"Batch processed {self.frames_done} frames in {self.elapsed:.1f}s ({self.fps:.1f} fps)")
+    
+    def _source_length(self) -> int:
+        """Number of frames the source will deliver (0 if unknown)."""
+        total = self.source.get_total_frames() - getattr(self.source, 'start_frame', 0)
+        return max(0, -(-total // getattr(self.source, 'frame_step', 1)))
+    
+    def _process_chunk(self, landmarks: np.ndarray, timestamps: np.ndarray,
+                       detected: np.ndarray, count: int):
+        """Convert, filter and solve count buffered frames."""
+        plan = self.plan
+        positions = convert_landmark_array(landmarks[:count], scale=self.scale, z_offset=self.z_offset)
+        starts = positions[:, plan.landmark_indices]
+        ends = positions[:, plan.end_indices, :3]
+        
+        # Position filtering is sequential in time, vectorized across bones
+        filtered = np.zeros(starts.shape[:2] + (3,))
+        accepted = np.zeros(starts.shape[:2], dtype=bool)
+        for k in range(count):
+            if detected[k]:
+                filtered[k], accepted[k] = self.filters.filter_positions(
+                    starts[k, :, :3], starts[k, :, 3], timestamp=timestamps[k]
+                )
+        
+        # One solve for the whole chunk
+        bone_count = len(plan)
+        rotations = compute_bone_rotations_from_chains(
+            filtered.reshape(-1, 3), ends.reshape(-1, 3)
+        ).reshape(count, bone_count, 4)
+        
+        solve = accepted & plan.has_chain
+        valid = np.zeros_like(solve)
+        for k in range(count):
+            if detected[k]:
+                rotations[k], valid[k] = self.filters.filter_rotations(
+                    rotations[k], solve[k], timestamp=timestamps[k]
+                )
+        
+        self._append(rotations, valid, timestamps[:count])
+        self.frames_done += count
+        self.frames_detected += int(detected[:count].sum())
+    
+    def _append(self, rotations: np.ndarray, valid: np.ndarray, timestamps: np.ndarray):
+        """Append results, growing the buffers geometrically."""
+        used = self.frames_done
+        needed = used + len(rotations)
+        if needed > len(self.rotations):
+            capacity = max(needed, 2 * len(self.rotations), self.total_frames, 256)
+            grown = np.zeros((capacity,) + self.rotations.shape[1:], dtype=np.float32)
+            grown[:used] = self.rotations[:used]
+            self.rotations = grown
+            grown_valid = np.zeros((capacity,) + self.valid.shape[1:], dtype=bool)
+            grown_valid[:used] = self.valid[:used]
+            self.valid = grown_valid
+            grown_timestamps = np.zeros(capacity)
+            grown_timestamps[:used] = self.timestamps[:used]
+            self.timestamps = grown_timestamps
+        
+        self.rotations[used:needed] = rotations
+        self.valid[used:needed] = valid
+        self.timestamps[used:needed] = timestamps
+    
+    def finish(self, armature, start_frame: int = 1, action_name: Optional[str] = None,
+               fps: Optional[float] = None):
+        """
+        Write the results to a new action on the armature (main thread).
+        
+        Args:
+            armature: Target armature
+            start_frame: Frame of the first processed clip frame
+            action_name: Action name (auto-generated if None)
+            fps: Scene frame rate; keys are placed at the source timestamps
+                 of their frames. None keys the source frames one scene
+                 frame apart (frame_step apart when frames were skipped).
+        
+        Returns:
+            Tuple of (action, keyframe count)
+        """
+        action = create_action(armature, action_name)
+        count = self.frames_done
+        if fps:
+            frames = start_frame + (self.timestamps[:count] - self.timestamps[0]) * fps
+        else:
+            frames = start_frame + np.arange(count) * self.frame_step
+        keys = write_rotation_fcurves(
+            armature, action, self.plan.bone_names,
+            frames, self.rotations[:count], self.valid[:count]
+        )
+        return action, keys
+
+
+def process_clip(armature, bone_mappings, source, trackers, settings=None,
+                 start_frame: int = 1, action_name: Optional[str] = None,
+                 chunk_size: int = 32, progress_callback: Optional[Callable] = None,
+                 fps: Optional[float] = None):
+    """
+    Process a whole clip synchronously and bake it to an action.
+    
+    Usable headless, e.g. from `blender --background --python`:
+        
+        source = create_frame_source('VIDEO', path=path, realtime=False)
+        trackers = MediaPipeTrackers(model_complexity=1)
+        action, job = process_clip(armature, settings.bone_mappings, source, trackers, settings)
+    
+    Args:
+        armature: Target armature
+        bone_mappings: Collection of MOCAP_PG_BoneMapping
+        source: Unopened non-realtime frame source
+        trackers: Uninitialized trackers (or the same ReplaySource)
+        settings: MOCAP_PG_Settings for filter, scale and offset (defaults if None)
+        start_frame: Frame of the first clip frame
+        action_name: Action name (auto-generated if None)
+        chunk_size: Frames converted and solved per batch
+        progress_callback: Called after every chunk with the job
+        fps: Scene frame rate to place keys at the clip's timestamps (see BatchJob.finish)
+    
+    Returns:
+        Tuple of (action or None, BatchJob)
+    """
+    plan = build_retarget_plan(armature, bone_mappings)
+    if settings is not None:
+        filters = FilterBank.from_settings(settings, plan)
+        scale, z_offset = settings.motion_scale, settings.z_offset
+    else:
+        filters = FilterBank(len(plan), is_foot=plan.is_foot)
+        scale, z_offset = 1.0, 0.0
+    
+    job = BatchJob(plan, source, trackers, filters, scale, z_offset, chunk_size)
+    job.run(progress_callback)
+    
+    if job.error_message or not job.frames_done:
+        return None, job
+    
+    action, keys = job.finish(armature, start_frame, action_name, fps)
+    get_logger().info(f"Baked {keys} keyframes to '{action.name}'")
+    return action, job
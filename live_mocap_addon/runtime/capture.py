@@ -1,14 +1,110 @@
 """
-Camera capture management using OpenCV.
+Frame sources using OpenCV: webcam, video file and image sequence.
 """
 
-from typing import Optional, Tuple
+from typing import Optional, Tuple, List
+import os
+import queue
+import threading
 import time
 
 from ..utils.logging_utils import get_logger
 
 
-class CameraCapture:
+# Source types accepted by create_frame_source
+SOURCE_TYPES = ('CAMERA', 'VIDEO', 'IMAGES')
+
+# File extensions picked up by ImageSequenceSource
+IMAGE_EXTENSIONS = ('.png', '.jpg', '.jpeg', '.bmp', '.tif', '.tiff', '.exr')
+
+
+class FrameSource:
+    """
+    Base interface for frame sources.
+    
+    Sources are opened, read and released on the capture worker thread.
+    read_frame returns (success, frame_bgr, frame_rgb) or None, and sets
+    frame_timestamp to the frame time in seconds (capture clock for live
+    sources, media time for files).
+    """
+    
+    def __init__(self):
+        self.logger = get_logger()
+        self.frame_timestamp = 0.0
+        
+        self._frame_count = 0
+        self._dropped_frames = 0
+        self._last_frame_time = 0
+        self._frame_times = []
+    
+    def open(self) -> bool:
+        raise NotImplementedError
+    
+    def read_frame(self) -> Optional[Tuple]:
+        raise NotImplementedError
+    
+    def release(self):
+        raise NotImplementedError
+    
+    def is_opened(self) -> bool:
+        raise NotImplementedError
+    
+    def is_finished(self) -> bool:
+        """Check if the source ran out of frames (never for a live source)."""
+        return False
+    
+    def get_total_frames(self) -> int:
+        """Get the number of frames the source holds (0 if unknown or live)."""
+        return 0
+    
+    def get_frame_count(self) -> int:
+        """Get total number of frames captured."""
+        return self._frame_count
+    
+    def get_dropped_frames(self) -> int:
+        """Get number of dropped frames."""
+        return self._dropped_frames
+    
+    def get_average_fps(self) -> float:
+        """Get average FPS over recent frames."""
+        if not self._frame_times:
+            return 0.0
+        
+        avg_frame_time = sum(self._frame_times) / len(self._frame_times)
+        if avg_frame_time > 0:
+            return 1.0 / avg_frame_time
+        return 0.0
+    
+    def get_average_latency(self) -> float:
+        """Get average frame latency in milliseconds."""
+        if not self._frame_times:
+            return 0.0
+        
+        avg_frame_time = sum(self._frame_times) / len(self._frame_times)
+        return avg_frame_time * 1000.0
+    
+    def get_resolution(self) -> Tuple[int, int]:
+        """Get frame resolution (width, height)."""
+        return (0, 0)
+    
+    def _reset_timing(self):
+        self._frame_count = 0
+        self._dropped_frames = 0
+        self._last_frame_time = time.time()
+        self._frame_times = []
+    
+    def _record_frame_time(self):
+        """Update FPS statistics for a delivered frame."""
+        current_time = time.time()
+        frame_time = current_time - self._last_frame_time
+        self._frame_times.append(frame_time)
+        if len(self._frame_times) > 30:
+            self._frame_times.pop(0)
+        self._last_frame_time = current_time
+        self._frame_count += 1
+
+
+class CameraCapture(FrameSource):
     """Manages webcam capture with OpenCV."""
     
     def __init__(self, camera_index: int = 0, target_fps: int = 30):
@@ -19,15 +115,10 @@ class CameraCapture:
             camera_index: Webcam device index
             target_fps: Target frames per second
         """
+        super().__init__()
         self.camera_index = camera_index
         self.target_fps = target_fps
         self.cap = None
-        self.logger = get_logger()
-        
-        self._frame_count = 0
-        self._dropped_frames = 0
-        self._last_frame_time = 0
-        self._frame_times = []
     
     def open(self) -> bool:
         """
@@ -56,12 +147,10 @@ class CameraCapture:
             self.cap.set(cv2.CAP_PROP_FPS, self.target_fps)
             
             self.logger.info(f"Camera {self.camera_index} opened successfully")
-            self._frame_count = 0
-            self._dropped_frames = 0
-            self._last_frame_time = time.time()
+            self._reset_timing()
             
             return True
-            
+        
         except Exception as e:
             self.logger.error(f"Failed to open camera: {str(e)}")
             return False
@@ -84,6 +173,7 @@ class CameraCapture:
         
         try:
             ret, frame = self.cap.read()
+            self.frame_timestamp = time.perf_counter()
             
             if not ret:
                 self._dropped_frames += 1
@@ -93,16 +183,10 @@ class CameraCapture:
             frame_rgb = cv2.cvtColor(frame, cv2.COLOR_BGR2RGB)
             
             # Update timing
-            current_time = time.time()
-            frame_time = current_time - self._last_frame_time
-            self._frame_times.append(frame_time)
-            if len(self._frame_times) > 30:
-                self._frame_times.pop(0)
-            self._last_frame_time = current_time
-            self._frame_count += 1
+            self._record_frame_time()
             
             return (True, frame, frame_rgb)
-            
+        
         except Exception as e:
             self.logger.error(f"Frame read error: {str(e)}")
             self._dropped_frames += 1
@@ -119,32 +203,6 @@ class CameraCapture:
         """Check if camera is currently opened."""
         return self.cap is not None and self.cap.isOpened()
     
-    def get_frame_count(self) -> int:
-        """Get total number of frames captured."""
-        return self._frame_count
-    
-    def get_dropped_frames(self) -> int:
-        """Get number of dropped frames."""
-        return self._dropped_frames
-    
-    def get_average_fps(self) -> float:
-        """Get average FPS over recent frames."""
-        if not self._frame_times:
-            return 0.0
-        
-        avg_frame_time = sum(self._frame_times) / len(self._frame_times)
-        if avg_frame_time > 0:
-            return 1.0 / avg_frame_time
-        return 0.0
-    
-    def get_average_latency(self) -> float:
-        """Get average frame latency in milliseconds."""
-        if not self._frame_times:
-            return 0.0
-        
-        avg_frame_time = sum(self._frame_times) / len(self._frame_times)
-        return avg_frame_time * 1000.0
-    
     def get_resolution(self) -> Tuple[int, int]:
         """Get camera resolution (width, height)."""
         from ..runtime.dependency_check import safe_import_cv2
@@ -156,3 +214,395 @@ class CameraCapture:
         width = int(self.cap.get(cv2.CAP_PROP_FRAME_WIDTH))
         height = int(self.cap.get(cv2.CAP_PROP_FRAME_HEIGHT))
         return (width, height)
+
+
+class FileFrameSource(FrameSource):
+    """
+    Base class for file-backed sources with a read-ahead decode thread.
+    
+    Frames are decoded on a background thread into a bounded queue, so
+    decoding overlaps with inference. In real-time mode frames are paced
+    by their media time, otherwise they are delivered as fast as the
+    consumer takes them.
+    """
+    
+    _END = object()
+    
+    def __init__(self, path: str, realtime: bool = True, frame_step: int = 1,
+                 start_frame: int = 0, loop: bool = False, queue_size: int = 8):
+        """
+        Initialize file source.
+        
+        Args:
+            path: File or directory path
+            realtime: Pace frames at the media frame rate (False = as fast as possible)
+            frame_step: Deliver every n-th frame
+            start_frame: First frame to deliver
+            loop: Restart at start_frame at the end of the file
+            queue_size: Number of decoded frames to read ahead
+        """
+        super().__init__()
+        self.path = path
+        self.realtime = realtime
+        self.frame_step = max(1, frame_step)
+        self.start_frame = max(0, start_frame)
+        self.loop = loop
+        self.fps = 30.0
+        self.frame_index = -1
+        self._time_offset = 0.0
+        
+        self._queue = queue.Queue(maxsize=max(1, queue_size))
+        self._thread = None
+        self._stop_event = threading.Event()
+        # Seek requests and the generation they start are only changed together
+        self._seek_lock = threading.Lock()
+        self._seek_request = None
+        self._generation = 0
+        self._finished = False
+        self._opened = False
+        self._clock_start = 0.0
+        self._clock_frame = 0
+    
+    # ----- Backend hooks -----
+    
+    def _open_reader(self) -> bool:
+        raise NotImplementedError
+    
+    def _close_reader(self):
+        raise NotImplementedError
+    
+    def _read_next(self):
+        """Decode the next frame (BGR) or return None at the end."""
+        raise NotImplementedError
+    
+    def _skip(self, count: int):
+        """Skip frames without decoding where the backend allows it."""
+        for _ in range(count):
+            if self._read_next() is None:
+                return
+    
+    def _seek_reader(self, frame_index: int):
+        raise NotImplementedError
+    
+    # ----- FrameSource interface -----
+    
+    def open(self) -> bool:
+        """
+        Open the file and start the decode thread.
+        
+        Returns:
+            True if the source opened successfully
+        """
+        from ..runtime.dependency_check import safe_import_cv2
+        if safe_import_cv2() is None:
+            self.logger.error("OpenCV not available")
+            return False
+        
+        try:
+            if not self._open_reader():
+                return False
+        except Exception as e:
+            self.logger.error(f"Failed to open {self.path}: {str(e)}")
+            return False
+        
+        self._opened = True
+        self._finished = False
+        self._stop_event.clear()
+        self._seek_request = self.start_frame if self.start_frame else None
+        self.frame_index = self.start_frame - 1
+        self._time_offset = 0.0
+        self._reset_timing()
+        self._restart_clock(self.start_frame)
+        
+        self._thread = threading.Thread(target=self._decode_loop, name="MocapDecode", daemon=True)
+        self._thread.start()
+        
+        self.logger.info(f"Opened {self.path} ({self.get_total_frames()} frames at {self.fps:.2f} fps)")
+        return True
+    
+    def read_frame(self) -> Optional[Tuple]:
+        """
+        Take the next decoded frame, waiting for its media time in real-time mode.
+        
+        Returns:
+            Tuple of (success, frame, frame_rgb) or None if no frame is ready
+        """
+        if not self._opened or self._finished:
+            return None
+        
+        try:
+            item = self._queue.get(timeout=0.1)
+        except queue.Empty:
+            return None
+        
+        generation, index, frame, frame_rgb = item
+        if generation != self._generation:
+            # Decoded (or ended) before the last seek
+            return None
+        
+        if index is self._END:
+            self._finished = True
+            return None
+        
+        if index < self.frame_index:
+            # Looped or seeked back: keep frame timestamps increasing
+            self._time_offset += (self.frame_index + self.frame_step - index) / self.fps
+            self._restart_clock(index)
+        
+        self.frame_index = index
+        self.frame_timestamp = self._time_offset + index / self.fps
+        
+        if self.realtime:
+            delay = self._clock_start + (index - self._clock_frame) / self.fps - time.perf_counter()
+            if delay > 0:
+                time.sleep(delay)
+        
+        self._record_frame_time()
+        return (True, frame, frame_rgb)
+    
+    def seek(self, frame_index: int):
+        """
+        Continue delivery from a frame.
+        
+        Args:
+            frame_index: Frame to deliver next
+        """
+        with self._seek_lock:
+            self._generation += 1
+            self._seek_request = max(0, frame_index)
+        self._finished = False
+        self._restart_clock(frame_index)
+        self._drain()
+    
+    def release(self):
+        """Stop the decode thread and close the file."""
+        self._stop_event.set()
+        self._drain()
+        if self._thread is not None:
+            self._thread.join(2.0)
+            self._thread = None
+        
+        if self._opened:
+            self._close_reader()
+            self._opened = False
+            self.logger.info(f"Released {self.path}")
+    
+    def is_opened(self) -> bool:
+        return self._opened
+    
+    def is_finished(self) -> bool:
+        return self._finished
+    
+    # ----- Decode thread -----
+    
+    def _restart_clock(self, frame_index: int):
+        self._clock_start = time.perf_counter()
+        self._clock_frame = frame_index
+    
+    def _drain(self):
+        try:
+            while True:
+                self._queue.get_nowait()
+        except queue.Empty:
+            pass
+    
+    def _put(self, item) -> bool:
+        """Queue an item, waiting for space. Returns False when stopping."""
+        while not self._stop_event.is_set():
+            try:
+                self._queue.put(item, timeout=0.1)
+                return True
+            except queue.Full:
+                continue
+        return False
+    
+    def _decode_loop(self):
+        from ..runtime.dependency_check import safe_import_cv2
+        cv2 = safe_import_cv2()
+        
+        index = 0
+        generation = self._generation
+        try:
+            while not self._stop_event.is_set():
+                # Take a seek request together with its generation, so frames
+                # decoded from the old position are never tagged with the new one
+                with self._seek_lock:
+                    request = self._seek_request
+                    self._seek_request = None
+                    generation = self._generation
+                if request is not None:
+                    index = request
+                    self._seek_reader(index)
+                
+                frame = self._read_next()
+                
+                if frame is None:
+                    if self.loop and index > self.start_frame:
+                        with self._seek_lock:
+                            if self._seek_request is None:
+                                self._seek_request = self.start_frame
+                        continue
+                    if not self._put((generation, self._END, None, None)):
+                        return
+                    # Wait for a seek or stop
+                    while self._seek_request is None and not self._stop_event.is_set():
+                        time.sleep(0.01)
+                    continue
+                
+                frame_rgb = cv2.cvtColor(frame, cv2.COLOR_BGR2RGB)
+                if not self._put((generation, index, frame, frame_rgb)):
+                    return
+                
+                if self.frame_step > 1:
+                    self._skip(self.frame_step - 1)
+                index += self.frame_step
+        
+        except Exception as e:
+            self.logger.error(f"Decode error in {self.path}: {str(e)}")
+            self._put((generation, self._END, None, None))
+
+
+class VideoFileSource(FileFrameSource):
+    """Reads frames from a video file with OpenCV."""
+    
+    def __init__(self, path: str, **kwargs):
+        super().__init__(path, **kwargs)
+        self.cap = None
+        self._resolution = (0, 0)
+        self._total_frames = 0
+    
+    def _open_reader(self) -> bool:
+        from ..runtime.dependency_check import safe_import_cv2
+        cv2 = safe_import_cv2()
+        
+        self.cap = cv2.VideoCapture(self.path)
+        if not self.cap.isOpened():
+            self.logger.error(f"Failed to open video {self.path}")
+            self.cap = None
+            return False
+        
+        self.fps = self.cap.get(cv2.CAP_PROP_FPS) or 30.0
+        self._total_frames = int(self.cap.get(cv2.CAP_PROP_FRAME_COUNT))
+        self._resolution = (
+            int(self.cap.get(cv2.CAP_PROP_FRAME_WIDTH)),
+            int(self.cap.get(cv2.CAP_PROP_FRAME_HEIGHT))
+        )
+        return True
+    
+    def _close_reader(self):
+        if self.cap is not None:
+            self.cap.release()
+            self.cap = None
+    
+    def _read_next(self):
+        ret, frame = self.cap.read()
+        return frame if ret else None
+    
+    def _skip(self, count: int):
+        # grab() demuxes without decoding the image
+        for _ in range(count):
+            if not self.cap.grab():
+                return
+    
+    def _seek_reader(self, frame_index: int):
+        from ..runtime.dependency_check import safe_import_cv2
+        cv2 = safe_import_cv2()
+        self.cap.set(cv2.CAP_PROP_POS_FRAMES, frame_index)
+    
+    def get_total_frames(self) -> int:
+        return self._total_frames
+    
+    def get_resolution(self) -> Tuple[int, int]:
+        return self._resolution
+
+
+class ImageSequenceSource(FileFrameSource):
+    """Reads frames from the images in a directory, in file name order."""
+    
+    def __init__(self, path: str, fps: float = 30.0, **kwargs):
+        super().__init__(path, **kwargs)
+        self.fps = fps
+        self.files: List[str] = []
+        self._position = 0
+        self._resolution = (0, 0)
+    
+    def _open_reader(self) -> bool:
+        from ..runtime.dependency_check import safe_import_cv2
+        cv2 = safe_import_cv2()
+        
+        if not os.path.isdir(self.path):
+            self.logger.error(f"Image directory not found: {self.path}")
+            return False
+        
+        self.files = sorted(
+            os.path.join(self.path, name) for name in os.listdir(self.path)
+            if name.lower().endswith(IMAGE_EXTENSIONS)
+        )
+        if not self.files:
+            self.logger.error(f"No images found in {self.path}")
+            return False
+        
+        first = cv2.imread(self.files[0])
+        if first is not None:
+            self._resolution = (first.shape[1], first.shape[0])
+        self._position = 0
+        return True
+    
+    def _close_reader(self):
+        self.files = []
+    
+    def _read_next(self):
+        from ..runtime.dependency_check import safe_import_cv2
+        cv2 = safe_import_cv2()
+        
+        while self._position < len(self.files):
+            frame = cv2.imread(self.files[self._position])
+            self._position += 1
+            if frame is not None:
+                return frame
+            self._dropped_frames += 1
+        return None
+    
+    def _skip(self, count: int):
+        self._position += count
+    
+    def _seek_reader(self, frame_index: int):
+        self._position = frame_index
+    
+    def get_total_frames(self) -> int:
+        return len(self.files)
+    
+    def get_resolution(self) -> Tuple[int, int]:
+        return self._resolution
+
+
+def create_frame_source(source_type: str = 'CAMERA', camera_index: int = 0,
+                        path: str = "", target_fps: int = 30,
+                        realtime: bool = True, frame_step: int = 1,
+                        start_frame: int = 0, loop: bool = False) -> FrameSource:
+    """
+    Create a frame source.
+    
+    Args:
+        source_type: 'CAMERA', 'VIDEO' or 'IMAGES'
+        camera_index: Webcam device index (CAMERA)
+        path: Video file or image directory (VIDEO, IMAGES)
+        target_fps: Camera frame rate, or image sequence frame rate
+        realtime: Pace file sources at their frame rate
+        frame_step: Deliver every n-th frame (file sources)
+        start_frame: First frame to deliver (file sources)
+        loop: Restart file sources at the end
+    
+    Returns:
+        Unopened FrameSource
+    """
+    if source_type == 'CAMERA':
+        return CameraCapture(camera_index, target_fps)
+    
+    options = dict(realtime=realtime, frame_step=frame_step, start_frame=start_frame, loop=loop)
+    if source_type == 'VIDEO':
+        return VideoFileSource(path, **options)
+    if source_type == 'IMAGES':
+        return ImageSequenceSource(path, fps=float(target_fps), **options)
+    
+    raise ValueError(f"Unknown source type '{source_type}'")
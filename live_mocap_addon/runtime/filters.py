@@ -3,7 +3,8 @@ Smoothing filters and confidence gating for motion data.
 """
 
 from mathutils import Vector, Quaternion
-from typing import Optional, Union
+from typing import Optional, Union, Tuple, List
+import numpy as np
 
 
 class SmoothingFilter:
@@ -211,3 +212,378 @@ class MultiFilter:
         self.confidence_gate.reset()
         if self.foot_lock:
             self.foot_lock.reset()
+
+
+def slerp_batch(q_from: np.ndarray, q_to: np.ndarray, factor) -> np.ndarray:
+    """
+    Batched Quaternion.slerp (shortest path, linear fallback for tiny angles).
+    
+    Args:
+        q_from: (B, 4) start quaternions (w, x, y, z)
+        q_to: (B, 4) end quaternions (w, x, y, z)
+        factor: Interpolation factor, scalar or (B,)
+    
+    Returns:
+        (B, 4) interpolated quaternions
+    """
+    factor = np.broadcast_to(np.asarray(factor, dtype=np.float64), (len(q_from),))
+    cosom = np.einsum('ij,ij->i', q_from, q_to)
+    
+    # Rotate around the shortest angle
+    q_to = np.where((cosom < 0.0)[:, np.newaxis], -q_to, q_to)
+    cosom = np.abs(cosom)
+    
+    w_from = 1.0 - factor
+    w_to = factor.copy()
+    
+    spherical = (1.0 - cosom) > 0.0001
+    if spherical.any():
+        omega = np.arccos(np.clip(cosom[spherical], -1.0, 1.0))
+        sinom = np.sin(omega)
+        w_from[spherical] = np.sin((1.0 - factor[spherical]) * omega) / sinom
+        w_to[spherical] = np.sin(factor[spherical] * omega) / sinom
+    
+    return q_from * w_from[:, np.newaxis] + q_to * w_to[:, np.newaxis]
+
+
+# Filter modes supported by FilterBank
+FILTER_MODES = ('EWMA', 'ONE_EURO')
+
+# One Euro parameter multipliers per bone group: (min_cutoff, beta).
+# Torso and head move slowly and get a low cutoff against jitter; hands
+# and fingers move fast and get a higher speed coefficient against lag.
+ONE_EURO_GROUP_SCALES = {
+    'HEAD': (0.8, 0.5),
+    'TORSO': (0.5, 0.5),
+    'ARMS': (1.0, 1.0),
+    'HANDS': (1.5, 2.0),
+    'LEGS': (0.8, 1.0),
+}
+
+
+def one_euro_alpha(dt: np.ndarray, cutoff: np.ndarray) -> np.ndarray:
+    """
+    One Euro smoothing factor for a cutoff frequency.
+    
+    Args:
+        dt: Elapsed time in seconds
+        cutoff: Cutoff frequency in Hz
+    
+    Returns:
+        Lerp factor in (0, 1]
+    """
+    tau = 1.0 / (2.0 * np.pi * cutoff)
+    return 1.0 / (1.0 + tau / dt)
+
+
+class FilterBank:
+    """
+    Vectorized filter state for a whole skeleton.
+    
+    Holds the smoothing, confidence gate and foot lock state of every bone
+    in contiguous arrays (one row per bone slot), so a frame is filtered
+    with a handful of array operations instead of one MultiFilter call per
+    bone. Position and rotation smoothing keep separate state.
+    
+    Two smoothing modes are available:
+        EWMA: Fixed-alpha exponential moving average
+        ONE_EURO: Speed-adaptive low-pass (One Euro filter). The cutoff
+            rises with the filtered speed, so slow motion is smoothed
+            heavily while fast motion passes with little lag.
+    """
+    
+    def __init__(self, size: int, smoothing_alpha: float = 0.5,
+                 min_confidence: float = 0.5,
+                 foot_lock_threshold: float = 0.0,
+                 is_foot: Optional[np.ndarray] = None,
+                 mode: str = 'EWMA',
+                 min_cutoff=1.0, beta=0.0, d_cutoff: float = 1.0,
+                 frame_time: float = 1.0 / 30.0):
+        """
+        Initialize filter bank.
+        
+        Args:
+            size: Number of bone slots
+            smoothing_alpha: Smoothing factor (0=no smoothing, 1=max smoothing)
+            min_confidence: Minimum confidence threshold
+            foot_lock_threshold: Foot lock threshold (0=disabled)
+            is_foot: Optional (size,) bool mask of slots that use foot locking
+            mode: Smoothing mode ('EWMA' or 'ONE_EURO')
+            min_cutoff: One Euro minimum cutoff in Hz, scalar or (size,)
+            beta: One Euro speed coefficient, scalar or (size,)
+            d_cutoff: One Euro cutoff for the speed estimate in Hz
+            frame_time: Time step in seconds used when no timestamp is given
+        """
+        if mode not in FILTER_MODES:
+            raise ValueError(f"Unknown filter mode '{mode}'")
+        
+        self.size = size
+        self.alpha = 1.0 - smoothing_alpha  # Convert to lerp factor
+        self.min_confidence = min_confidence
+        self.foot_lock_threshold = foot_lock_threshold
+        self.is_foot = np.zeros(size, dtype=bool) if is_foot is None else np.asarray(is_foot, dtype=bool)
+        
+        # One Euro parameters
+        self.mode = mode
+        self.min_cutoff = np.broadcast_to(np.asarray(min_cutoff, dtype=np.float64), (size,)).copy()
+        self.beta = np.broadcast_to(np.asarray(beta, dtype=np.float64), (size,)).copy()
+        self.d_cutoff = d_cutoff
+        self.frame_time = frame_time
+        
+        # Confidence gate
+        self.last_valid_positions = np.zeros((size, 3))
+        self.has_valid_position = np.zeros(size, dtype=bool)
+        self.last_valid_rotations = np.zeros((size, 4))
+        self.has_valid_rotation = np.zeros(size, dtype=bool)
+        
+        # Smoothing
+        self.prev_positions = np.zeros((size, 3))
+        self.has_prev_position = np.zeros(size, dtype=bool)
+        self.prev_rotations = np.zeros((size, 4))
+        self.has_prev_rotation = np.zeros(size, dtype=bool)
+        
+        # One Euro speed estimates and sample times
+        self.position_speed = np.zeros((size, 3))
+        self.rotation_speed = np.zeros(size)
+        self.position_time = np.zeros(size)
+        self.rotation_time = np.zeros(size)
+        
+        # Foot lock
+        self.locked_heights = np.zeros(size)
+        self.is_locked = np.zeros(size, dtype=bool)
+    
+    @classmethod
+    def from_settings(cls, settings, plan) -> 'FilterBank':
+        """
+        Create a bank for a retarget plan from MOCAP_PG_Settings.
+        
+        Args:
+            settings: Add-on settings (filter and One Euro properties)
+            plan: RetargetPlan providing slot count, foot mask and bone groups
+        
+        Returns:
+            Configured FilterBank
+        """
+        bank = cls(
+            len(plan),
+            smoothing_alpha=settings.smoothing,
+            min_confidence=settings.min_confidence,
+            foot_lock_threshold=settings.foot_lock_threshold,
+            is_foot=plan.is_foot,
+            mode=settings.filter_mode,
+            d_cutoff=settings.one_euro_d_cutoff,
+            frame_time=1.0 / max(settings.target_fps, 1)
+        )
+        bank.set_group_parameters(plan.groups, settings.one_euro_min_cutoff, settings.one_euro_beta)
+        return bank
+    
+    def __len__(self) -> int:
+        return self.size
+    
+    def set_group_parameters(self, groups: List[str], min_cutoff: float, beta: float):
+        """
+        Set per-slot One Euro parameters from bone groups.
+        
+        Args:
+            groups: Bone group name per slot (see mapping.get_landmark_group)
+            min_cutoff: Base minimum cutoff in Hz
+            beta: Base speed coefficient
+        """
+        for slot, group in enumerate(groups):
+            cutoff_scale, beta_scale = ONE_EURO_GROUP_SCALES.get(group, (1.0, 1.0))
+            self.min_cutoff[slot] = min_cutoff * cutoff_scale
+            self.beta[slot] = beta * beta_scale
+    
+    def _elapsed(self, last_times: np.ndarray, timestamp: Optional[float]) -> np.ndarray:
+        """Time since each slot's previous sample (frame_time without timestamps)."""
+        if timestamp is None:
+            return np.full(self.size, self.frame_time)
+        return np.maximum(timestamp - last_times, 1e-4)
+    
+    def filter_positions(self, positions: np.ndarray, confidences: np.ndarray,
+                         velocities: Optional[np.ndarray] = None,
+                         mask: Optional[np.ndarray] = None,
+                         timestamp: Optional[float] = None) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Apply confidence gating, smoothing and foot locking to all slots.
+        
+        Args:
+            positions: (size, 3) positions
+            confidences: (size,) confidence levels
+            velocities: Optional (size,) velocities for foot locking
+            mask: Optional (size,) bool mask of slots to update
+            timestamp: Sample time in seconds (ONE_EURO mode; frame_time steps if None)
+        
+        Returns:
+            Tuple of ((size, 3) filtered positions, (size,) bool mask of
+            slots that produced a value)
+        """
+        positions = np.asarray(positions, dtype=np.float64)
+        active = np.ones(self.size, dtype=bool) if mask is None else np.asarray(mask, dtype=bool)
+        
+        # Confidence gating
+        accepted = active & (np.asarray(confidences) >= self.min_confidence)
+        self.last_valid_positions[accepted] = positions[accepted]
+        self.has_valid_position |= accepted
+        valid = active & self.has_valid_position
+        gated = np.where(accepted[:, np.newaxis], positions, self.last_valid_positions)
+        
+        # Smoothing (first value passes through)
+        first = valid & ~self.has_prev_position
+        delta = gated - self.prev_positions
+        if self.mode == 'ONE_EURO':
+            dt = self._elapsed(self.position_time, timestamp)
+            blend = valid & self.has_prev_position
+            
+            speed = delta / dt[:, np.newaxis]
+            speed_alpha = one_euro_alpha(dt, self.d_cutoff)[:, np.newaxis]
+            speed = self.position_speed + (speed - self.position_speed) * speed_alpha
+            self.position_speed[blend] = speed[blend]
+            self.position_speed[first] = 0.0
+            
+            cutoff = self.min_cutoff + self.beta * np.linalg.norm(self.position_speed, axis=1)
+            smoothed = self.prev_positions + delta * one_euro_alpha(dt, cutoff)[:, np.newaxis]
+            if timestamp is not None:
+                self.position_time[valid] = timestamp
+        else:
+            smoothed = self.prev_positions + delta * self.alpha
+        
+        smoothed[first] = gated[first]
+        self.prev_positions[valid] = smoothed[valid]
+        self.has_prev_position |= valid
+        
+        # Foot locking
+        if self.foot_lock_threshold > 0:
+            feet = valid & self.is_foot
+            heights = smoothed[:, 2]
+            slow = True if velocities is None else np.asarray(velocities) < 0.1
+            lock = feet & (heights < self.foot_lock_threshold) & slow
+            
+            newly_locked = lock & ~self.is_locked
+            self.locked_heights[newly_locked] = heights[newly_locked]
+            self.is_locked[feet] = lock[feet]
+            
+            smoothed[:, 2] = np.where(lock, self.locked_heights, heights)
+        
+        smoothed[~valid] = 0.0
+        return smoothed, valid
+    
+    def filter_rotations(self, rotations: np.ndarray, mask: Optional[np.ndarray] = None,
+                         confidences: Optional[np.ndarray] = None,
+                         timestamp: Optional[float] = None) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Apply optional confidence gating and slerp smoothing to all slots.
+        
+        Args:
+            rotations: (size, 4) quaternions (w, x, y, z)
+            mask: Optional (size,) bool mask of slots to update
+            confidences: Optional (size,) confidence levels (no gating if None)
+            timestamp: Sample time in seconds (ONE_EURO mode; frame_time steps if None)
+        
+        Returns:
+            Tuple of ((size, 4) filtered rotations, (size,) bool mask of
+            slots that produced a value)
+        """
+        rotations = np.asarray(rotations, dtype=np.float64)
+        active = np.ones(self.size, dtype=bool) if mask is None else np.asarray(mask, dtype=bool)
+        
+        # Confidence gating
+        if confidences is not None:
+            accepted = active & (np.asarray(confidences) >= self.min_confidence)
+            self.last_valid_rotations[accepted] = rotations[accepted]
+            self.has_valid_rotation |= accepted
+            rotations = np.where(accepted[:, np.newaxis], rotations, self.last_valid_rotations)
+            active = active & self.has_valid_rotation
+        
+        # Smoothing (first value passes through)
+        smoothed = rotations.copy()
+        blend = active & self.has_prev_rotation
+        if self.mode == 'ONE_EURO':
+            dt = self._elapsed(self.rotation_time, timestamp)
+            
+            # Angular speed between the previous output and the new sample
+            dot = np.abs(np.einsum('ij,ij->i', self.prev_rotations, rotations))
+            speed = 2.0 * np.arccos(np.clip(dot, 0.0, 1.0)) / dt
+            speed = self.rotation_speed + (speed - self.rotation_speed) * one_euro_alpha(dt, self.d_cutoff)
+            self.rotation_speed[blend] = speed[blend]
+            self.rotation_speed[active & ~self.has_prev_rotation] = 0.0
+            
+            factor = one_euro_alpha(dt, self.min_cutoff + self.beta * self.rotation_speed)
+            if timestamp is not None:
+                self.rotation_time[active] = timestamp
+        else:
+            factor = self.alpha
+        
+        if blend.any():
+            factor = np.broadcast_to(factor, (self.size,))[blend]
+            smoothed[blend] = slerp_batch(self.prev_rotations[blend], rotations[blend], factor)
+        self.prev_rotations[active] = smoothed[active]
+        self.has_prev_rotation |= active
+        
+        return smoothed, active
+    
+    def reset(self, slot: Optional[int] = None):
+        """
+        Reset filter state.
+        
+        Args:
+            slot: Bone slot to reset (None = all slots)
+        """
+        index = slice(None) if slot is None else slot
+        self.has_valid_position[index] = False
+        self.has_valid_rotation[index] = False
+        self.has_prev_position[index] = False
+        self.has_prev_rotation[index] = False
+        self.position_speed[index] = 0.0
+        self.rotation_speed[index] = 0.0
+        self.is_locked[index] = False
+        self.locked_heights[index] = 0.0
+    
+    def slot(self, index: int) -> 'FilterBankSlot':
+        """Get a MultiFilter-compatible view of one bone slot."""
+        return FilterBankSlot(self, index)
+
+
+class FilterBankSlot:
+    """Drop-in MultiFilter replacement backed by one FilterBank row."""
+    
+    def __init__(self, bank: FilterBank, index: int):
+        self.bank = bank
+        self.index = index
+    
+    def _single(self, values: np.ndarray, width: int) -> np.ndarray:
+        """Expand one value to a bank-sized array with only this slot set."""
+        full = np.zeros((self.bank.size, width))
+        full[self.index] = values
+        return full
+    
+    def _mask(self) -> np.ndarray:
+        mask = np.zeros(self.bank.size, dtype=bool)
+        mask[self.index] = True
+        return mask
+    
+    def filter_position(self, position: Vector, confidence: float = 1.0,
+                        is_foot: bool = False, velocity: float = 0.0) -> Optional[Vector]:
+        """Same contract as MultiFilter.filter_position."""
+        self.bank.is_foot[self.index] = is_foot
+        confidences = np.zeros(self.bank.size)
+        confidences[self.index] = confidence
+        velocities = np.zeros(self.bank.size)
+        velocities[self.index] = velocity
+        filtered, valid = self.bank.filter_positions(
+            self._single(tuple(position), 3), confidences, velocities, self._mask()
+        )
+        return Vector(filtered[self.index]) if valid[self.index] else None
+    
+    def filter_rotation(self, rotation: Quaternion, confidence: float = 1.0) -> Optional[Quaternion]:
+        """Same contract as MultiFilter.filter_rotation."""
+        confidences = np.zeros(self.bank.size)
+        confidences[self.index] = confidence
+        filtered, valid = self.bank.filter_rotations(
+            self._single(tuple(rotation), 4), self._mask(), confidences
+        )
+        return Quaternion(filtered[self.index]) if valid[self.index] else None
+    
+    def reset(self):
+        """Reset this slot."""
+        self.bank.reset(self.index)
@@ -0,0 +1,458 @@
+"""
+On-disk landmark streams: record raw tracker output and replay it.
+
+A stream is a directory with one .npy file per channel:
+    timestamps.npy  (N,) float64 seconds since the first frame
+    pose.npy        (N, 33, 4) float32 x, y, z, visibility
+    hands.npy       (N, 2, 21, 3) float32 x, y, z
+    face.npy        (N, 468, 3) float32 x, y, z
+    meta.json       resolution and tracker flags
+
+Missing detections are stored as NaN rows. Files are written incrementally
+behind a fixed-size .npy header, so they load with numpy.load(mmap_mode='r')
+for zero-copy random access. Every _FLUSH_ROWS frames the rows are flushed
+to disk and the header's frame count is updated, so a stream that is still
+recording, or was not closed cleanly, is readable up to the last flush.
+"""
+
+import json
+import os
+import struct
+import time
+from collections import namedtuple
+from typing import Optional, Tuple
+
+import numpy as np
+
+from .trackers import LandmarkResult
+from .capture import FrameSource
+from ..utils.logging_utils import get_logger
+
+
+POSE_SHAPE = (33, 4)
+HANDS_SHAPE = (2, 21, 3)
+FACE_SHAPE = (468, 3)
+
+CHANNELS = ('pose', 'hands', 'face')
+
+# Fixed .npy header size so the final frame count can be patched in place
+_HEADER_SIZE = 128
+_NPY_MAGIC = b'\x93NUMPY\x01\x00'
+
+# Rows between flushes (about one second of capture)
+_FLUSH_ROWS = 30
+
+# Lightweight stand-ins for MediaPipe landmark objects
+StreamLandmark = namedtuple('StreamLandmark', 'x y z visibility')
+StreamLandmarkList = namedtuple('StreamLandmarkList', 'landmark')
+
+
+def _npy_header(dtype: np.dtype, shape: Tuple[int, ...]) -> bytes:
+    """Build a version 1.0 .npy header padded to _HEADER_SIZE bytes."""
+    descr = np.lib.format.dtype_to_descr(dtype)
+    header = f"{{'descr': {descr!r}, 'fortran_order': False, 'shape': {shape!r}, }}"
+    padding = _HEADER_SIZE - len(_NPY_MAGIC) - 2 - len(header) - 1
+    if padding < 0:
+        raise ValueError(f"Shape {shape} does not fit in the stream header")
+    header = header + ' ' * padding + '\n'
+    return _NPY_MAGIC + struct.pack('<H', len(header)) + header.encode('latin1')
+
+
+class _NpyAppender:
+    """Appends fixed-shape rows to a .npy file, flushing every flush_rows rows."""
+    
+    def __init__(self, path: str, row_shape: Tuple[int, ...], dtype=np.float32,
+                 flush_rows: int = _FLUSH_ROWS):
+        self.path = path
+        self.row_shape = tuple(row_shape)
+        self.dtype = np.dtype(dtype)
+        self.flush_rows = max(1, flush_rows)
+        self.count = 0
+        self._file = open(path, 'wb')
+        self._file.write(_npy_header(self.dtype, (0,) + self.row_shape))
+        self._file.flush()
+    
+    def append(self, row: np.ndarray):
+        self._file.write(np.ascontiguousarray(row, dtype=self.dtype).tobytes())
+        self.count += 1
+        if self.count % self.flush_rows == 0:
+            self.flush()
+    
+    def flush(self):
+        """Write the buffered rows and the current frame count to disk."""
+        if self._file is None:
+            return
+        self._file.seek(0)
+        self._file.write(_npy_header(self.dtype, (self.count,) + self.row_shape))
+        self._file.seek(0, os.SEEK_END)
+        self._file.flush()
+    
+    def close(self):
+        if self._file is None:
+            return
+        self.flush()
+        self._file.close()
+        self._file = None
+
+
+def _open_channel(path: str) -> np.ndarray:
+    """
+    Memory-map a channel file, trusting the file size over the header.
+    
+    The header of a stream that is still recording (or was not closed)
+    lags behind the data, so the row count is derived from the data length
+    instead, ignoring a partially written last row.
+    """
+    with open(path, 'rb') as f:
+        version = np.lib.format.read_magic(f)
+        if version == (1, 0):
+            shape, fortran_order, dtype = np.lib.format.read_array_header_1_0(f)
+        else:
+            shape, fortran_order, dtype = np.lib.format.read_array_header_2_0(f)
+        offset = f.tell()
+    
+    row_shape = shape[1:]
+    row_bytes = dtype.itemsize * int(np.prod(row_shape, dtype=np.int64))
+    count = max(os.path.getsize(path) - offset, 0) // row_bytes if row_bytes else 0
+    if count == 0:
+        return np.zeros((0,) + row_shape, dtype=dtype)
+    return np.memmap(path, dtype=dtype, mode='r', offset=offset, shape=(count,) + row_shape)
+
+
+def result_to_arrays(result: LandmarkResult) -> dict:
+    """
+    Convert a LandmarkResult to fixed-shape float32 arrays (NaN = missing).
+    
+    Args:
+        result: Tracker output
+    
+    Returns:
+        Dict with 'pose', 'hands' and 'face' arrays
+    """
+    pose = np.full(POSE_SHAPE, np.nan, dtype=np.float32)
+    if result.pose_landmarks:
+        pose[:len(result.pose_landmarks)] = [
+            (lm.x, lm.y, lm.z, getattr(lm, 'visibility', 1.0))
+            for lm in result.pose_landmarks[:POSE_SHAPE[0]]
+        ]
+    
+    hands = np.full(HANDS_SHAPE, np.nan, dtype=np.float32)
+    for i, hand in enumerate((result.hand_landmarks or [])[:HANDS_SHAPE[0]]):
+        points = hand.landmark[:HANDS_SHAPE[1]]
+        hands[i, :len(points)] = [(lm.x, lm.y, lm.z) for lm in points]
+    
+    face = np.full(FACE_SHAPE, np.nan, dtype=np.float32)
+    if result.face_landmarks:
+        points = result.face_landmarks[0].landmark[:FACE_SHAPE[0]]
+        face[:len(points)] = [(lm.x, lm.y, lm.z) for lm in points]
+    
+    return {'pose': pose, 'hands': hands, 'face': face}
+
+
+def arrays_to_result(pose: Optional[np.ndarray], hands: Optional[np.ndarray],
+                     face: Optional[np.ndarray]) -> LandmarkResult:
+    """
+    Rebuild a LandmarkResult from one frame of stream arrays.
+    
+    Landmarks are StreamLandmark namedtuples, hands and face are wrapped in
+    StreamLandmarkList so `.landmark` works like on MediaPipe results.
+    """
+    result = LandmarkResult()
+    
+    if pose is not None and not np.isnan(pose[0, 0]):
+        result.pose_landmarks = [StreamLandmark(*row) for row in pose.tolist()]
+    
+    if hands is not None:
+        detected = [
+            StreamLandmarkList([StreamLandmark(x, y, z, 1.0) for x, y, z in hand.tolist()])
+            for hand in hands if not np.isnan(hand[0, 0])
+        ]
+        result.hand_landmarks = detected or None
+    
+    if face is not None and not np.isnan(face[0, 0]):
+        result.face_landmarks = [
+            StreamLandmarkList([StreamLandmark(x, y, z, 1.0) for x, y, z in face.tolist()])
+        ]
+    
+    return result
+
+
+class LandmarkStreamWriter:
+    """Writes tracker results to a landmark stream directory frame by frame."""
+    
+    def __init__(self, path: str, use_pose: bool = True, use_hands: bool = False,
+                 use_face: bool = False, resolution: Tuple[int, int] = (0, 0)):
+        """
+        Initialize writer.
+        
+        Args:
+            path: Stream directory (created if missing)
+            use_pose: Record the pose channel
+            use_hands: Record the hands channel
+            use_face: Record the face channel
+            resolution: Source frame size (width, height), stored as metadata
+        """
+        self.path = path
+        self.channels = {
+            'pose': use_pose,
+            'hands': use_hands,
+            'face': use_face,
+        }
+        self.resolution = resolution
+        self.logger = get_logger()
+        
+        self._timestamps = None
+        self._writers = {}
+        self._start_time = None
+    
+    @property
+    def frame_count(self) -> int:
+        return self._timestamps.count if self._timestamps is not None else 0
+    
+    def open(self) -> bool:
+        """
+        Create the stream files.
+        
+        Returns:
+            True if the stream is ready for writing
+        """
+        try:
+            os.makedirs(self.path, exist_ok=True)
+            self._timestamps = _NpyAppender(os.path.join(self.path, 'timestamps.npy'), (), np.float64)
+            shapes = {'pose': POSE_SHAPE, 'hands': HANDS_SHAPE, 'face': FACE_SHAPE}
+            for name, enabled in self.channels.items():
+                if enabled:
+                    self._writers[name] = _NpyAppender(os.path.join(self.path, f'{name}.npy'), shapes[name])
+            
+            with open(os.path.join(self.path, 'meta.json'), 'w') as f:
+                json.dump({
+                    'version': 1,
+                    'resolution': list(self.resolution),
+                    'channels': [name for name, enabled in self.channels.items() if enabled],
+                }, f)
+            
+            self._start_time = None
+            self.logger.info(f"Recording landmark stream to {self.path}")
+            return True
+        
+        except OSError as e:
+            self.logger.error(f"Failed to create landmark stream: {str(e)}")
+            self.close()
+            return False
+    
+    def write(self, timestamp: float, result: LandmarkResult):
+        """
+        Append one frame.
+        
+        Args:
+            timestamp: Capture time in seconds (any monotonic clock)
+            result: Tracker output for the frame
+        """
+        if self._timestamps is None:
+            return
+        
+        if self._start_time is None:
+            self._start_time = timestamp
+        
+        arrays = result_to_arrays(result)
+        self._timestamps.append(np.float64(timestamp - self._start_time))
+        for name, writer in self._writers.items():
+            writer.append(arrays[name])
+    
+    def close(self):
+        """Finalize headers and close all files."""
+        if self._timestamps is not None:
+            self._timestamps.close()
+            self.logger.info(f"Landmark stream closed: {self._timestamps.count} frames")
+        for writer in self._writers.values():
+            writer.close()
+        self._timestamps = None
+        self._writers = {}
+
+
+class LandmarkStream:
+    """Read-only, memory-mapped view of a recorded landmark stream."""
+    
+    def __init__(self, path: str):
+        """
+        Open a stream directory or an exported .npz file.
+        
+        Args:
+            path: Stream directory or .npz path
+        """
+        self.path = path
+        self.resolution = (0, 0)
+        self.channels = {}
+        
+        if path.endswith('.npz'):
+            data = np.load(path)
+            self.timestamps = data['timestamps']
+            for name in CHANNELS:
+                if name in data:
+                    self.channels[name] = data[name]
+            if 'resolution' in data:
+                self.resolution = tuple(int(v) for v in data['resolution'])
+        else:
+            self.timestamps = _open_channel(os.path.join(path, 'timestamps.npy'))
+            for name in CHANNELS:
+                channel_path = os.path.join(path, f'{name}.npy')
+                if os.path.exists(channel_path):
+                    self.channels[name] = _open_channel(channel_path)
+            
+            meta_path = os.path.join(path, 'meta.json')
+            if os.path.exists(meta_path):
+                with open(meta_path) as f:
+                    self.resolution = tuple(json.load(f).get('resolution', (0, 0)))
+        
+        # Channels can be one row ahead of the timestamps after a crash
+        self.frame_count = min([len(self.timestamps)] + [len(a) for a in self.channels.values()])
+    
+    def __len__(self) -> int:
+        return self.frame_count
+    
+    @property
+    def pose(self) -> Optional[np.ndarray]:
+        return self.channels.get('pose')
+    
+    @property
+    def hands(self) -> Optional[np.ndarray]:
+        return self.channels.get('hands')
+    
+    @property
+    def face(self) -> Optional[np.ndarray]:
+        return self.channels.get('face')
+    
+    def get_result(self, index: int) -> LandmarkResult:
+        """Rebuild the LandmarkResult of one frame."""
+        return arrays_to_result(
+            self.pose[index] if self.pose is not None else None,
+            self.hands[index] if self.hands is not None else None,
+            self.face[index] if self.face is not None else None
+        )
+    
+    def export_npz(self, npz_path: str, compressed: bool = True):
+        """
+        Export the stream to a single .npz file.
+        
+        Args:
+            npz_path: Output file path
+            compressed: Use zip compression
+        """
+        count = self.frame_count
+        arrays = {name: np.asarray(data[:count]) for name, data in self.channels.items()}
+        arrays['timestamps'] = np.asarray(self.timestamps[:count])
+        arrays['resolution'] = np.array(self.resolution, dtype=np.int32)
+        save = np.savez_compressed if compressed else np.savez
+        save(npz_path, **arrays)
+
+
+class ReplaySource(FrameSource):
+    """
+    Replays a landmark stream in place of a frame source + MediaPipeTrackers.
+    
+    Implements the FrameSource interface (open/read_frame/release) and the
+    tracker interface (initialize/process_frame/cleanup) so it can be
+    passed as both to CaptureWorker. read_frame yields the frame index
+    instead of an image, and process_frame looks the landmarks up.
+    """
+    
+    def __init__(self, path: str, realtime: bool = True, loop: bool = False,
+                 speed: float = 1.0):
+        """
+        Initialize replay.
+        
+        Args:
+            path: Stream directory or .npz file
+            realtime: Pace frames by their recorded timestamps (False = as fast as possible)
+            loop: Restart at the end of the stream
+            speed: Playback speed multiplier in realtime mode
+        """
+        super().__init__()
+        self.path = path
+        self.realtime = realtime
+        self.loop = loop
+        self.speed = max(speed, 1e-3)
+        self.stream = None
+        
+        self._index = 0
+        self._clock_start = 0.0
+        self._time_offset = 0.0
+    
+    # ----- FrameSource interface -----
+    
+    def open(self) -> bool:
+        """Open the stream."""
+        try:
+            self.stream = LandmarkStream(self.path)
+        except (OSError, ValueError, KeyError) as e:
+            self.logger.error(f"Failed to open landmark stream: {str(e)}")
+            return False
+        
+        if not len(self.stream):
+            self.logger.error(f"Landmark stream is empty: {self.path}")
+            return False
+        
+        self._index = 0
+        self._time_offset = 0.0
+        self._clock_start = time.perf_counter()
+        self._reset_timing()
+        self.logger.info(f"Replaying {len(self.stream)} frames from {self.path}")
+        return True
+    
+    def read_frame(self) -> Optional[Tuple]:
+        """
+        Advance to the next frame, waiting for its timestamp in realtime mode.
+        
+        Returns:
+            Tuple of (True, None, frame_index), or None at the end of the stream
+        """
+        if self.stream is None:
+            return None
+        
+        if self._index >= len(self.stream):
+            if not self.loop:
+                return None
+            # Continue the timeline after the last frame
+            self._time_offset += float(self.stream.timestamps[len(self.stream) - 1]) + 1.0 / 30.0
+            self._index = 0
+        
+        index = self._index
+        self._index += 1
+        self.frame_timestamp = self._time_offset + float(self.stream.timestamps[index])
+        
+        if self.realtime:
+            delay = self._clock_start + self.frame_timestamp / self.speed - time.perf_counter()
+            if delay > 0:
+                time.sleep(delay)
+        
+        self._record_frame_time()
+        return (True, None, index)
+    
+    def release(self):
+        """Close the stream."""
+        self.stream = None
+    
+    def is_opened(self) -> bool:
+        return self.stream is not None
+    
+    def is_finished(self) -> bool:
+        """Check if a non-looping replay reached the end."""
+        return self.stream is not None and not self.loop and self._index >= len(self.stream)
+    
+    def get_total_frames(self) -> int:
+        return len(self.stream) if self.stream is not None else 0
+    
+    def get_resolution(self) -> Tuple[int, int]:
+        return self.stream.resolution if self.stream is not None else (0, 0)
+    
+    # ----- Tracker interface -----
+    
+    def initialize(self) -> bool:
+        return self.stream is not None
+    
+    def process_frame(self, frame_index: int) -> LandmarkResult:
+        """Look up the recorded landmarks of a frame."""
+        return self.stream.get_result(frame_index)
+    
+    def cleanup(self):
+        pass
@@ -141,6 +141,32 @@ LANDMARK_CHAINS = {
 }
 
 
+# Landmark groups used for per-group filter parameters
+BONE_GROUPS = {
+    "HEAD": [
+        "NOSE", "LEFT_EYE_INNER", "LEFT_EYE", "LEFT_EYE_OUTER",
+        "RIGHT_EYE_INNER", "RIGHT_EYE", "RIGHT_EYE_OUTER",
+        "LEFT_EAR", "RIGHT_EAR", "MOUTH_LEFT", "MOUTH_RIGHT",
+    ],
+    "TORSO": ["LEFT_SHOULDER", "RIGHT_SHOULDER", "LEFT_HIP", "RIGHT_HIP", "SPINE_PROXY"],
+    "ARMS": ["LEFT_ELBOW", "RIGHT_ELBOW", "LEFT_WRIST", "RIGHT_WRIST"],
+    "HANDS": [
+        "LEFT_PINKY", "RIGHT_PINKY", "LEFT_INDEX", "RIGHT_INDEX",
+        "LEFT_THUMB", "RIGHT_THUMB",
+    ],
+    "LEGS": [
+        "LEFT_KNEE", "RIGHT_KNEE", "LEFT_ANKLE", "RIGHT_ANKLE",
+        "LEFT_HEEL", "RIGHT_HEEL", "LEFT_FOOT_INDEX", "RIGHT_FOOT_INDEX",
+    ],
+}
+
+_LANDMARK_GROUPS = {
+    landmark: group
+    for group, landmarks in BONE_GROUPS.items()
+    for landmark in landmarks
+}
+
+
 def auto_map_bones(armature_bones: List[str]) -> Dict[str, Dict[str, str]]:
     """
     Automatically map MediaPipe landmarks to armature bones.
@@ -189,3 +215,8 @@ def auto_map_bones(armature_bones: List[str]) -> Dict[str, Dict[str, str]]:
 def get_next_landmark_in_chain(landmark_name: str) -> Optional[str]:
     """Get the next landmark in a bone chain."""
     return LANDMARK_CHAINS.get(landmark_name)
+
+
+def get_landmark_group(landmark_name: str) -> str:
+    """Get the bone group of a landmark (TORSO if unknown)."""
+    return _LANDMARK_GROUPS.get(landmark_name, "TORSO")
@@ -0,0 +1,464 @@
+"""
+Multi-camera capture: one capture worker per camera, timestamp alignment
+across cameras and fusion of their pose landmarks into one skeleton.
+
+Without a calibration the cameras' landmarks are averaged per landmark,
+weighted by visibility, which suits cameras with similar viewpoints (e.g.
+a second camera covering occlusions). With a calibration the landmarks
+are triangulated; the fused skeleton is then expressed in the first
+camera's frame (x right, y down, z forward), which matches the axes of
+MediaPipe's normalized landmarks.
+
+Calibration file (JSON), one entry per camera in camera list order:
+    {"cameras": [
+        {"K": [[fx, 0, cx], [0, fy, cy], [0, 0, 1]],
+         "R": [[...], [...], [...]], "t": [tx, ty, tz],
+         "resolution": [width, height]},
+        ...
+    ]}
+"R" and "t" map world to camera coordinates. A 3x4 "P" may be given
+instead of "K", "R" and "t".
+"""
+
+import json
+import threading
+import time
+from collections import deque
+from dataclasses import dataclass
+from typing import List, Optional, Sequence
+
+import numpy as np
+
+from .pipeline import FramePacket, LatestResultMailbox
+from .trackers import LandmarkResult
+from .landmark_stream import StreamLandmark, POSE_SHAPE
+from .retarget import landmarks_to_array
+from ..utils.logging_utils import get_logger
+
+
+@dataclass
+class CameraCalibration:
+    """Projection matrices of calibrated cameras, relative to the first camera."""
+    projections: np.ndarray  # (C, 3, 4) pixel projection matrices
+    resolutions: np.ndarray  # (C, 2) width, height the intrinsics refer to
+    
+    def __len__(self) -> int:
+        return len(self.projections)
+
+
+def load_calibration(path: str) -> CameraCalibration:
+    """
+    Load a multi-camera calibration file.
+    
+    Args:
+        path: JSON calibration file (see module docstring)
+    
+    Returns:
+        CameraCalibration with world coordinates moved to the first camera
+    
+    Raises:
+        OSError: If the file can't be read
+        ValueError: If the file is malformed
+    """
+    with open(path) as f:
+        data = json.load(f)
+    
+    cameras = data.get('cameras') if isinstance(data, dict) else None
+    if not cameras:
+        raise ValueError("Calibration has no cameras")
+    
+    projections = []
+    resolutions = []
+    for i, camera in enumerate(cameras):
+        try:
+            if 'P' in camera:
+                projection = np.asarray(camera['P'], dtype=np.float64).reshape(3, 4)
+            else:
+                intrinsics = np.asarray(camera['K'], dtype=np.float64).reshape(3, 3)
+                rotation = np.asarray(camera['R'], dtype=np.float64).reshape(3, 3)
+                translation = np.asarray(camera['t'], dtype=np.float64).reshape(3, 1)
+                projection = intrinsics @ np.hstack([rotation, translation])
+            resolution = np.asarray(camera['resolution'], dtype=np.float64).reshape(2)
+        except (KeyError, TypeError, ValueError) as e:
+            raise ValueError(f"Invalid calibration for camera {i + 1}: {str(e)}")
+        projections.append(projection)
+        resolutions.append(resolution)
+    
+    projections = np.stack(projections)
+    
+    # Express the world in the first camera's frame, so triangulated points
+    # come out with the same axes as its normalized landmarks
+    if all('R' in camera and 't' in camera for camera in cameras[:1]):
+        world_to_first = np.eye(4)
+        world_to_first[:3, :3] = np.asarray(cameras[0]['R'], dtype=np.float64).reshape(3, 3)
+        world_to_first[:3, 3] = np.asarray(cameras[0]['t'], dtype=np.float64).reshape(3)
+        projections = projections @ np.linalg.inv(world_to_first)
+    
+    return CameraCalibration(projections=projections, resolutions=np.stack(resolutions))
+
+
+def packets_to_pose_arrays(packets: Sequence[Optional[FramePacket]]) -> np.ndarray:
+    """
+    Stack the pose landmarks of one packet per camera.
+    
+    Args:
+        packets: Aligned packets, None for cameras without a frame
+    
+    Returns:
+        (C, 33, 4) float32 array of (x, y, z, visibility), NaN where a
+        camera detected no pose
+    """
+    arrays = np.full((len(packets),) + POSE_SHAPE, np.nan, dtype=np.float32)
+    for i, packet in enumerate(packets):
+        landmarks = packet.landmarks.pose_landmarks if packet is not None else None
+        if landmarks:
+            rows = landmarks_to_array(landmarks)[:POSE_SHAPE[0]]
+            arrays[i, :len(rows)] = rows
+    return arrays
+
+
+def _landmark_weights(arrays: np.ndarray, min_visibility: float) -> np.ndarray:
+    """Per camera and landmark weight: visibility, 0 below the threshold or if missing."""
+    visibility = np.nan_to_num(arrays[..., 3], nan=0.0)
+    return np.where(visibility >= min_visibility, visibility, 0.0)
+
+
+def fuse_weighted(arrays: np.ndarray, min_visibility: float = 0.3) -> np.ndarray:
+    """
+    Average the landmarks of several cameras, weighted by visibility.
+    
+    Args:
+        arrays: (C, N, 4) landmarks per camera (NaN = missing)
+        min_visibility: Landmarks below this visibility are ignored
+    
+    Returns:
+        (N, 4) fused landmarks; visibility is the best camera's, 0 where no
+        camera saw the landmark
+    """
+    weights = _landmark_weights(arrays, min_visibility)
+    total = weights.sum(axis=0)
+    
+    positions = np.nan_to_num(arrays[..., :3], nan=0.0)
+    fused = np.zeros(arrays.shape[1:], dtype=np.float32)
+    fused[:, :3] = (weights[..., np.newaxis] * positions).sum(axis=0) / np.maximum(total, 1e-6)[:, np.newaxis]
+    fused[:, 3] = np.where(total > 0, weights.max(axis=0), 0.0)
+    return fused
+
+
+def triangulate(arrays: np.ndarray, calibration: CameraCalibration,
+                min_visibility: float = 0.3) -> np.ndarray:
+    """
+    Triangulate landmarks seen by several calibrated cameras.
+    
+    Solves the visibility-weighted linear (DLT) system of every landmark
+    with one batched SVD.
+    
+    Args:
+        arrays: (C, N, 4) normalized landmarks per camera (NaN = missing)
+        calibration: Calibration of the same C cameras
+        min_visibility: Views below this visibility are ignored
+    
+    Returns:
+        (N, 4) landmarks in the first camera's frame; visibility is the
+        weighted mean of the views used, 0 where fewer than two cameras saw
+        the landmark
+    """
+    weights = _landmark_weights(arrays, min_visibility)
+    
+    # Normalized image coordinates to the pixels of the calibration
+    resolutions = calibration.resolutions[:, np.newaxis, :]
+    pixels = np.nan_to_num(arrays[..., :2].astype(np.float64), nan=0.0) * resolutions
+    
+    # Two rows per view: x * P3 - P1 and y * P3 - P2, shape (N, 2C, 4)
+    projections = calibration.projections[:, np.newaxis, :, :]
+    rows_x = pixels[..., 0, np.newaxis] * projections[..., 2, :] - projections[..., 0, :]
+    rows_y = pixels[..., 1, np.newaxis] * projections[..., 2, :] - projections[..., 1, :]
+    system = np.concatenate([rows_x, rows_y], axis=0) * np.concatenate([weights, weights], axis=0)[..., np.newaxis]
+    system = system.transpose(1, 0, 2)
+    
+    # Solution: right singular vector of the smallest singular value
+    _, _, vh = np.linalg.svd(system)
+    homogeneous = vh[:, -1, :]
+    scale = homogeneous[:, 3]
+    
+    views = np.count_nonzero(weights, axis=0)
+    valid = (views >= 2) & (np.abs(scale) > 1e-9)
+    
+    fused = np.zeros(arrays.shape[1:], dtype=np.float32)
+    fused[valid, :3] = homogeneous[valid, :3] / scale[valid, np.newaxis]
+    total = weights.sum(axis=0)
+    fused[:, 3] = np.where(valid, (weights ** 2).sum(axis=0) / np.maximum(total, 1e-6), 0.0)
+    return fused
+
+
+class TimestampAligner:
+    """
+    Matches packets of several cameras by source timestamp.
+    
+    Source times are moved to a shared clock first: webcams stamp frames
+    with perf_counter, video files with their media time, so each camera's
+    offset to the capture clock is taken from its first packet.
+    
+    Keeps a short history per camera. A fused frame is formed at the time
+    of the newest packet of the camera that is furthest behind; each
+    camera contributes its packet closest to that time if it is within
+    max_skew, so a dropped or late camera frame doesn't stall the others.
+    A camera whose newest packet is more than stall_timeout behind the
+    newest of any camera (unplugged, frozen) is not waited for until it
+    delivers again.
+    """
+    
+    def __init__(self, count: int, max_skew: float = 0.02, history: int = 8,
+                 stall_timeout: float = 0.25):
+        """
+        Initialize aligner.
+        
+        Args:
+            count: Number of cameras
+            max_skew: Largest time difference (seconds) between fused packets
+            history: Packets kept per camera
+            stall_timeout: Seconds a camera may fall behind before it is fused without
+        """
+        self.max_skew = max_skew
+        self.stall_timeout = stall_timeout
+        self.histories = [deque(maxlen=history) for _ in range(count)]
+        self.offsets = [None] * count
+        self.latest = [None] * count
+        self.first_time = None
+        self.last_time = None
+    
+    def push(self, camera: int, packet: FramePacket):
+        """Add a packet of a camera (packets of one camera arrive in time order)."""
+        if self.offsets[camera] is None:
+            self.offsets[camera] = packet.timestamp - packet.source_time
+        shared_time = packet.source_time + self.offsets[camera]
+        
+        self.histories[camera].append((shared_time, packet))
+        self.latest[camera] = shared_time
+        if self.first_time is None:
+            self.first_time = shared_time
+    
+    def is_stalled(self, camera: int) -> bool:
+        """Check if a camera fell more than stall_timeout behind the newest packet of any camera."""
+        if self.first_time is None:
+            return False
+        newest = max(time for time in self.latest if time is not None)
+        latest = self.latest[camera] if self.latest[camera] is not None else self.first_time
+        return newest - latest > self.stall_timeout
+    
+    def pop_aligned(self, active: Sequence[bool]) -> Optional[List[Optional[FramePacket]]]:
+        """
+        Take the next aligned set of packets.
+        
+        Args:
+            active: Per camera, whether it may still deliver packets; a
+                    stopped or stalled camera doesn't hold the others back
+        
+        Returns:
+            One packet or None per camera, or None if no new set is ready
+        """
+        waiting = [
+            history for i, (history, is_active) in enumerate(zip(self.histories, active))
+            if (history or is_active) and not self.is_stalled(i)
+        ]
+        if not waiting or not all(waiting):
+            return None
+        
+        reference = min(history[-1][0] for history in waiting)
+        if self.last_time is not None and reference <= self.last_time:
+            return None
+        
+        aligned = []
+        for history in self.histories:
+            best = min(history, key=lambda entry: abs(entry[0] - reference), default=None)
+            aligned.append(best[1] if best is not None and abs(best[0] - reference) <= self.max_skew else None)
+            
+            # Packets up to the reference time can't be matched anymore
+            while history and history[0][0] <= reference:
+                history.popleft()
+        
+        self.last_time = reference
+        return aligned
+
+
+class MultiCameraWorker:
+    """
+    Runs one CaptureWorker per camera and publishes fused packets.
+    
+    Every camera captures and infers on its own worker thread. MediaPipe
+    and OpenCV release the GIL while they work, so inference of the
+    cameras runs in parallel. A fusion thread aligns the results by
+    timestamp, fuses them and publishes one FramePacket per aligned set,
+    so it is a drop-in replacement for a single CaptureWorker.
+    """
+    
+    def __init__(self, workers: List, calibration: Optional[CameraCalibration] = None,
+                 max_skew: float = 0.02, min_visibility: float = 0.3,
+                 stream_writer=None, lossless: bool = False):
+        """
+        Initialize the multi-camera worker.
+        
+        Args:
+            workers: One unstarted CaptureWorker per camera
+            calibration: Calibration of the cameras in the same order (None = weighted average)
+            max_skew: Largest time difference (seconds) between fused frames
+            min_visibility: Landmarks below this visibility are not fused
+            stream_writer: Optional LandmarkStreamWriter receiving every fused result
+            lossless: Wait for each fused packet to be taken before fusing the next
+        """
+        if calibration is not None and len(calibration) != len(workers):
+            raise ValueError(f"Calibration has {len(calibration)} cameras, capture has {len(workers)}")
+        
+        self.workers = workers
+        self.calibration = calibration
+        self.min_visibility = min_visibility
+        self.stream_writer = stream_writer
+        self.lossless = lossless
+        self.mailbox = LatestResultMailbox()
+        self.aligner = TimestampAligner(len(workers), max_skew)
+        self.logger = get_logger()
+        
+        self.error_message = ""
+        self.resolution = (0, 0)
+        self.fusion_time = 0.0
+        
+        self._thread = None
+        self._stop_event = threading.Event()
+    
+    @property
+    def camera(self):
+        """Primary camera (the first one), used for the viewport feed and FPS."""
+        return self.workers[0].camera
+    
+    def start(self, timeout: float = 30.0) -> bool:
+        """
+        Start all camera workers and the fusion thread.
+        
+        Args:
+            timeout: Seconds to wait for each camera to start
+        
+        Returns:
+            True if every camera started
+        """
+        if self._thread is not None:
+            return True
+        
+        self.mailbox.reset()
+        self.aligner = TimestampAligner(len(self.workers), self.aligner.max_skew,
+                                        stall_timeout=self.aligner.stall_timeout)
+        self.error_message = ""
+        
+        for i, worker in enumerate(self.workers):
+            if not worker.start(timeout):
+                self.error_message = f"Camera {i + 1}: {worker.error_message or 'failed to start'}"
+                self.stop()
+                return False
+        
+        self.resolution = self.workers[0].resolution
+        if self.stream_writer is not None:
+            self.stream_writer.resolution = self.resolution
+            if not self.stream_writer.open():
+                self.logger.warning("Landmark stream disabled")
+                self.stream_writer = None
+        
+        self._stop_event.clear()
+        self._thread = threading.Thread(target=self._run, name="MocapMultiCamera", daemon=True)
+        self._thread.start()
+        self.logger.info(f"Multi-camera capture started with {len(self.workers)} cameras "
+                         f"({'triangulated' if self.calibration is not None else 'weighted'})")
+        return True
+    
+    def stop(self, timeout: float = 2.0):
+        """Stop the fusion thread and all camera workers."""
+        self._stop_event.set()
+        if self._thread is not None:
+            self._thread.join(timeout)
+            self._thread = None
+        for worker in self.workers:
+            worker.stop(timeout)
+        if self.stream_writer is not None:
+            self.stream_writer.close()
+    
+    def is_running(self) -> bool:
+        """Check if the fusion thread is alive."""
+        return self._thread is not None and self._thread.is_alive()
+    
+    def get_dropped_frames(self) -> int:
+        """Get dropped camera frames plus fused results overwritten before use."""
+        return sum(worker.get_dropped_frames() for worker in self.workers) + self.mailbox.overwritten
+    
+    def fuse(self, packets: List[Optional[FramePacket]]) -> FramePacket:
+        """
+        Fuse one aligned set of packets.
+        
+        Args:
+            packets: One packet or None per camera, at least one packet
+        
+        Returns:
+            FramePacket with the fused pose; the frame, hands, face and the
+            landmarks drawn over the feed come from the primary camera if it
+            has a packet in the set, otherwise from the first camera that does
+        """
+        start = time.perf_counter()
+        arrays = packets_to_pose_arrays(packets)
+        if self.calibration is not None:
+            fused = triangulate(arrays, self.calibration, self.min_visibility)
+        else:
+            fused = fuse_weighted(arrays, self.min_visibility)
+        
+        present = [packet for packet in packets if packet is not None]
+        primary = present[0]
+        landmarks = LandmarkResult(
+            pose_landmarks=[StreamLandmark(*row) for row in fused.tolist()] if fused[:, 3].any() else None,
+            hand_landmarks=primary.landmarks.hand_landmarks,
+            face_landmarks=primary.landmarks.face_landmarks
+        )
+        self.fusion_time = time.perf_counter() - start
+        
+        return FramePacket(
+            frame=primary.frame,
+            landmarks=landmarks,
+            timestamp=min(packet.timestamp for packet in present),
+            inference_time=max(packet.inference_time for packet in present),
+            source_time=self.aligner.last_time,
+            display_landmarks=primary.landmarks
+        )
+    
+    def _run(self):
+        """Thread body: collect camera results, align, fuse and publish."""
+        try:
+            while not self._stop_event.is_set():
+                received = False
+                for i, worker in enumerate(self.workers):
+                    packet = worker.mailbox.take()
+                    if packet is not None:
+                        self.aligner.push(i, packet)
+                        received = True
+                
+                active = [worker.is_running() for worker in self.workers]
+                packets = self.aligner.pop_aligned(active)
+                if packets is None:
+                    if not any(active) and not received:
+                        self.error_message = next(
+                            (worker.error_message for worker in self.workers if worker.error_message),
+                            "Capture stopped"
+                        )
+                        break
+                    time.sleep(0.001)
+                    continue
+                
+                if not any(packet is not None for packet in packets):
+                    continue
+                
+                fused = self.fuse(packets)
+                if self.stream_writer is not None:
+                    self.stream_writer.write(fused.source_time, fused.landmarks)
+                self.mailbox.publish(fused)
+                
+                if self.lossless:
+                    while self.mailbox.is_pending() and not self._stop_event.is_set():
+                        time.sleep(0.001)
+        
+        except Exception as e:
+            self.error_message = f"Multi-camera fusion error: {str(e)}"
+            self.logger.error(self.error_message)
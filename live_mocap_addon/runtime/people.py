@@ -0,0 +1,155 @@
+"""
+Multi-person tracking: stable IDs for the poses of several people.
+
+MediaPipe returns the people of a frame in no particular order. The
+PersonTracker associates every detection with the person it was in the
+previous frames by comparing skeletons, so each person keeps the same ID
+(and therefore drives the same armature) for as long as they stay in view.
+"""
+
+from typing import List, Tuple
+
+import numpy as np
+
+
+# Landmarks compared when associating skeletons: nose, shoulders, elbows, hips, knees
+ASSOCIATION_LANDMARKS = np.array([0, 11, 12, 13, 14, 23, 24, 25, 26], dtype=np.intp)
+
+
+def skeleton_boxes(people: np.ndarray, min_visibility: float = 0.5) -> np.ndarray:
+    """
+    Bounding boxes of the visible landmarks of several skeletons.
+    
+    Args:
+        people: (P, 33, 4) normalized landmarks
+        min_visibility: Landmarks below this visibility are ignored
+    
+    Returns:
+        (P, 4) boxes as (min x, min y, max x, max y); all landmarks are used
+        for a skeleton without visible ones
+    """
+    visible = people[..., 3] >= min_visibility
+    visible[~visible.any(axis=1)] = True
+    xy = people[..., :2]
+    low = np.where(visible[..., np.newaxis], xy, np.inf).min(axis=1)
+    high = np.where(visible[..., np.newaxis], xy, -np.inf).max(axis=1)
+    return np.concatenate([low, high], axis=1)
+
+
+def association_costs(tracks: np.ndarray, detections: np.ndarray,
+                      min_visibility: float = 0.5) -> np.ndarray:
+    """
+    Skeleton distance between every track and every detection.
+    
+    The distance is the mean image distance of the association landmarks
+    visible in both skeletons, relative to the diagonal of the track's
+    bounding box, so it doesn't depend on how large the person appears.
+    
+    Args:
+        tracks: (T, 33, 4) last landmarks of each track
+        detections: (D, 33, 4) landmarks of the current frame
+        min_visibility: Landmarks below this visibility are ignored
+    
+    Returns:
+        (T, D) costs, inf where the skeletons share no visible landmark
+    """
+    track_points = tracks[:, ASSOCIATION_LANDMARKS]
+    detection_points = detections[:, ASSOCIATION_LANDMARKS]
+    
+    shared = ((track_points[:, np.newaxis, :, 3] >= min_visibility) &
+              (detection_points[np.newaxis, :, :, 3] >= min_visibility))
+    distances = np.linalg.norm(
+        track_points[:, np.newaxis, :, :2] - detection_points[np.newaxis, :, :, :2], axis=-1
+    )
+    count = shared.sum(axis=-1)
+    mean = np.where(shared, distances, 0.0).sum(axis=-1) / np.maximum(count, 1)
+    
+    boxes = skeleton_boxes(tracks, min_visibility)
+    scale = np.maximum(np.linalg.norm(boxes[:, 2:] - boxes[:, :2], axis=1), 1e-3)
+    return np.where(count > 0, mean / scale[:, np.newaxis], np.inf)
+
+
+class PersonTracker:
+    """
+    Assigns stable IDs to the people detected in consecutive frames.
+    
+    IDs are slots in range(max_people): a new person takes the lowest free
+    slot and keeps it until they have been missing for max_missed frames,
+    so slot i can be bound to the i-th armature directly. Detections are
+    matched to tracks greedily by skeleton distance, which is optimal
+    enough for the handful of people MediaPipe tracks.
+    """
+    
+    def __init__(self, max_people: int, max_distance: float = 0.5,
+                 max_missed: int = 15, min_visibility: float = 0.5):
+        """
+        Initialize tracker.
+        
+        Args:
+            max_people: Number of track slots
+            max_distance: Largest association cost (relative to the person's size)
+            max_missed: Frames a person may be missing before their slot is freed
+            min_visibility: Landmarks below this visibility are not compared
+        """
+        self.max_people = max_people
+        self.max_distance = max_distance
+        self.max_missed = max_missed
+        self.min_visibility = min_visibility
+        
+        self.landmarks = np.zeros((max_people, 33, 4), dtype=np.float32)
+        self.active = np.zeros(max_people, dtype=bool)
+        self.missed = np.zeros(max_people, dtype=np.intp)
+    
+    def reset(self):
+        """Forget all tracks."""
+        self.active[:] = False
+        self.missed[:] = 0
+    
+    def update(self, people: np.ndarray) -> Tuple[List[int], List[int]]:
+        """
+        Associate the detections of a frame with tracks.
+        
+        Args:
+            people: (D, 33, 4) normalized landmarks of the detected people
+        
+        Returns:
+            Tuple of (track ID per detection, -1 if no slot was free; IDs
+            that started a new track this frame)
+        """
+        ids = [-1] * len(people)
+        new_ids = []
+        
+        tracks = np.flatnonzero(self.active)
+        if len(tracks) and len(people):
+            costs = association_costs(self.landmarks[tracks], people, self.min_visibility)
+            
+            # Greedy matching, cheapest pairs first
+            used = set()
+            for flat in np.argsort(costs, axis=None):
+                t, d = np.unravel_index(flat, costs.shape)
+                if costs[t, d] > self.max_distance:
+                    break
+                if t in used or ids[d] >= 0:
+                    continue
+                ids[d] = int(tracks[t])
+                used.add(t)
+        
+        matched = np.zeros(self.max_people, dtype=bool)
+        for d, track_id in enumerate(ids):
+            if track_id < 0:
+                free = np.flatnonzero(~self.active)
+                if not len(free):
+                    continue
+                track_id = int(free[0])
+                ids[d] = track_id
+                self.active[track_id] = True
+                new_ids.append(track_id)
+            matched[track_id] = True
+            self.landmarks[track_id] = people[d]
+        
+        # Free the slots of people missing for too long
+        self.missed[matched] = 0
+        self.missed[self.active & ~matched] += 1
+        self.active &= self.missed <= self.max_missed
+        
+        return ids, new_ids
@@ -0,0 +1,263 @@
+"""
+Background capture/inference pipeline feeding the modal operator.
+"""
+
+import threading
+import time
+from dataclasses import dataclass
+from typing import Any, Optional
+
+from .trackers import LandmarkResult
+from ..utils.logging_utils import get_logger
+
+
+@dataclass
+class FramePacket:
+    """A captured frame together with its detection results."""
+    frame: Any
+    landmarks: LandmarkResult
+    timestamp: float
+    inference_time: float = 0.0
+    source_time: float = 0.0
+    # Landmarks drawn over the frame when they differ from the retargeted ones (fused multi-camera results)
+    display_landmarks: Optional[LandmarkResult] = None
+
+
+class LatestResultMailbox:
+    """
+    Lock-free single-slot mailbox that always holds the newest item.
+    
+    The producer replaces the slot with a single attribute store and the
+    consumer reads it with a single attribute load. Both are atomic under
+    the GIL, so neither side ever waits on the other. Every published item
+    carries a sequence number, which lets the consumer count the items that
+    were overwritten before it could take them.
+    """
+    
+    def __init__(self):
+        self._slot = (0, None)
+        self._taken_seq = 0
+        self.produced = 0
+        self.consumed = 0
+        self.overwritten = 0
+    
+    def publish(self, item):
+        """
+        Publish a new item, replacing any item that has not been taken yet.
+        
+        Args:
+            item: Item to publish (only called from the producer thread)
+        """
+        self.produced += 1
+        self._slot = (self.produced, item)
+    
+    def take(self) -> Optional[Any]:
+        """
+        Take the newest item if one was published since the last take.
+        
+        Returns:
+            The newest item, or None if nothing new is available
+        """
+        seq, item = self._slot
+        if seq == self._taken_seq:
+            return None
+        
+        self.overwritten += seq - self._taken_seq - 1
+        self._taken_seq = seq
+        self.consumed += 1
+        return item
+    
+    def is_pending(self) -> bool:
+        """Check if the newest published item has not been taken yet."""
+        return self._slot[0] != self._taken_seq
+    
+    def reset(self):
+        """Clear the slot and all counters."""
+        self._slot = (0, None)
+        self._taken_seq = 0
+        self.produced = 0
+        self.consumed = 0
+        self.overwritten = 0
+
+
+class CaptureWorker:
+    """
+    Runs camera capture and MediaPipe inference on a background thread.
+    
+    The worker opens the camera and initializes the trackers on its own
+    thread, then publishes one FramePacket per captured frame into a
+    LatestResultMailbox. The UI thread only ever takes the newest packet.
+    
+    Asynchronous trackers (TasksTrackers) are only handed the frames; their
+    result callbacks publish the packets, so capture of the next frame
+    overlaps inference of the previous one.
+    """
+    
+    def __init__(self, camera, trackers, mailbox: Optional[LatestResultMailbox] = None,
+                 stream_writer=None, lossless: bool = False):
+        """
+        Initialize the worker.
+        
+        Args:
+            camera: Unopened CameraCapture (or compatible source)
+            trackers: Uninitialized MediaPipeTrackers (or compatible tracker)
+            mailbox: Mailbox to publish into (a new one is created if None)
+            stream_writer: Optional LandmarkStreamWriter receiving every result
+            lossless: Wait for each packet to be taken before publishing the
+                      next one (file sources processed as fast as possible)
+        """
+        self.camera = camera
+        self.trackers = trackers
+        self.mailbox = mailbox if mailbox is not None else LatestResultMailbox()
+        self.stream_writer = stream_writer
+        self.lossless = lossless
+        self.logger = get_logger()
+        
+        self.error_message = ""
+        self.resolution = (0, 0)
+        self.inference_time = 0.0
+        
+        self._thread = None
+        self._ready = threading.Event()
+        self._stop_event = threading.Event()
+        self._started_ok = False
+    
+    def start(self, timeout: float = 30.0) -> bool:
+        """
+        Start the worker thread and wait until capture is running.
+        
+        Args:
+            timeout: Seconds to wait for camera and tracker initialization
+        
+        Returns:
+            True if the camera opened and the trackers initialized
+        """
+        if self._thread is not None:
+            return self._started_ok
+        
+        self.mailbox.reset()
+        self._ready.clear()
+        self._stop_event.clear()
+        self._started_ok = False
+        self.error_message = ""
+        
+        self._thread = threading.Thread(target=self._run, name="MocapCaptureWorker", daemon=True)
+        self._thread.start()
+        
+        if not self._ready.wait(timeout):
+            self.error_message = "Timed out while starting capture"
+            self.stop()
+            return False
+        
+        if not self._started_ok:
+            self.stop()
+        return self._started_ok
+    
+    def stop(self, timeout: float = 2.0):
+        """
+        Stop the worker thread and release camera and trackers.
+        
+        Args:
+            timeout: Seconds to wait for the thread to finish
+        """
+        self._stop_event.set()
+        if self._thread is not None:
+            self._thread.join(timeout)
+            if self._thread.is_alive():
+                self.logger.warning("Capture worker did not stop in time")
+            self._thread = None
+    
+    def is_running(self) -> bool:
+        """Check if the worker thread is alive."""
+        return self._thread is not None and self._thread.is_alive()
+    
+    def get_dropped_frames(self) -> int:
+        """Get failed reads, frames dropped by asynchronous trackers and results overwritten before use."""
+        return (self.camera.get_dropped_frames() + getattr(self.trackers, 'dropped_frames', 0) +
+                self.mailbox.overwritten)
+    
+    def _publish(self, frame, landmarks, timestamp: float, source_time: float):
+        """Write a result to the landmark stream and publish it."""
+        self.inference_time = time.perf_counter() - timestamp
+        
+        if self.stream_writer is not None:
+            self.stream_writer.write(source_time, landmarks)
+        
+        self.mailbox.publish(FramePacket(
+            frame=frame,
+            landmarks=landmarks,
+            timestamp=timestamp,
+            inference_time=self.inference_time,
+            source_time=source_time
+        ))
+    
+    def _publish_async(self, context, landmarks):
+        """Result listener of asynchronous trackers (called on a MediaPipe thread)."""
+        frame, timestamp, source_time = context
+        self._publish(frame, landmarks, timestamp, source_time)
+    
+    def _run(self):
+        """Thread body: open, then capture and infer until stopped."""
+        try:
+            if not self.camera.open():
+                self.error_message = "Failed to open capture source"
+                return
+            
+            if not self.trackers.initialize():
+                self.error_message = "Failed to initialize MediaPipe"
+                self.camera.release()
+                return
+            
+            self.resolution = self.camera.get_resolution()
+            
+            if self.stream_writer is not None:
+                self.stream_writer.resolution = self.resolution
+                if not self.stream_writer.open():
+                    self.logger.warning("Landmark stream disabled")
+                    self.stream_writer = None
+            
+            self._started_ok = True
+        finally:
+            self._ready.set()
+        
+        # Lossless file processing needs one result per frame, so it uses the blocking path
+        run_async = getattr(self.trackers, 'is_async', False) and not self.lossless
+        if run_async:
+            self.trackers.set_result_listener(self._publish_async)
+        
+        try:
+            while not self._stop_event.is_set():
+                frame_result = self.camera.read_frame()
+                if not frame_result:
+                    if self.camera.is_finished():
+                        self.error_message = "Source finished"
+                        break
+                    # Avoid spinning on a camera that returns no frames
+                    time.sleep(0.005)
+                    continue
+                
+                success, frame, frame_rgb = frame_result
+                timestamp = time.perf_counter()
+                source_time = self.camera.frame_timestamp
+                
+                if run_async:
+                    self.trackers.submit(frame_rgb, (frame, timestamp, source_time))
+                    continue
+                
+                landmarks = self.trackers.process_frame(frame_rgb)
+                self._publish(frame, landmarks, timestamp, source_time)
+                
+                if self.lossless:
+                    while self.mailbox.is_pending() and not self._stop_event.is_set():
+                        time.sleep(0.001)
+        
+        except Exception as e:
+            self.error_message = f"Capture worker error: {str(e)}"
+            self.logger.error(self.error_message)
+        
+        finally:
+            # Closing the trackers waits for inference in flight, before the stream is closed
+            self.trackers.cleanup()
+            if self.stream_writer is not None:
+                self.stream_writer.close()
+            self.camera.release()
@@ -3,14 +3,211 @@ Keyframe recording and action baking.
 """
 
 import bpy
+import re
 from datetime import datetime
-from typing import Optional
+from typing import Optional, List, Dict, Tuple
+import numpy as np
 
+from .mapping import get_landmark_group
 from ..utils.logging_utils import get_logger
 
 
+_BONE_PATH = re.compile(r'^pose\.bones\["(.*)"\]\.(\w+)$')
+
+# Keyframe.interpolation enum value of 'LINEAR'
+_INTERPOLATION_LINEAR = 1
+
+
+class RecordingBuffer:
+    """
+    Preallocated sample store for live recording.
+    
+    One row per recorded frame holds a quaternion (and optionally a
+    location) per bone plus a validity mask. Appending is a fixed-size
+    array copy, so recording costs the same per frame however long the
+    take is; keyframes are written in bulk by flush().
+    """
+    
+    def __init__(self, record_location: bool = False, capacity: int = 1024):
+        """
+        Initialize buffer.
+        
+        Args:
+            record_location: Also store bone locations
+            capacity: Initial number of frame rows
+        """
+        self.record_location = record_location
+        self.bone_names: List[str] = []
+        self.count = 0
+        
+        self._bone_index = {}
+        self._columns_cache = (None, None)
+        self._allocate(capacity, 0)
+    
+    def __len__(self) -> int:
+        return self.count
+    
+    def _allocate(self, capacity: int, bone_count: int):
+        """(Re)allocate arrays, keeping recorded rows and columns."""
+        frames = np.zeros(capacity, dtype=np.float32)
+        rotations = np.zeros((capacity, bone_count, 4), dtype=np.float32)
+        rotations[..., 0] = 1.0
+        valid = np.zeros((capacity, bone_count), dtype=bool)
+        locations = np.zeros((capacity, bone_count, 3), dtype=np.float32) if self.record_location else None
+        
+        if self.count:
+            old_bones = self.rotations.shape[1]
+            frames[:self.count] = self.frames[:self.count]
+            rotations[:self.count, :old_bones] = self.rotations[:self.count]
+            valid[:self.count, :old_bones] = self.valid[:self.count]
+            if locations is not None:
+                locations[:self.count, :old_bones] = self.locations[:self.count]
+        
+        self.frames = frames
+        self.rotations = rotations
+        self.valid = valid
+        self.locations = locations
+    
+    def _columns(self, bone_names: List[str]) -> np.ndarray:
+        """Column index per bone, adding columns for new bones."""
+        cached_names, cached_columns = self._columns_cache
+        if cached_names is bone_names:
+            return cached_columns
+        
+        new_bones = [name for name in dict.fromkeys(bone_names) if name not in self._bone_index]
+        if new_bones:
+            for name in new_bones:
+                self._bone_index[name] = len(self.bone_names)
+                self.bone_names.append(name)
+            self._allocate(len(self.frames), len(self.bone_names))
+        
+        columns = np.array([self._bone_index[name] for name in bone_names], dtype=np.intp)
+        self._columns_cache = (bone_names, columns)
+        return columns
+    
+    def append(self, frame: float, bone_names: List[str], rotations: np.ndarray,
+               valid: Optional[np.ndarray] = None, locations: Optional[np.ndarray] = None):
+        """
+        Record one frame for a set of bones.
+        
+        Samples for the same frame as the previous call are merged into
+        the same row.
+        
+        Args:
+            frame: Frame number
+            bone_names: Bone name per sample (reuse the same list object to
+                        skip the name lookup)
+            rotations: (B, 4) quaternions (w, x, y, z)
+            valid: Optional (B,) bool mask of samples to record
+            locations: Optional (B, 3) locations (record_location only)
+        """
+        columns = self._columns(bone_names)
+        
+        if not self.count or self.frames[self.count - 1] != frame:
+            if self.count == len(self.frames):
+                self._allocate(2 * len(self.frames), len(self.bone_names))
+            self.frames[self.count] = frame
+            self.valid[self.count] = False
+            self.count += 1
+        
+        row = self.count - 1
+        if valid is not None:
+            columns = columns[np.asarray(valid, dtype=bool)]
+            rotations = np.asarray(rotations)[valid]
+            if locations is not None:
+                locations = np.asarray(locations)[valid]
+        
+        self.rotations[row, columns] = rotations
+        self.valid[row, columns] = True
+        if locations is not None and self.locations is not None:
+            self.locations[row, columns] = locations
+    
+    def clear(self):
+        """Drop all samples (keeps the allocation)."""
+        self.count = 0
+    
+    def flush(self, armature, action=None) -> int:
+        """
+        Write all samples as keyframes and clear the buffer.
+        
+        Keys are merged into the armature's action (created if missing);
+        existing keys of the same bones inside the recorded frame range
+        are replaced.
+        
+        Args:
+            armature: Target armature
+            action: Action to write into (None = armature's current action)
+        
+        Returns:
+            Number of keyframes written
+        """
+        if not self.count or not self.bone_names:
+            return 0
+        
+        if action is None:
+            if armature.animation_data and armature.animation_data.action:
+                action = armature.animation_data.action
+            else:
+                action = create_action(armature)
+        
+        count = self.count
+        frames = self.frames[:count]
+        valid = self.valid[:count]
+        keys = write_bone_fcurves(
+            armature, action, self.bone_names, frames,
+            self.rotations[:count], valid, "rotation_quaternion", replace=False
+        )
+        if self.locations is not None:
+            keys += write_bone_fcurves(
+                armature, action, self.bone_names, frames,
+                self.locations[:count], valid, "location", replace=False
+            )
+        
+        self.clear()
+        return keys
+
+
+# Buffer of the recording in progress (see start/stop_recording_buffer)
+_active_buffer: Optional[RecordingBuffer] = None
+
+
+def start_recording_buffer() -> RecordingBuffer:
+    """Create the buffer for a new live recording."""
+    global _active_buffer
+    _active_buffer = RecordingBuffer()
+    return _active_buffer
+
+
+def get_recording_buffer() -> Optional[RecordingBuffer]:
+    """Get the buffer of the recording in progress (None if not recording)."""
+    return _active_buffer
+
+
+def stop_recording_buffer(armature) -> int:
+    """
+    Flush the live recording to the armature's action and drop the buffer.
+    
+    Args:
+        armature: Target armature (None discards the samples)
+    
+    Returns:
+        Number of keyframes written
+    """
+    global _active_buffer
+    buffer, _active_buffer = _active_buffer, None
+    
+    if buffer is None or armature is None:
+        return 0
+    
+    try:
+        return buffer.flush(armature)
+    except (ReferenceError, RuntimeError) as e:
+        get_logger().error(f"Failed to write recording: {str(e)}")
+        return 0
+
+
 class KeyframeRecorder:
-    """Handles keyframe insertion during recording."""
+    """Records bone poses into a RecordingBuffer and writes them in bulk on stop."""
     
     def __init__(self, armature):
         """
@@ -22,6 +219,7 @@ class KeyframeRecorder:
         self.armature = armature
         self.start_frame = 1
         self.frame_count = 0
+        self.buffer = RecordingBuffer(record_location=True)
         self.logger = get_logger()
     
     def start(self, start_frame: int = 1):
@@ -33,42 +231,44 @@ class KeyframeRecorder:
         """
         self.start_frame = start_frame
         self.frame_count = 0
+        self.buffer.clear()
         self.logger.info(f"Recording started at frame {start_frame}")
     
     def insert_keyframe(self, bone_name: str, location: bool = True, 
                        rotation: bool = True, frame: Optional[int] = None):
         """
-        Insert keyframe for a bone.
+        Record the current pose of a bone.
         
         Args:
             bone_name: Name of the bone
-            location: Insert location keyframe
-            rotation: Insert rotation keyframe
+            location: Record location
+            rotation: Record rotation
             frame: Frame number (None = current scene frame)
         """
-        if bone_name not in self.armature.pose.bones:
+        bone = self.armature.pose.bones.get(bone_name)
+        if bone is None:
             return
         
-        bone = self.armature.pose.bones[bone_name]
-        
         if frame is None:
             frame = bpy.context.scene.frame_current
         
-        try:
-            if location:
-                bone.keyframe_insert(data_path="location", frame=frame)
-            
-            if rotation:
-                bone.keyframe_insert(data_path="rotation_quaternion", frame=frame)
-            
-            self.frame_count += 1
-            
-        except Exception as e:
-            self.logger.error(f"Keyframe insertion failed for {bone_name}: {str(e)}")
+        self.buffer.append(
+            frame, [bone_name],
+            np.array([bone.rotation_quaternion], dtype=np.float32),
+            locations=np.array([bone.location], dtype=np.float32)
+        )
+        self.frame_count += 1
     
-    def stop(self):
-        """Stop recording."""
-        self.logger.info(f"Recording stopped. Total frames: {self.frame_count}")
+    def stop(self) -> int:
+        """
+        Stop recording and write all keyframes.
+        
+        Returns:
+            Number of keyframes written
+        """
+        keys = self.buffer.flush(self.armature)
+        self.logger.info(f"Recording stopped. Total frames: {self.frame_count}, keyframes: {keys}")
+        return keys
     
     def get_frame_count(self) -> int:
         """Get number of frames recorded."""
@@ -100,8 +300,333 @@ def create_action(armature, name: Optional[str] = None) -> bpy.types.Action:
     return action
 
 
+def get_action_fcurves(armature, action):
+    """
+    Get the F-Curve collection the armature animates through.
+    
+    Blender 4.4+ stores F-Curves in a channelbag per action slot, older
+    versions directly on the action.
+    
+    Args:
+        armature: Armature the action is assigned to
+        action: Action to write into
+    
+    Returns:
+        F-Curve collection supporting new() and find()
+    """
+    if bpy.app.version < (4, 4, 0):
+        return action.fcurves
+    
+    from bpy_extras import anim_utils
+    
+    anim_data = armature.animation_data
+    slot = anim_data.action_slot
+    if slot is None:
+        slot = action.slots.new(id_type='OBJECT', name=armature.name)
+        anim_data.action_slot = slot
+    return anim_utils.action_ensure_channelbag_for_slot(action, slot).fcurves
+
+
+def write_bone_fcurves(armature, action, bone_names: List[str],
+                       frames: np.ndarray, values: np.ndarray,
+                       valid: Optional[np.ndarray] = None,
+                       prop: str = "rotation_quaternion",
+                       replace: bool = True) -> int:
+    """
+    Write keyframes of one pose bone property for many bones in bulk.
+    
+    Uses keyframe_points.add + foreach_set per F-Curve instead of one
+    keyframe_insert per bone per frame.
+    
+    Args:
+        armature: Target armature (action must be assigned to it)
+        action: Action to write into
+        bone_names: Bone name per column of values
+        frames: (F,) frame numbers
+        values: (F, B, C) property values, e.g. C=4 for quaternions
+        valid: Optional (F, B) bool mask of samples to key
+        prop: Pose bone property ("rotation_quaternion", "location", ...)
+        replace: Replace existing F-Curves (False = keep existing keys
+                 outside the written frame range)
+    
+    Returns:
+        Number of keyframes written
+    """
+    fcurves = get_action_fcurves(armature, action)
+    frames = np.asarray(frames, dtype=np.float32)
+    channels = values.shape[2]
+    key_count = 0
+    
+    for b, bone_name in enumerate(bone_names):
+        mask = slice(None) if valid is None else valid[:, b]
+        bone_frames = frames[mask]
+        if not len(bone_frames):
+            continue
+        
+        bone = armature.pose.bones.get(bone_name)
+        if bone is not None and prop == "rotation_quaternion":
+            bone.rotation_mode = 'QUATERNION'
+        
+        data_path = f'pose.bones["{bpy.utils.escape_identifier(bone_name)}"].{prop}'
+        bone_values = values[mask, b]
+        first, last = bone_frames.min(), bone_frames.max()
+        
+        for index in range(channels):
+            co = np.empty((len(bone_frames), 2), dtype=np.float32)
+            co[:, 0] = bone_frames
+            co[:, 1] = bone_values[:, index]
+            
+            fcurve = fcurves.find(data_path, index=index)
+            if fcurve is not None and not replace and len(fcurve.keyframe_points):
+                # Keep existing keys outside the new range
+                existing = np.empty(2 * len(fcurve.keyframe_points), dtype=np.float32)
+                fcurve.keyframe_points.foreach_get("co", existing)
+                existing = existing.reshape(-1, 2)
+                keep = (existing[:, 0] < first) | (existing[:, 0] > last)
+                co = np.concatenate([existing[keep], co])
+                co = co[np.argsort(co[:, 0], kind='stable')]
+            
+            if fcurve is not None:
+                fcurves.remove(fcurve)
+            fcurve = fcurves.new(data_path, index=index, action_group=bone_name)
+            
+            fcurve.keyframe_points.add(len(co))
+            fcurve.keyframe_points.foreach_set("co", co.ravel())
+            fcurve.update()
+            key_count += len(bone_frames)
+    
+    return key_count
+
+
+def write_rotation_fcurves(armature, action, bone_names: List[str],
+                           frames: np.ndarray, rotations: np.ndarray,
+                           valid: Optional[np.ndarray] = None) -> int:
+    """
+    Write quaternion keyframes for many bones in bulk (replaces existing curves).
+    
+    Args:
+        armature: Target armature (action must be assigned to it)
+        action: Action to write into
+        bone_names: Bone name per column of rotations
+        frames: (F,) frame numbers
+        rotations: (F, B, 4) quaternions (w, x, y, z)
+        valid: Optional (F, B) bool mask of samples to key
+    
+    Returns:
+        Number of keyframes written
+    """
+    return write_bone_fcurves(armature, action, bone_names, frames, rotations, valid)
+
+
+def simplify_keys(frames: np.ndarray, values: np.ndarray, tolerance: float,
+                  quaternion: bool = False, fixed: Optional[np.ndarray] = None) -> np.ndarray:
+    """
+    Select the keys to keep so linear interpolation stays within tolerance.
+    
+    Ramer-Douglas-Peucker, processed breadth-first: every pass measures
+    the error of all dropped keys against their enclosing kept keys at
+    once and splits every segment that is out of tolerance at its worst
+    key. The result matches the recursive algorithm.
+    
+    Args:
+        frames: (F,) key frames, ascending
+        values: (F, C) key values
+        tolerance: Maximum error (radians for quaternions, value units otherwise)
+        quaternion: values are quaternions (w, x, y, z); error is the angle
+                    between the key and the normalized interpolated rotation
+        fixed: Optional (F,) bool mask of keys that must be kept
+    
+    Returns:
+        (F,) bool mask of keys to keep
+    """
+    count = len(frames)
+    keep = np.zeros(count, dtype=bool) if fixed is None else np.array(fixed, dtype=bool)
+    if count <= 2:
+        keep[:] = True
+        return keep
+    keep[0] = keep[-1] = True
+    
+    frames = np.asarray(frames, dtype=np.float64)
+    values = np.asarray(values, dtype=np.float64).reshape(count, -1)
+    if quaternion:
+        norms = np.linalg.norm(values, axis=1, keepdims=True)
+        values = values / np.maximum(norms, 1e-12)
+    
+    limit = -np.cos(0.5 * min(tolerance, np.pi)) ** 2 if quaternion else tolerance
+    
+    # Dropped keys whose segment is not yet known to be within tolerance
+    active = np.flatnonzero(~keep)
+    
+    while len(active):
+        # Enclosing kept keys of every active key
+        kept = np.flatnonzero(keep)
+        position = np.searchsorted(kept, active)
+        prev = kept[position - 1]
+        next_ = kept[position]
+        
+        span = frames[next_] - frames[prev]
+        t = (frames[active] - frames[prev]) / span
+        approx = values[prev] + t[:, np.newaxis] * (values[next_] - values[prev])
+        
+        if quaternion:
+            # Squared cosine of half the rotation error of the interpolated
+            # (unnormalized) quaternion, negated so larger means worse
+            dots = np.einsum('ij,ij->i', approx, values[active])
+            error = -dots * dots / np.maximum(np.einsum('ij,ij->i', approx, approx), 1e-12)
+        else:
+            error = np.abs(approx - values[active]).max(axis=1)
+        
+        out = error > limit
+        if not out.any():
+            break
+        
+        # Split every out-of-tolerance segment (identified by its start key) at its worst key
+        candidates = np.flatnonzero(out)
+        segment = prev[candidates]
+        order = np.lexsort((-error[candidates], segment))
+        first = np.ones(len(order), dtype=bool)
+        first[1:] = segment[order][1:] != segment[order][:-1]
+        keep[active[candidates[order[first]]]] = True
+        
+        # Keys of segments within tolerance are final
+        split = np.zeros(count, dtype=bool)
+        split[segment] = True
+        active = active[split[prev] & ~keep[active]]
+    
+    return keep
+
+
+def get_clean_tolerances(settings) -> Dict[str, float]:
+    """
+    Map mapped armature bones to the rotation tolerance of their bone group.
+    
+    Args:
+        settings: MOCAP_PG_Settings
+    
+    Returns:
+        Dict of bone name -> tolerance in radians
+    """
+    group_tolerances = {
+        "HEAD": settings.clean_tolerance_head,
+        "TORSO": settings.clean_tolerance_torso,
+        "ARMS": settings.clean_tolerance_arms,
+        "HANDS": settings.clean_tolerance_hands,
+        "LEGS": settings.clean_tolerance_legs,
+    }
+    return {
+        mapping.bone_name: group_tolerances[get_landmark_group(mapping.landmark_name)]
+        for mapping in settings.bone_mappings
+        if mapping.bone_name
+    }
+
+
+def _parse_bone_path(data_path: str):
+    """Split 'pose.bones["name"].prop' into (name, prop); (None, data_path) otherwise."""
+    match = _BONE_PATH.match(data_path)
+    if not match:
+        return None, data_path
+    name = re.sub(r'\\(.)', r'\1', match.group(1))
+    return name, match.group(2)
+
+
+def _rewrite_keys(fcurve, co: np.ndarray):
+    """Replace all keys of an F-Curve with linearly interpolated keys at co (K, 2)."""
+    points = fcurve.keyframe_points
+    if hasattr(points, "clear"):
+        points.clear()
+    else:
+        while len(points):
+            points.remove(points[-1], fast=True)
+    
+    points.add(len(co))
+    points.foreach_set("co", co.astype(np.float32).ravel())
+    try:
+        points.foreach_set("interpolation", np.full(len(co), _INTERPOLATION_LINEAR, dtype=np.int32))
+    except (TypeError, RuntimeError):
+        for point in points:
+            point.interpolation = 'LINEAR'
+    fcurve.update()
+
+
+def clean_fcurves(fcurves, rotation_tolerances: Optional[Dict[str, float]] = None,
+                  default_tolerance: float = np.radians(0.5),
+                  location_tolerance: float = 0.001,
+                  frame_range: Optional[Tuple[float, float]] = None) -> Tuple[int, int]:
+    """
+    Reduce keys of an F-Curve collection within an error bound.
+    
+    The four rotation_quaternion curves of a bone are simplified together
+    on angular error; other curves one by one on absolute error
+    (location_tolerance for location/scale, the rotation tolerance for
+    Euler angles). Remaining keys are set to linear interpolation, which
+    the error bound assumes.
+    
+    Args:
+        fcurves: F-Curve collection or list
+        rotation_tolerances: Bone name -> rotation tolerance in radians
+        default_tolerance: Rotation tolerance of bones not in rotation_tolerances
+        location_tolerance: Tolerance for location and scale curves
+        frame_range: Optional (start, end); keys outside are left untouched
+    
+    Returns:
+        Tuple of (keys before, keys after)
+    """
+    rotation_tolerances = rotation_tolerances or {}
+    
+    # Group curves by property so quaternion channels are reduced together
+    groups = {}
+    for fcurve in fcurves:
+        if len(fcurve.keyframe_points) > 2:
+            groups.setdefault(fcurve.data_path, []).append(fcurve)
+    
+    keys_before = sum(len(fcurve.keyframe_points) for fcurve in fcurves)
+    removed = 0
+    
+    for data_path, curves in groups.items():
+        bone_name, prop = _parse_bone_path(data_path)
+        rotation_tolerance = rotation_tolerances.get(bone_name, default_tolerance)
+        
+        keys = []
+        for fcurve in curves:
+            co = np.empty(2 * len(fcurve.keyframe_points), dtype=np.float32)
+            fcurve.keyframe_points.foreach_get("co", co)
+            keys.append(co.reshape(-1, 2))
+        
+        shared_frames = (
+            prop == "rotation_quaternion" and len(curves) == 4 and
+            all(len(k) == len(keys[0]) and np.array_equal(k[:, 0], keys[0][:, 0]) for k in keys)
+        )
+        if shared_frames:
+            order = np.argsort([fcurve.array_index for fcurve in curves])
+            curves = [curves[i] for i in order]
+            keys = [keys[i] for i in order]
+            batches = [(curves, keys, np.stack([k[:, 1] for k in keys], axis=1), rotation_tolerance, True)]
+        else:
+            tolerance = rotation_tolerance if prop.startswith("rotation") else location_tolerance
+            batches = [([fcurve], [k], k[:, 1:], tolerance, False) for fcurve, k in zip(curves, keys)]
+        
+        for batch_curves, batch_keys, values, tolerance, quaternion in batches:
+            frames = batch_keys[0][:, 0]
+            fixed = None
+            if frame_range is not None:
+                fixed = (frames < frame_range[0]) | (frames > frame_range[1])
+            
+            keep = simplify_keys(frames, values, tolerance, quaternion, fixed)
+            if keep.all():
+                continue
+            
+            for fcurve, co in zip(batch_curves, batch_keys):
+                _rewrite_keys(fcurve, co[keep])
+                removed += int(len(keep) - keep.sum())
+    
+    return keys_before, keys_before - removed
+
+
 def bake_action(armature, start_frame: int, end_frame: int, 
-               clean: bool = True) -> bool:
+               clean: bool = True,
+               rotation_tolerances: Optional[Dict[str, float]] = None,
+               default_tolerance: float = np.radians(0.5),
+               location_tolerance: float = 0.001) -> Optional[Tuple[int, int]]:
     """
     Bake and clean up the action.
     
@@ -110,9 +635,13 @@ def bake_action(armature, start_frame: int, end_frame: int,
         start_frame: Start frame
         end_frame: End frame
         clean: Whether to clean/simplify keyframes
+        rotation_tolerances: Bone name -> rotation tolerance in radians
+                             (see get_clean_tolerances)
+        default_tolerance: Rotation tolerance for other bones in radians
+        location_tolerance: Tolerance for location and scale curves
     
     Returns:
-        True if successful
+        Tuple of (keys before, keys after), None on failure
     """
     logger = get_logger()
     
@@ -120,16 +649,22 @@ def bake_action(armature, start_frame: int, end_frame: int,
         # Ensure action exists
         if not armature.animation_data or not armature.animation_data.action:
             logger.error("No action to bake")
-            return False
+            return None
         
-        # Optional: Clean up keyframes (simplify)
-        if clean:
-            # TODO: Implement keyframe cleanup/simplification
-            pass
+        action = armature.animation_data.action
+        fcurves = get_action_fcurves(armature, action)
         
-        logger.info(f"Action baked: {armature.animation_data.action.name}")
-        return True
+        if clean:
+            keys_before, keys_after = clean_fcurves(
+                fcurves, rotation_tolerances, default_tolerance,
+                location_tolerance, frame_range=(start_frame, end_frame)
+            )
+        else:
+            keys_before = keys_after = sum(len(fcurve.keyframe_points) for fcurve in fcurves)
         
+        logger.info(f"Action baked: {action.name} ({keys_before} -> {keys_after} keys)")
+        return keys_before, keys_after
+    
     except Exception as e:
         logger.error(f"Bake failed: {str(e)}")
-        return False
+        return None
@@ -4,13 +4,109 @@ Landmark to bone retargeting with math utilities.
 
 from mathutils import Vector, Quaternion
 from typing import List, Dict, Optional
+import numpy as np
 
 from ..utils.coords import (
     mediapipe_to_blender,
     direction_to_quaternion,
-    compute_bone_direction
+    compute_bone_direction,
+    compute_bone_directions,
+    directions_to_quaternions
 )
 from ..utils.logging_utils import get_logger
+from .trackers import POSE_LANDMARK_INDICES
+
+
+# Row of the computed spine proxy in arrays returned by convert_landmark_array
+SPINE_PROXY_INDEX = 33
+
+# Standard shoulder width assumption used for scale normalization
+STANDARD_SHOULDER_WIDTH = 0.4
+
+
+def get_landmark_index(landmark_name: str) -> Optional[int]:
+    """
+    Get the row index of a landmark in a converted landmark array.
+    
+    Args:
+        landmark_name: MediaPipe landmark name or "SPINE_PROXY"
+    
+    Returns:
+        Row index, or None if the name is unknown
+    """
+    if landmark_name == "SPINE_PROXY":
+        return SPINE_PROXY_INDEX
+    return POSE_LANDMARK_INDICES.get(landmark_name)
+
+
+def landmarks_to_array(landmarks) -> np.ndarray:
+    """
+    Pack a MediaPipe landmark list into a float32 array in a single pass.
+    
+    Args:
+        landmarks: MediaPipe landmark list, or an existing (33, 4) array
+    
+    Returns:
+        (N, 4) float32 array of (x, y, z, visibility)
+    """
+    if isinstance(landmarks, np.ndarray):
+        return landmarks.astype(np.float32, copy=False)
+    
+    return np.array(
+        [(lm.x, lm.y, getattr(lm, 'z', 0.0), getattr(lm, 'visibility', 1.0)) for lm in landmarks],
+        dtype=np.float32
+    ).reshape(-1, 4)
+
+
+def convert_landmark_array(landmarks: np.ndarray, scale: float = 1.0,
+                           z_offset: float = 0.0,
+                           normalize_scale: bool = True) -> np.ndarray:
+    """
+    Convert raw MediaPipe landmark arrays to Blender space in one go.
+    
+    Applies the same axis flip, scale and offset as mediapipe_to_blender,
+    the shoulder-width normalization of normalize_skeleton_scale and appends
+    the spine proxy of compute_spine_position as an extra row. Accepts a
+    single frame (33, 4) or a whole clip (N, 33, 4).
+    
+    Args:
+        landmarks: (..., 33, 4) array of (x, y, z, visibility)
+        scale: Overall scale factor
+        z_offset: Vertical offset
+        normalize_scale: Normalize skeleton scale by shoulder width
+    
+    Returns:
+        (..., 34, 4) float32 array of (x, y, z, visibility) in Blender space,
+        with the spine proxy at SPINE_PROXY_INDEX
+    """
+    landmarks = np.asarray(landmarks, dtype=np.float32)
+    count = landmarks.shape[-2]
+    
+    result = np.empty(landmarks.shape[:-2] + (count + 1, 4), dtype=np.float32)
+    positions = result[..., :count, :3]
+    
+    # Mirror X, depth becomes Y, flip image Y to Z (see mediapipe_to_blender)
+    positions[..., 0] = (0.5 - landmarks[..., 0]) * scale
+    positions[..., 1] = -landmarks[..., 2] * scale
+    positions[..., 2] = (landmarks[..., 1] - 0.5) * scale + z_offset
+    result[..., :count, 3] = landmarks[..., 3]
+    
+    # Normalize scale by shoulder width (see normalize_skeleton_scale)
+    if normalize_scale and count > 12:
+        dist = np.linalg.norm(positions[..., 11, :] - positions[..., 12, :], axis=-1)
+        factor = np.where(dist < 0.001, 1.0, STANDARD_SHOULDER_WIDTH / np.maximum(dist, 0.001))
+        positions *= factor[..., np.newaxis, np.newaxis].astype(np.float32)
+    
+    # Spine proxy: midpoint between hip center and shoulder center
+    if count >= 25:
+        result[..., count, :3] = (positions[..., 23, :] + positions[..., 24, :] +
+                                  positions[..., 11, :] + positions[..., 12, :]) * 0.25
+        result[..., count, 3] = landmarks[..., [11, 12, 23, 24], 3].min(axis=-1)
+    else:
+        result[..., count, :3] = np.nan
+        result[..., count, 3] = 0.0
+    
+    return result
 
 
 def landmarks_to_positions(landmarks: List, scale: float = 1.0, 
@@ -105,3 +201,23 @@ def compute_bone_rotation_from_chain(start_pos: Vector, end_pos: Vector,
         return Quaternion((1, 0, 0, 0))
     
     return direction_to_quaternion(direction, up_hint)
+
+
+def compute_bone_rotations_from_chains(start_positions: np.ndarray,
+                                       end_positions: np.ndarray,
+                                       up_hints: Optional[np.ndarray] = None) -> np.ndarray:
+    """
+    Batched compute_bone_rotation_from_chain for many bones (or frames).
+    
+    Args:
+        start_positions: (B, 3) start positions
+        end_positions: (B, 3) end positions
+        up_hints: Optional (3,) or (B, 3) up vectors
+    
+    Returns:
+        (B, 4) quaternions (w, x, y, z); identity where start and end coincide
+    """
+    directions, lengths = compute_bone_directions(start_positions, end_positions)
+    quats = directions_to_quaternions(directions, up_hints)
+    quats[lengths < 0.001] = (1.0, 0.0, 0.0, 0.0)
+    return quats
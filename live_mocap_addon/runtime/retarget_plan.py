@@ -0,0 +1,227 @@
+"""
+Precompiled per-armature retarget plan.
+
+Resolves bone mappings to pose bones and integer landmark indices once, so
+the per-frame retarget loop does no name lookups or string work.
+"""
+
+from typing import List
+import numpy as np
+
+from .retarget import get_landmark_index
+from .mapping import get_next_landmark_in_chain, get_landmark_group
+from ..utils.logging_utils import get_logger
+
+
+# Bumped whenever bone mappings or the target armature change
+_generation = 0
+
+
+def invalidate_retarget_plans(self=None, context=None):
+    """
+    Mark all compiled retarget plans as outdated.
+    
+    Signature matches Blender property update callbacks so it can be used
+    directly as `update=` on mapping properties.
+    """
+    global _generation
+    _generation += 1
+
+
+def get_plan_generation() -> int:
+    """Get the current mapping generation."""
+    return _generation
+
+
+def is_foot_bone(bone_name: str) -> bool:
+    """Check if a bone should use foot locking."""
+    name = bone_name.lower()
+    return "ankle" in name or "foot" in name
+
+
+class RetargetPlan:
+    """
+    Flat, index-based description of how landmarks drive an armature.
+    
+    Entry i drives pose_bones[i] from landmark row landmark_indices[i]
+    towards end_indices[i] (-1 when the landmark has no chain), using
+    filter slot filter_slots[i].
+    """
+    
+    def __init__(self):
+        self.armature = None
+        self.armature_pointer = 0
+        self.bone_count = 0
+        self.generation = -1
+        
+        self.bone_names: List[str] = []
+        self.landmark_names: List[str] = []
+        self.groups: List[str] = []
+        self.pose_bones: List = []
+        self.landmark_indices = np.zeros(0, dtype=np.intp)
+        self.end_indices = np.zeros(0, dtype=np.intp)
+        self.has_chain = np.zeros(0, dtype=bool)
+        self.is_foot = np.zeros(0, dtype=bool)
+        self.filter_slots = np.zeros(0, dtype=np.intp)
+    
+    def __len__(self) -> int:
+        return len(self.pose_bones)
+    
+    def is_valid_for(self, armature) -> bool:
+        """
+        Check if the plan still matches the armature and mappings.
+        
+        Args:
+            armature: Target armature object
+        
+        Returns:
+            True if the plan can be reused
+        """
+        try:
+            return (
+                armature is not None and
+                self.generation == _generation and
+                self.armature_pointer == armature.as_pointer() and
+                self.bone_count == len(armature.pose.bones)
+            )
+        except ReferenceError:
+            return False
+
+
+def build_retarget_plan(armature, bone_mappings) -> RetargetPlan:
+    """
+    Compile bone mappings into a retarget plan for an armature.
+    
+    Args:
+        armature: Target armature object
+        bone_mappings: Collection of MOCAP_PG_BoneMapping
+    
+    Returns:
+        Compiled RetargetPlan (empty if the armature is invalid)
+    """
+    logger = get_logger()
+    plan = RetargetPlan()
+    plan.generation = _generation
+    
+    if armature is None or armature.type != 'ARMATURE':
+        return plan
+    
+    plan.armature = armature
+    plan.armature_pointer = armature.as_pointer()
+    plan.bone_count = len(armature.pose.bones)
+    
+    landmark_indices = []
+    end_indices = []
+    is_foot = []
+    
+    for mapping in bone_mappings:
+        if not mapping.enabled or not mapping.bone_name:
+            continue
+        
+        bone = armature.pose.bones.get(mapping.bone_name)
+        if bone is None:
+            logger.debug(f"Bone '{mapping.bone_name}' not found in armature")
+            continue
+        
+        landmark_index = get_landmark_index(mapping.landmark_name)
+        if landmark_index is None:
+            logger.debug(f"Unknown landmark '{mapping.landmark_name}'")
+            continue
+        
+        next_landmark = get_next_landmark_in_chain(mapping.landmark_name)
+        end_index = get_landmark_index(next_landmark) if next_landmark else None
+        
+        plan.bone_names.append(mapping.bone_name)
+        plan.landmark_names.append(mapping.landmark_name)
+        plan.groups.append(get_landmark_group(mapping.landmark_name))
+        plan.pose_bones.append(bone)
+        landmark_indices.append(landmark_index)
+        end_indices.append(-1 if end_index is None else end_index)
+        is_foot.append(is_foot_bone(mapping.bone_name))
+    
+    plan.landmark_indices = np.array(landmark_indices, dtype=np.intp)
+    plan.end_indices = np.array(end_indices, dtype=np.intp)
+    plan.has_chain = plan.end_indices >= 0
+    plan.is_foot = np.array(is_foot, dtype=bool)
+    plan.filter_slots = np.arange(len(plan.pose_bones), dtype=np.intp)
+    
+    logger.info(f"Retarget plan compiled: {len(plan)} bones on '{armature.name}'")
+    return plan
+
+
+class MultiPersonPlan(RetargetPlan):
+    """
+    Retarget plans of several armatures concatenated into one plan.
+    
+    Performer p reads landmark rows p * rows_per_person + index, so the
+    converted landmarks of all people, stacked into one array, are
+    retargeted by a single pass of the per-frame retarget loop. Entries of
+    performer p are plan entries slices[p].
+    """
+    
+    def __init__(self):
+        super().__init__()
+        self.plans: List[RetargetPlan] = []
+        self.slices: List[slice] = []
+        self.performer_indices = np.zeros(0, dtype=np.intp)
+    
+    def is_valid_for(self, armatures) -> bool:
+        """
+        Check if the plan still matches the armatures and mappings.
+        
+        Args:
+            armatures: Target armature per performer (None = unused)
+        
+        Returns:
+            True if the plan can be reused
+        """
+        if len(armatures) != len(self.plans):
+            return False
+        return all(
+            plan.armature is None if armature is None else plan.is_valid_for(armature)
+            for plan, armature in zip(self.plans, armatures)
+        )
+
+
+def build_multi_person_plan(armatures, bone_mappings, rows_per_person: int) -> MultiPersonPlan:
+    """
+    Compile bone mappings into one plan driving several armatures.
+    
+    Args:
+        armatures: Target armature per performer (None = unused slot)
+        bone_mappings: Collection of MOCAP_PG_BoneMapping (shared by all armatures)
+        rows_per_person: Landmark rows per person in the stacked landmark array
+    
+    Returns:
+        Compiled MultiPersonPlan
+    """
+    combined = MultiPersonPlan()
+    combined.generation = _generation
+    
+    landmark_indices = []
+    end_indices = []
+    performer_indices = []
+    start = 0
+    for performer, armature in enumerate(armatures):
+        plan = build_retarget_plan(armature, bone_mappings)
+        combined.plans.append(plan)
+        combined.slices.append(slice(start, start + len(plan)))
+        start += len(plan)
+        
+        offset = performer * rows_per_person
+        combined.bone_names.extend(plan.bone_names)
+        combined.landmark_names.extend(plan.landmark_names)
+        combined.groups.extend(plan.groups)
+        combined.pose_bones.extend(plan.pose_bones)
+        landmark_indices.append(plan.landmark_indices + offset)
+        end_indices.append(np.where(plan.has_chain, plan.end_indices + offset, -1))
+        performer_indices.append(np.full(len(plan), performer, dtype=np.intp))
+    
+    if combined.plans:
+        combined.landmark_indices = np.concatenate(landmark_indices)
+        combined.end_indices = np.concatenate(end_indices)
+        combined.performer_indices = np.concatenate(performer_indices)
+        combined.is_foot = np.concatenate([plan.is_foot for plan in combined.plans])
+    combined.has_chain = combined.end_indices >= 0
+    combined.filter_slots = np.arange(len(combined.pose_bones), dtype=np.intp)
+    return combined
@@ -2,9 +2,17 @@
 MediaPipe tracker setup and landmark extraction.
 """
 
-from typing import Optional, List, Dict
+import os
+import shutil
+import threading
+import time
+import urllib.request
+from collections import namedtuple
+from typing import Optional, List, Dict, Tuple
 from dataclasses import dataclass
 
+import numpy as np
+
 from ..utils.logging_utils import get_logger
 
 
@@ -79,6 +87,9 @@ POSE_LANDMARK_NAMES = {
     31: "LEFT_FOOT_INDEX", 32: "RIGHT_FOOT_INDEX",
 }
 
+# Reverse lookup: landmark name -> index
+POSE_LANDMARK_INDICES = {name: idx for idx, name in POSE_LANDMARK_NAMES.items()}
+
 # MediaPipe pose connections (bones)
 POSE_CONNECTIONS = [
     # Face
@@ -143,10 +154,10 @@ def draw_pose(image, results, mp_holistic, mp_drawing):
             # Skip disabled landmarks
             if idx in DISABLED_POSE_LANDMARKS:
                 continue
-                
+            
             if landmark.visibility < 0.5:  # Skip if not visible enough
                 continue
-                
+            
             # Normalize z value (inverse: closer = larger)
             # z is negative for closer points, so we invert it
             normalized_z = 1 - ((landmark.z - z_min) / z_range)
@@ -168,12 +179,321 @@ def draw_pose(image, results, mp_holistic, mp_drawing):
     return image
 
 
+def get_task_models_dir() -> str:
+    """
+    Directory for downloaded MediaPipe Tasks model bundles.
+    
+    Blender's user data directory, so the models survive add-on updates and
+    don't need a writable add-on folder. Outside Blender, the user cache.
+    """
+    try:
+        import bpy
+        return bpy.utils.user_resource('DATAFILES', path=os.path.join("live_mocap", "models"))
+    except ImportError:
+        cache = os.environ.get('LOCALAPPDATA') or os.environ.get('XDG_CACHE_HOME') or \
+            os.path.join(os.path.expanduser("~"), ".cache")
+        return os.path.join(cache, "live_mocap", "models")
+
+
+# MediaPipe Tasks model bundles, downloaded on first use
+TASK_MODELS_DIR = get_task_models_dir()
+TASK_MODEL_DOWNLOAD_TIMEOUT = 10.0  # Seconds to connect, and without data, before a download fails
+_TASK_MODELS_URL = "https://storage.googleapis.com/mediapipe-models"
+TASK_MODEL_URLS = {
+    'pose_landmarker_lite': f"{_TASK_MODELS_URL}/pose_landmarker/pose_landmarker_lite/float16/latest/pose_landmarker_lite.task",
+    'pose_landmarker_full': f"{_TASK_MODELS_URL}/pose_landmarker/pose_landmarker_full/float16/latest/pose_landmarker_full.task",
+    'pose_landmarker_heavy': f"{_TASK_MODELS_URL}/pose_landmarker/pose_landmarker_heavy/float16/latest/pose_landmarker_heavy.task",
+    'hand_landmarker': f"{_TASK_MODELS_URL}/hand_landmarker/hand_landmarker/float16/latest/hand_landmarker.task",
+    'face_landmarker': f"{_TASK_MODELS_URL}/face_landmarker/face_landmarker/float16/latest/face_landmarker.task",
+}
+POSE_TASK_MODELS = ('pose_landmarker_lite', 'pose_landmarker_full', 'pose_landmarker_heavy')
+
+
+def get_task_model(name: str, timeout: float = TASK_MODEL_DOWNLOAD_TIMEOUT) -> str:
+    """
+    Get the path of a MediaPipe Tasks model bundle, downloading it if needed.
+    
+    Args:
+        name: Model name (key of TASK_MODEL_URLS)
+        timeout: Seconds to wait for the connection and for each read
+    
+    Returns:
+        Path to the .task file
+    
+    Raises:
+        OSError: If the model can't be downloaded or stored
+    """
+    path = os.path.join(TASK_MODELS_DIR, name + ".task")
+    if os.path.isfile(path):
+        return path
+    
+    os.makedirs(TASK_MODELS_DIR, exist_ok=True)
+    get_logger().info(f"Downloading MediaPipe model '{name}' to {TASK_MODELS_DIR}")
+    
+    # Download next to the final file, so an interrupted download is never used (one
+    # partial file per thread, in case a timed out capture start is still downloading)
+    partial_path = f"{path}.{threading.get_ident()}.part"
+    try:
+        with urllib.request.urlopen(TASK_MODEL_URLS[name], timeout=timeout) as response, \
+                open(partial_path, 'wb') as f:
+            shutil.copyfileobj(response, f, 1 << 20)
+        os.replace(partial_path, path)
+    except OSError:
+        if os.path.exists(partial_path):
+            os.remove(partial_path)
+        raise
+    return path
+
+
+def create_task_base_options(mp, model: str, delegate: str = 'CPU'):
+    """
+    Create Tasks BaseOptions for a model bundle.
+    
+    Args:
+        mp: mediapipe module
+        model: Model name (key of TASK_MODEL_URLS)
+        delegate: 'CPU', 'GPU' or 'XNNPACK' (XNNPACK is the Tasks CPU path)
+    
+    Returns:
+        mediapipe.tasks BaseOptions
+    """
+    base = mp.tasks.BaseOptions
+    return base(
+        model_asset_path=get_task_model(model),
+        delegate=base.Delegate.GPU if delegate == 'GPU' else base.Delegate.CPU
+    )
+
+
+def create_pose_landmarker(mp, running_mode: str = 'VIDEO', num_poses: int = 1,
+                           model_complexity: int = 2, delegate: str = 'CPU',
+                           min_detection_confidence: float = 0.5,
+                           min_presence_confidence: float = 0.5,
+                           min_tracking_confidence: float = 0.5,
+                           result_callback=None):
+    """
+    Create a MediaPipe Tasks PoseLandmarker.
+    
+    Args:
+        mp: mediapipe module
+        running_mode: 'IMAGE', 'VIDEO' or 'LIVE_STREAM'
+        num_poses: Maximum number of people to detect
+        model_complexity: 0=Lite, 1=Full, 2=Heavy model bundle
+        delegate: Inference delegate
+        min_detection_confidence: Minimum pose detection confidence
+        min_presence_confidence: Minimum pose presence confidence
+        min_tracking_confidence: Minimum tracking confidence
+        result_callback: Result listener (LIVE_STREAM only)
+    
+    Returns:
+        PoseLandmarker
+    """
+    vision = mp.tasks.vision
+    
+    def create(delegate):
+        options = vision.PoseLandmarkerOptions(
+            base_options=create_task_base_options(mp, POSE_TASK_MODELS[model_complexity], delegate),
+            running_mode=getattr(vision.RunningMode, running_mode),
+            num_poses=num_poses,
+            min_pose_detection_confidence=min_detection_confidence,
+            min_pose_presence_confidence=min_presence_confidence,
+            min_tracking_confidence=min_tracking_confidence,
+            result_callback=result_callback
+        )
+        return vision.PoseLandmarker.create_from_options(options)
+    
+    return create_with_fallback(create, delegate)
+
+
+def create_hand_landmarker(mp, running_mode: str = 'VIDEO', num_hands: int = 2,
+                           delegate: str = 'CPU', min_detection_confidence: float = 0.5,
+                           min_presence_confidence: float = 0.5,
+                           min_tracking_confidence: float = 0.5,
+                           result_callback=None):
+    """Create a MediaPipe Tasks HandLandmarker (arguments as create_pose_landmarker)."""
+    vision = mp.tasks.vision
+    
+    def create(delegate):
+        options = vision.HandLandmarkerOptions(
+            base_options=create_task_base_options(mp, 'hand_landmarker', delegate),
+            running_mode=getattr(vision.RunningMode, running_mode),
+            num_hands=num_hands,
+            min_hand_detection_confidence=min_detection_confidence,
+            min_hand_presence_confidence=min_presence_confidence,
+            min_tracking_confidence=min_tracking_confidence,
+            result_callback=result_callback
+        )
+        return vision.HandLandmarker.create_from_options(options)
+    
+    return create_with_fallback(create, delegate)
+
+
+def create_face_landmarker(mp, running_mode: str = 'VIDEO', num_faces: int = 1,
+                           delegate: str = 'CPU', min_detection_confidence: float = 0.5,
+                           min_presence_confidence: float = 0.5,
+                           min_tracking_confidence: float = 0.5,
+                           result_callback=None):
+    """Create a MediaPipe Tasks FaceLandmarker (arguments as create_pose_landmarker)."""
+    vision = mp.tasks.vision
+    
+    def create(delegate):
+        options = vision.FaceLandmarkerOptions(
+            base_options=create_task_base_options(mp, 'face_landmarker', delegate),
+            running_mode=getattr(vision.RunningMode, running_mode),
+            num_faces=num_faces,
+            min_face_detection_confidence=min_detection_confidence,
+            min_face_presence_confidence=min_presence_confidence,
+            min_tracking_confidence=min_tracking_confidence,
+            result_callback=result_callback
+        )
+        return vision.FaceLandmarker.create_from_options(options)
+    
+    return create_with_fallback(create, delegate)
+
+
+def create_with_fallback(create, delegate: str):
+    """
+    Create a Tasks landmarker, falling back to the CPU if the GPU delegate fails.
+    
+    Args:
+        create: Function creating the landmarker for a delegate
+        delegate: Requested inference delegate
+    
+    Returns:
+        Landmarker
+    """
+    if delegate != 'GPU':
+        return create(delegate)
+    try:
+        return create(delegate)
+    except (RuntimeError, NotImplementedError) as e:
+        get_logger().warning(f"GPU delegate unavailable ({str(e)}), using CPU")
+        return create('CPU')
+
+
 @dataclass
 class LandmarkResult:
     """Container for landmark detection results."""
     pose_landmarks: Optional[List] = None
     hand_landmarks: Optional[List] = None
     face_landmarks: Optional[List] = None
+    # Pose landmarks of every detected person (multi-person mode); pose_landmarks is the first
+    people: Optional[List] = None
+
+
+# Tasks results are plain landmark lists; wrapped so `.landmark` works like on solution results
+TaskLandmarkList = namedtuple('TaskLandmarkList', 'landmark')
+
+# Landmark of a region crop, mapped back to full-frame normalized coordinates
+CropLandmark = namedtuple('CropLandmark', 'x y z visibility')
+
+# Pose-guided regions of interest: pose landmarks (wrist, index, pinky) per hand
+HAND_ROI_LANDMARKS = {
+    'left': (15, 19, 17),
+    'right': (16, 20, 18),
+}
+# Nose, ears and eyes define the face region
+FACE_ROI_LANDMARKS = (0, 7, 8, 2, 5)
+# Square input the hand landmark and face mesh models run at
+HAND_ROI_SIZE = 224
+FACE_ROI_SIZE = 192
+# Region sizes relative to the wrist-to-knuckle distance and the ear-to-ear distance
+HAND_ROI_SCALE = 3.0
+FACE_ROI_SCALE = 2.0
+MIN_ROI_PIXELS = 32
+
+
+def pose_regions(pose_landmarks, width: int, height: int,
+                 min_visibility: float = 0.5) -> Dict[str, Optional[Tuple[int, int, int]]]:
+    """
+    Square hand and face regions from pose landmarks.
+    
+    Args:
+        pose_landmarks: 33 pose landmarks (normalized)
+        width: Frame width in pixels
+        height: Frame height in pixels
+        min_visibility: Regions whose landmarks are less visible are skipped
+    
+    Returns:
+        Dict with 'left', 'right' (hands) and 'face' regions as (x, y, size)
+        in pixels, None where the pose says the region is not visible
+    """
+    points = np.array(
+        [(lm.x * width, lm.y * height, getattr(lm, 'visibility', 1.0) or 0.0) for lm in pose_landmarks[:33]]
+    )
+    
+    def region(center, extent, indices):
+        if points[indices, 2].min() < min_visibility:
+            return None
+        if not (0 <= center[0] < width and 0 <= center[1] < height):
+            return None
+        size = max(int(extent), MIN_ROI_PIXELS)
+        return int(center[0]) - size // 2, int(center[1]) - size // 2, size
+    
+    regions = {}
+    for side, (wrist, index, pinky) in HAND_ROI_LANDMARKS.items():
+        # Palm center between the wrist and the knuckles, sized by the hand length
+        knuckles = (points[index, :2] + points[pinky, :2]) * 0.5
+        center = points[wrist, :2] + (knuckles - points[wrist, :2]) * 0.75
+        extent = HAND_ROI_SCALE * np.linalg.norm(knuckles - points[wrist, :2])
+        regions[side] = region(center, extent, [wrist, index, pinky])
+    
+    nose, left_ear, right_ear = FACE_ROI_LANDMARKS[:3]
+    extent = FACE_ROI_SCALE * np.linalg.norm(points[left_ear, :2] - points[right_ear, :2])
+    regions['face'] = region(points[nose, :2], extent, list(FACE_ROI_LANDMARKS))
+    return regions
+
+
+def crop_region(frame, region: Tuple[int, int, int], size: int, cv2) -> np.ndarray:
+    """
+    Cut a square region out of a frame and resize it to the model input.
+    
+    Parts of the region outside the frame are black.
+    
+    Args:
+        frame: (H, W, 3) image
+        region: (x, y, size) in pixels
+        size: Output edge length in pixels
+        cv2: OpenCV module
+    
+    Returns:
+        (size, size, 3) crop
+    """
+    x, y, extent = region
+    height, width = frame.shape[:2]
+    x0, y0 = max(x, 0), max(y, 0)
+    x1, y1 = min(x + extent, width), min(y + extent, height)
+    
+    if x0 == x and y0 == y and x1 == x + extent and y1 == y + extent:
+        crop = frame[y0:y1, x0:x1]
+    else:
+        crop = np.zeros((extent, extent, 3), dtype=frame.dtype)
+        crop[y0 - y:y1 - y, x0 - x:x1 - x] = frame[y0:y1, x0:x1]
+    return cv2.resize(crop, (size, size), interpolation=cv2.INTER_LINEAR)
+
+
+def map_region_landmarks(landmarks, region: Tuple[int, int, int], width: int, height: int) -> TaskLandmarkList:
+    """
+    Map landmarks detected on a region crop back to full-frame normalized coordinates.
+    
+    Args:
+        landmarks: Landmarks normalized to the crop
+        region: (x, y, size) of the crop in pixels
+        width: Frame width in pixels
+        height: Frame height in pixels
+    
+    Returns:
+        Landmark list with `.landmark` like solution results
+    """
+    x, y, extent = region
+    return TaskLandmarkList([
+        CropLandmark(
+            (x + lm.x * extent) / width,
+            (y + lm.y * extent) / height,
+            lm.z * extent / width,
+            getattr(lm, 'visibility', 1.0)
+        )
+        for lm in landmarks
+    ])
 
 
 class MediaPipeTrackers:
@@ -182,7 +502,9 @@ class MediaPipeTrackers:
     def __init__(self, use_pose: bool = True, use_hands: bool = False, 
                  use_face: bool = False, min_confidence: float = 0.5,
                  model_complexity: int = 2, min_tracking_confidence: float = 0.5,
-                 smooth_landmarks: bool = True):
+                 smooth_landmarks: bool = True, num_poses: int = 1,
+                 min_presence_confidence: float = 0.5, delegate: str = 'CPU',
+                 use_holistic: bool = False, use_roi_crops: bool = False):
         """
         Initialize MediaPipe trackers.
         
@@ -194,6 +516,16 @@ class MediaPipeTrackers:
             model_complexity: Model complexity (0=Lite, 1=Full, 2=Heavy)
             min_tracking_confidence: Minimum tracking confidence
             smooth_landmarks: Enable landmark smoothing
+            num_poses: Maximum number of people; more than one switches pose
+                       tracking to the multi-person Tasks PoseLandmarker
+            min_presence_confidence: Minimum pose presence confidence (multi-person)
+            delegate: Inference delegate of the Tasks PoseLandmarker (multi-person)
+            use_holistic: Track pose, hands and face with one Holistic graph,
+                          which crops hands and face from the pose instead of
+                          detecting them on the full frame (single person)
+            use_roi_crops: Run hand and face inference on crops around the
+                           pose wrists and nose, and skip it for regions the
+                           pose says are not visible (needs pose tracking)
         """
         self.use_pose = use_pose
         self.use_hands = use_hands
@@ -202,10 +534,23 @@ class MediaPipeTrackers:
         self.model_complexity = model_complexity
         self.min_tracking_confidence = min_tracking_confidence
         self.smooth_landmarks = smooth_landmarks
+        self.num_poses = num_poses
+        self.min_presence_confidence = min_presence_confidence
+        self.delegate = delegate
+        self.use_holistic = use_holistic
+        self.use_roi_crops = use_roi_crops
         
         self.pose = None
         self.hands = None
         self.face = None
+        self.roi_hands = None
+        self.roi_face = None
+        self.holistic = None
+        self.pose_landmarker = None
+        
+        self._mp = None
+        self._cv2 = None
+        self._last_timestamp_ms = -1
         
         self.logger = get_logger()
     
@@ -224,8 +569,34 @@ class MediaPipeTrackers:
             return False
         
         try:
-            # Initialize pose
-            if self.use_pose:
+            # One Holistic graph replaces the separate solutions
+            if self.is_holistic():
+                self.holistic = mp.solutions.holistic.Holistic(
+                    min_detection_confidence=self.min_confidence,
+                    min_tracking_confidence=self.min_tracking_confidence,
+                    model_complexity=self.model_complexity,
+                    smooth_landmarks=self.smooth_landmarks,
+                    refine_face_landmarks=False
+                )
+                self.logger.info("Holistic tracker initialized")
+                return True
+            
+            # Initialize pose (the legacy solution tracks a single person)
+            if self.use_pose and self.num_poses > 1:
+                self._mp = mp
+                self._last_timestamp_ms = -1
+                self.pose_landmarker = create_pose_landmarker(
+                    mp,
+                    running_mode='VIDEO',
+                    num_poses=self.num_poses,
+                    model_complexity=self.model_complexity,
+                    delegate=self.delegate,
+                    min_detection_confidence=self.min_confidence,
+                    min_presence_confidence=self.min_presence_confidence,
+                    min_tracking_confidence=self.min_tracking_confidence
+                )
+                self.logger.info(f"Multi-person pose tracker initialized (up to {self.num_poses} people)")
+            elif self.use_pose:
                 mp_pose = mp.solutions.pose
                 self.pose = mp_pose.Pose(
                     min_detection_confidence=self.min_confidence,
@@ -256,8 +627,27 @@ class MediaPipeTrackers:
                 )
                 self.logger.info("Face tracker initialized")
             
-            return True
+            # Crops change every frame, so the region models detect on every crop
+            if self.use_roi_crops and self.use_pose and (self.use_hands or self.use_face):
+                from ..runtime.dependency_check import safe_import_cv2
+                self._cv2 = safe_import_cv2()
+                if self.use_hands:
+                    self.roi_hands = mp.solutions.hands.Hands(
+                        static_image_mode=True,
+                        min_detection_confidence=self.min_confidence,
+                        max_num_hands=1
+                    )
+                if self.use_face:
+                    self.roi_face = mp.solutions.face_mesh.FaceMesh(
+                        static_image_mode=True,
+                        min_detection_confidence=self.min_confidence,
+                        max_num_faces=1,
+                        refine_landmarks=False
+                    )
+                self.logger.info("Pose-guided hand/face crops enabled")
             
+            return True
+        
         except Exception as e:
             self.logger.error(f"MediaPipe initialization failed: {str(e)}")
             return False
@@ -274,6 +664,9 @@ class MediaPipeTrackers:
         """
         result = LandmarkResult()
         
+        if self.holistic is not None:
+            return self.process_holistic(frame_rgb)
+        
         try:
             # Process pose
             if self.pose is not None:
@@ -281,6 +674,17 @@ class MediaPipeTrackers:
                 if pose_results.pose_landmarks:
                     result.pose_landmarks = pose_results.pose_landmarks.landmark
             
+            if self.pose_landmarker is not None:
+                people = self.detect_people(frame_rgb)
+                if people:
+                    result.people = people
+                    result.pose_landmarks = people[0]
+            
+            # Hands and face from crops around the pose, when there is one
+            if result.pose_landmarks and (self.roi_hands is not None or self.roi_face is not None):
+                self.process_regions(frame_rgb, result)
+                return result
+            
             # Process hands
             if self.hands is not None:
                 hand_results = self.hands.process(frame_rgb)
@@ -298,12 +702,115 @@ class MediaPipeTrackers:
         
         return result
     
+    def process_regions(self, frame_rgb, result: LandmarkResult):
+        """
+        Run hand and face inference on pose-guided crops.
+        
+        Regions the pose marks as not visible or outside the frame are
+        skipped without inference.
+        
+        Args:
+            frame_rgb: RGB frame from camera
+            result: Result holding the pose landmarks; hands and face are filled in
+        """
+        height, width = frame_rgb.shape[:2]
+        regions = pose_regions(result.pose_landmarks, width, height, self.min_confidence)
+        
+        if self.roi_hands is not None:
+            hands = []
+            for side in ('left', 'right'):
+                region = regions[side]
+                if region is None:
+                    continue
+                crop = crop_region(frame_rgb, region, HAND_ROI_SIZE, self._cv2)
+                hand_results = self.roi_hands.process(crop)
+                if hand_results.multi_hand_landmarks:
+                    hands.append(map_region_landmarks(
+                        hand_results.multi_hand_landmarks[0].landmark, region, width, height
+                    ))
+            result.hand_landmarks = hands or None
+        
+        if self.roi_face is not None and regions['face'] is not None:
+            crop = crop_region(frame_rgb, regions['face'], FACE_ROI_SIZE, self._cv2)
+            face_results = self.roi_face.process(crop)
+            if face_results.multi_face_landmarks:
+                result.face_landmarks = [map_region_landmarks(
+                    face_results.multi_face_landmarks[0].landmark, regions['face'], width, height
+                )]
+    
+    def is_holistic(self) -> bool:
+        """Check if the Holistic graph is used (pose plus hands or face, single person)."""
+        return self.use_holistic and self.use_pose and (self.use_hands or self.use_face) and self.num_poses == 1
+    
+    def process_holistic(self, frame_rgb) -> LandmarkResult:
+        """
+        Process a frame with the Holistic graph.
+        
+        Args:
+            frame_rgb: RGB frame from camera
+        
+        Returns:
+            LandmarkResult in the same layout as the separate solutions
+            (hands as a list of landmark lists, left hand first)
+        """
+        result = LandmarkResult()
+        
+        try:
+            results = self.holistic.process(frame_rgb)
+            if results.pose_landmarks:
+                result.pose_landmarks = results.pose_landmarks.landmark
+            
+            if self.use_hands:
+                hands = [hand for hand in (results.left_hand_landmarks, results.right_hand_landmarks) if hand]
+                result.hand_landmarks = hands or None
+            
+            if self.use_face and results.face_landmarks:
+                result.face_landmarks = [results.face_landmarks]
+        
+        except Exception as e:
+            self.logger.error(f"Frame processing error: {str(e)}")
+        
+        return result
+    
+    def detect_people(self, frame_rgb) -> List:
+        """
+        Detect the poses of several people with the Tasks PoseLandmarker.
+        
+        Args:
+            frame_rgb: RGB frame from camera
+        
+        Returns:
+            List of landmark lists, one per detected person
+        """
+        # VIDEO mode needs strictly increasing timestamps
+        timestamp_ms = max(int(time.perf_counter() * 1000), self._last_timestamp_ms + 1)
+        self._last_timestamp_ms = timestamp_ms
+        
+        image = self._mp.Image(image_format=self._mp.ImageFormat.SRGB, data=frame_rgb)
+        return self.pose_landmarker.detect_for_video(image, timestamp_ms).pose_landmarks
+    
     def cleanup(self):
         """Cleanup MediaPipe resources."""
         if self.pose is not None:
             self.pose.close()
             self.pose = None
         
+        if self.pose_landmarker is not None:
+            self.pose_landmarker.close()
+            self.pose_landmarker = None
+        
+        if self.holistic is not None:
+            self.holistic.close()
+            self.holistic = None
+        
+        if self.roi_hands is not None:
+            self.roi_hands.close()
+            self.roi_hands = None
+        
+        if self.roi_face is not None:
+            self.roi_face.close()
+            self.roi_face = None
+        
         if self.hands is not None:
             self.hands.close()
             self.hands = None
@@ -326,6 +833,339 @@ class MediaPipeTrackers:
         self.initialize()
 
 
+class TasksTrackers:
+    """
+    MediaPipe Tasks landmarkers running in LIVE_STREAM mode.
+    
+    Frames are handed to the pose, hand and face landmarkers with
+    detect_async, which returns immediately; MediaPipe runs inference on
+    its own threads and reports through result callbacks. The results of
+    the landmarkers for one frame are joined by timestamp and passed to
+    the result listener, so the caller can capture the next frame while
+    the previous one is still being inferred.
+    
+    process_frame keeps the blocking MediaPipeTrackers interface. Callers
+    that need one result per frame (offline processing) create the
+    trackers with live_stream=False, which runs the landmarkers in VIDEO
+    mode with detect_for_video instead and never drops frames.
+    """
+    
+    # Frames still waiting for results before the oldest is given up
+    MAX_PENDING = 8
+    
+    # Seconds between warnings while process_frame waits for a live stream
+    # result, and before it gives the frame up (a landmarker that drops a
+    # frame without a later one never reports it)
+    SLOW_RESULT_WARNING = 1.0
+    MAX_RESULT_WAIT = 30.0
+    
+    def __init__(self, use_pose: bool = True, use_hands: bool = False,
+                 use_face: bool = False, min_confidence: float = 0.5,
+                 model_complexity: int = 2, min_tracking_confidence: float = 0.5,
+                 num_poses: int = 1, min_presence_confidence: float = 0.5,
+                 delegate: str = 'CPU', live_stream: bool = True):
+        """
+        Initialize Tasks trackers.
+        
+        Args:
+            use_pose: Enable pose tracking
+            use_hands: Enable hand tracking
+            use_face: Enable face tracking
+            min_confidence: Minimum detection confidence
+            model_complexity: Pose model bundle (0=Lite, 1=Full, 2=Heavy)
+            min_tracking_confidence: Minimum tracking confidence
+            num_poses: Maximum number of people
+            min_presence_confidence: Minimum presence confidence
+            delegate: Inference delegate ('CPU', 'GPU' or 'XNNPACK')
+            live_stream: Run in LIVE_STREAM mode (submit + result listener);
+                         False runs the blocking VIDEO mode
+        """
+        self.use_pose = use_pose
+        self.use_hands = use_hands
+        self.use_face = use_face
+        self.min_confidence = min_confidence
+        self.model_complexity = model_complexity
+        self.min_tracking_confidence = min_tracking_confidence
+        self.num_poses = num_poses
+        self.min_presence_confidence = min_presence_confidence
+        self.delegate = delegate
+        self.live_stream = live_stream
+        
+        self.landmarkers = {}
+        self.dropped_frames = 0
+        self.logger = get_logger()
+        
+        self._mp = None
+        self._listener = None
+        self._lock = threading.Lock()
+        self._pending = {}
+        self._last_timestamp_ms = -1
+    
+    def initialize(self) -> bool:
+        """
+        Create the Tasks landmarkers.
+        
+        Returns:
+            True if initialization successful
+        """
+        from ..runtime.dependency_check import safe_import_mediapipe
+        mp = safe_import_mediapipe()
+        
+        if mp is None:
+            self.logger.error("MediaPipe not available")
+            return False
+        
+        self._mp = mp
+        self._pending = {}
+        self._last_timestamp_ms = -1
+        self.dropped_frames = 0
+        
+        options = dict(
+            running_mode='LIVE_STREAM' if self.live_stream else 'VIDEO',
+            delegate=self.delegate,
+            min_detection_confidence=self.min_confidence,
+            min_presence_confidence=self.min_presence_confidence,
+            min_tracking_confidence=self.min_tracking_confidence
+        )
+        mode = "live stream" if self.live_stream else "video"
+        
+        def callback(handler):
+            return handler if self.live_stream else None
+        
+        try:
+            if self.use_pose:
+                self.landmarkers['pose'] = create_pose_landmarker(
+                    mp, num_poses=self.num_poses, model_complexity=self.model_complexity,
+                    result_callback=callback(self._on_pose), **options
+                )
+                self.logger.info(f"Pose landmarker initialized ({mode})")
+            
+            if self.use_hands:
+                self.landmarkers['hands'] = create_hand_landmarker(
+                    mp, num_hands=2, result_callback=callback(self._on_hands), **options
+                )
+                self.logger.info(f"Hand landmarker initialized ({mode})")
+            
+            if self.use_face:
+                self.landmarkers['face'] = create_face_landmarker(
+                    mp, num_faces=1, result_callback=callback(self._on_face), **options
+                )
+                self.logger.info(f"Face landmarker initialized ({mode})")
+            
+            return True
+        
+        except Exception as e:
+            self.logger.error(f"MediaPipe Tasks initialization failed: {str(e)}")
+            self.cleanup()
+            return False
+    
+    @property
+    def is_async(self) -> bool:
+        """Whether frames can be submitted without waiting (LIVE_STREAM mode)."""
+        return self.live_stream
+    
+    def set_result_listener(self, listener):
+        """
+        Set the function receiving joined results.
+        
+        Args:
+            listener: Called as listener(context, LandmarkResult) from a
+                      MediaPipe thread, in frame order
+        """
+        self._listener = listener
+    
+    def submit(self, frame_rgb, context=None) -> bool:
+        """
+        Start inference on a frame without waiting for it.
+        
+        Args:
+            frame_rgb: RGB frame from camera
+            context: Passed back to the result listener with the result
+        
+        Returns:
+            True if the frame was submitted
+        """
+        if not self.landmarkers or not self.live_stream:
+            return False
+        
+        timestamp_ms = self._next_timestamp()
+        
+        with self._lock:
+            self._pending[timestamp_ms] = [context, LandmarkResult(), set(self.landmarkers)]
+            while len(self._pending) > self.MAX_PENDING:
+                self._pending.pop(min(self._pending))
+                self.dropped_frames += 1
+        
+        image = self._mp.Image(image_format=self._mp.ImageFormat.SRGB, data=frame_rgb)
+        for landmarker in self.landmarkers.values():
+            landmarker.detect_async(image, timestamp_ms)
+        return True
+    
+    def process_frame(self, frame_rgb) -> LandmarkResult:
+        """
+        Process a frame and wait for its landmarks.
+        
+        Args:
+            frame_rgb: RGB frame from camera
+        
+        Returns:
+            LandmarkResult containing detected landmarks (empty in live
+            stream mode if the landmarkers dropped the frame)
+        """
+        if not self.live_stream:
+            return self._process_video_frame(frame_rgb)
+        
+        done = threading.Event()
+        results = []
+        listener = self._listener
+        
+        def receive(context, result):
+            if context is done:
+                results.append(result)
+                done.set()
+            elif listener is not None:
+                listener(context, result)
+        
+        self._listener = receive
+        try:
+            if self.submit(frame_rgb, done):
+                timestamp_ms = self._last_timestamp_ms
+                waited = 0.0
+                
+                # Wait as long as the frame is pending; it only leaves the
+                # pending frames with its result or when it's dropped
+                while not done.wait(self.SLOW_RESULT_WARNING):
+                    waited += self.SLOW_RESULT_WARNING
+                    with self._lock:
+                        pending = timestamp_ms in self._pending
+                        if pending and waited >= self.MAX_RESULT_WAIT:
+                            del self._pending[timestamp_ms]
+                            self.dropped_frames += 1
+                            pending = False
+                    if not pending:
+                        break
+                    self.logger.warning(f"MediaPipe Tasks result still pending after {waited:.0f}s")
+                
+                if not done.is_set():
+                    self.logger.warning(f"MediaPipe Tasks dropped a frame ({self.dropped_frames} dropped so far)")
+        finally:
+            self._listener = listener
+        return results[0] if results else LandmarkResult()
+    
+    def _process_video_frame(self, frame_rgb) -> LandmarkResult:
+        """Run all landmarkers on a frame in VIDEO mode (blocking)."""
+        result = LandmarkResult()
+        if not self.landmarkers:
+            return result
+        
+        timestamp_ms = self._next_timestamp()
+        image = self._mp.Image(image_format=self._mp.ImageFormat.SRGB, data=frame_rgb)
+        
+        if 'pose' in self.landmarkers:
+            self._set_landmarks(result, 'pose', self.landmarkers['pose'].detect_for_video(image, timestamp_ms))
+        if 'hands' in self.landmarkers:
+            self._set_landmarks(result, 'hands', self.landmarkers['hands'].detect_for_video(image, timestamp_ms))
+        if 'face' in self.landmarkers:
+            self._set_landmarks(result, 'face', self.landmarkers['face'].detect_for_video(image, timestamp_ms))
+        return result
+    
+    def _next_timestamp(self) -> int:
+        """Timestamp in ms for the next frame (both modes need strictly increasing timestamps)."""
+        timestamp_ms = max(int(time.perf_counter() * 1000), self._last_timestamp_ms + 1)
+        self._last_timestamp_ms = timestamp_ms
+        return timestamp_ms
+    
+    @staticmethod
+    def _landmarks_of(name: str, result) -> dict:
+        """LandmarkResult fields of one landmarker's result."""
+        if name == 'pose':
+            people = result.pose_landmarks
+            return dict(people=people or None, pose_landmarks=people[0] if people else None)
+        if name == 'hands':
+            hands = [TaskLandmarkList(landmarks) for landmarks in result.hand_landmarks]
+            return dict(hand_landmarks=hands or None)
+        faces = [TaskLandmarkList(landmarks) for landmarks in result.face_landmarks]
+        return dict(face_landmarks=faces or None)
+    
+    def _set_landmarks(self, target: LandmarkResult, name: str, result):
+        for key, value in self._landmarks_of(name, result).items():
+            setattr(target, key, value)
+    
+    def _on_pose(self, result, image, timestamp_ms):
+        self._complete('pose', timestamp_ms, **self._landmarks_of('pose', result))
+    
+    def _on_hands(self, result, image, timestamp_ms):
+        self._complete('hands', timestamp_ms, **self._landmarks_of('hands', result))
+    
+    def _on_face(self, result, image, timestamp_ms):
+        self._complete('face', timestamp_ms, **self._landmarks_of('face', result))
+    
+    def _complete(self, name: str, timestamp_ms: int, **landmarks):
+        """Store one landmarker's result and pass on frames all landmarkers have finished."""
+        ready = []
+        with self._lock:
+            entry = self._pending.get(timestamp_ms)
+            if entry is None:
+                return
+            
+            for key, value in landmarks.items():
+                setattr(entry[1], key, value)
+            entry[2].discard(name)
+            
+            # Results arrive in order, so older frames still waiting on this
+            # landmarker were dropped by it
+            for pending_time in sorted(self._pending):
+                if pending_time > timestamp_ms:
+                    break
+                pending = self._pending[pending_time]
+                if pending_time < timestamp_ms and name in pending[2]:
+                    del self._pending[pending_time]
+                    self.dropped_frames += 1
+                elif not pending[2]:
+                    del self._pending[pending_time]
+                    ready.append(pending)
+            
+            # Still under the lock, so frames reach the listener in order
+            listener = self._listener
+            if listener is not None:
+                for context, result, _ in ready:
+                    listener(context, result)
+    
+    def cleanup(self):
+        """Close the landmarkers (waits for inference in flight)."""
+        for landmarker in self.landmarkers.values():
+            landmarker.close()
+        self.landmarkers = {}
+        with self._lock:
+            self._pending = {}
+        self.logger.info("MediaPipe Tasks trackers cleaned up")
+
+
+def create_trackers(backend: str = 'SOLUTIONS', **options):
+    """
+    Create the trackers of a backend.
+    
+    Args:
+        backend: 'SOLUTIONS' (legacy blocking solutions) or 'TASKS'
+                 (Tasks landmarkers in live stream mode)
+        **options: Tracker options (smooth_landmarks, use_holistic and
+                   use_roi_crops apply to SOLUTIONS only, live_stream to
+                   TASKS only)
+    
+    Returns:
+        Uninitialized MediaPipeTrackers or TasksTrackers
+    """
+    if backend == 'TASKS':
+        options.pop('smooth_landmarks', None)
+        options.pop('use_holistic', None)
+        options.pop('use_roi_crops', None)
+        return TasksTrackers(**options)
+    if backend == 'SOLUTIONS':
+        options.pop('live_stream', None)
+        return MediaPipeTrackers(**options)
+    raise ValueError(f"Unknown tracker backend '{backend}'")
+
+
 def get_landmark_name(index: int) -> str:
     """Get landmark name from index."""
     return POSE_LANDMARK_NAMES.get(index, f"LANDMARK_{index}")
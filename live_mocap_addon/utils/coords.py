@@ -3,7 +3,8 @@ Coordinate transformation utilities for different spaces.
 """
 
 from mathutils import Vector, Matrix, Quaternion
-from typing import Tuple
+from typing import Tuple, Optional
+import numpy as np
 
 
 def world_to_local(world_pos: Vector, parent_matrix: Matrix) -> Vector:
@@ -195,3 +196,209 @@ def quaternion_from_two_vectors(vec_from: Vector, vec_to: Vector) -> Quaternion:
     angle = vec_from.angle(vec_to)
     
     return Quaternion(axis, angle)
+
+
+# ========== Batched (NumPy) variants ==========
+# The functions below mirror the scalar mathutils functions above for
+# (B, 3) arrays, so all mapped bones of a frame (or all frames of a clip)
+# can be solved in one call. Quaternions are returned as (B, 4) arrays in
+# Blender's (w, x, y, z) order.
+
+
+def _safe_normalize(vectors: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Normalize rows, leaving zero-length rows at zero (like Vector.normalized()).
+    
+    Args:
+        vectors: (B, 3) array
+    
+    Returns:
+        Tuple of (normalized_vectors, lengths)
+    """
+    lengths = np.linalg.norm(vectors, axis=-1)
+    safe = np.where(lengths > 0.0, lengths, 1.0)
+    return vectors / safe[..., np.newaxis], lengths
+
+
+def matrices_to_quaternions(right: np.ndarray, forward: np.ndarray,
+                            up: np.ndarray) -> np.ndarray:
+    """
+    Convert rotation matrices given by their columns to quaternions.
+    
+    Uses the same branch selection as Blender's matrix to quaternion
+    conversion, including the non-negative W canonical form.
+    
+    Args:
+        right: (B, 3) first matrix column
+        forward: (B, 3) second matrix column
+        up: (B, 3) third matrix column
+    
+    Returns:
+        (B, 4) quaternions (w, x, y, z)
+    """
+    # m[column][row] naming, as in Blender's C code
+    m00, m01, m02 = right[:, 0], right[:, 1], right[:, 2]
+    m10, m11, m12 = forward[:, 0], forward[:, 1], forward[:, 2]
+    m20, m21, m22 = up[:, 0], up[:, 1], up[:, 2]
+    
+    quats = np.empty((len(right), 4), dtype=np.float64)
+    
+    branch_x = (m22 < 0.0) & (m00 > m11)
+    branch_y = (m22 < 0.0) & ~branch_x
+    branch_z = (m22 >= 0.0) & (m00 < -m11)
+    branch_w = ~(branch_x | branch_y | branch_z)
+    
+    # X is the largest component
+    if branch_x.any():
+        b = branch_x
+        s = 2.0 * np.sqrt(np.maximum(1.0 + m00[b] - m11[b] - m22[b], 0.0))
+        s = np.where(m12[b] < m21[b], -s, s)
+        inv = 1.0 / np.where(s != 0.0, s, 1.0)
+        quats[b, 1] = 0.25 * s
+        quats[b, 0] = (m12[b] - m21[b]) * inv
+        quats[b, 2] = (m01[b] + m10[b]) * inv
+        quats[b, 3] = (m20[b] + m02[b]) * inv
+    
+    # Y is the largest component
+    if branch_y.any():
+        b = branch_y
+        s = 2.0 * np.sqrt(np.maximum(1.0 - m00[b] + m11[b] - m22[b], 0.0))
+        s = np.where(m20[b] < m02[b], -s, s)
+        inv = 1.0 / np.where(s != 0.0, s, 1.0)
+        quats[b, 2] = 0.25 * s
+        quats[b, 0] = (m20[b] - m02[b]) * inv
+        quats[b, 1] = (m01[b] + m10[b]) * inv
+        quats[b, 3] = (m12[b] + m21[b]) * inv
+    
+    # Z is the largest component
+    if branch_z.any():
+        b = branch_z
+        s = 2.0 * np.sqrt(np.maximum(1.0 - m00[b] - m11[b] + m22[b], 0.0))
+        s = np.where(m01[b] < m10[b], -s, s)
+        inv = 1.0 / np.where(s != 0.0, s, 1.0)
+        quats[b, 3] = 0.25 * s
+        quats[b, 0] = (m01[b] - m10[b]) * inv
+        quats[b, 1] = (m20[b] + m02[b]) * inv
+        quats[b, 2] = (m12[b] + m21[b]) * inv
+    
+    # W is the largest component
+    if branch_w.any():
+        b = branch_w
+        s = 2.0 * np.sqrt(np.maximum(1.0 + m00[b] + m11[b] + m22[b], 0.0))
+        inv = 1.0 / np.where(s != 0.0, s, 1.0)
+        quats[b, 0] = 0.25 * s
+        quats[b, 1] = (m12[b] - m21[b]) * inv
+        quats[b, 2] = (m20[b] - m02[b]) * inv
+        quats[b, 3] = (m01[b] - m10[b]) * inv
+    
+    quats, lengths = _safe_normalize(quats)
+    quats[lengths == 0.0] = (1.0, 0.0, 0.0, 0.0)
+    return quats
+
+
+def compute_bone_directions(start_positions: np.ndarray,
+                            end_positions: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Batched compute_bone_direction.
+    
+    Args:
+        start_positions: (B, 3) start positions
+        end_positions: (B, 3) end positions
+    
+    Returns:
+        Tuple of ((B, 3) directions, (B,) lengths). Rows shorter than
+        0.001 get direction (0, 1, 0) and length 0.
+    """
+    delta = np.asarray(end_positions, dtype=np.float64) - np.asarray(start_positions, dtype=np.float64)
+    directions, lengths = _safe_normalize(delta.reshape(-1, 3))
+    
+    degenerate = lengths < 0.001
+    directions[degenerate] = (0.0, 1.0, 0.0)
+    lengths = np.where(degenerate, 0.0, lengths)
+    return directions, lengths
+
+
+def directions_to_quaternions(directions: np.ndarray,
+                              up_hints: Optional[np.ndarray] = None) -> np.ndarray:
+    """
+    Batched direction_to_quaternion.
+    
+    Args:
+        directions: (B, 3) target directions
+        up_hints: Optional (3,) or (B, 3) up vectors for twist control
+    
+    Returns:
+        (B, 4) quaternions (w, x, y, z). Directions shorter than 0.001
+        give the identity rotation.
+    """
+    directions = np.asarray(directions, dtype=np.float64).reshape(-1, 3)
+    count = len(directions)
+    
+    forward, lengths = _safe_normalize(directions)
+    valid = lengths >= 0.001
+    
+    if up_hints is None:
+        up_hint = np.broadcast_to(np.array((0.0, 0.0, 1.0)), (count, 3))
+    else:
+        up_hint = np.broadcast_to(np.asarray(up_hints, dtype=np.float64), (count, 3))
+        up_hint, _ = _safe_normalize(up_hint)
+    
+    right = np.cross(forward, up_hint)
+    right_lengths = np.linalg.norm(right, axis=-1)
+    
+    # Handle parallel vectors
+    parallel = right_lengths < 0.001
+    if parallel.any():
+        alternate = np.where(
+            (np.abs(up_hint[parallel, 0]) < 0.9)[:, np.newaxis],
+            np.array((1.0, 0.0, 0.0)),
+            np.array((0.0, 1.0, 0.0))
+        )
+        right[parallel] = np.cross(forward[parallel], alternate)
+    
+    right, _ = _safe_normalize(right)
+    up, _ = _safe_normalize(np.cross(right, forward))
+    
+    quats = matrices_to_quaternions(right, forward, up)
+    quats[~valid] = (1.0, 0.0, 0.0, 0.0)
+    return quats
+
+
+def quaternions_from_two_vectors(vec_from: np.ndarray, vec_to: np.ndarray) -> np.ndarray:
+    """
+    Batched quaternion_from_two_vectors.
+    
+    Args:
+        vec_from: (B, 3) source directions
+        vec_to: (B, 3) target directions
+    
+    Returns:
+        (B, 4) quaternions (w, x, y, z) rotating vec_from onto vec_to.
+        Rows with a zero-length vector give the identity rotation (the
+        scalar version raises there).
+    """
+    vec_from, from_lengths = _safe_normalize(np.asarray(vec_from, dtype=np.float64).reshape(-1, 3))
+    vec_to, to_lengths = _safe_normalize(np.asarray(vec_to, dtype=np.float64).reshape(-1, 3))
+    
+    dot = np.einsum('ij,ij->i', vec_from, vec_to)
+    axis, _ = _safe_normalize(np.cross(vec_from, vec_to))
+    angle = np.arccos(np.clip(dot, -1.0, 1.0))
+    
+    # 180 degree rotation - find perpendicular axis
+    opposite = dot < -0.9999
+    if opposite.any():
+        helper = np.where(
+            (np.abs(vec_from[opposite, 0]) < 0.9)[:, np.newaxis],
+            np.array((1.0, 0.0, 0.0)),
+            np.array((0.0, 1.0, 0.0))
+        )
+        axis[opposite], _ = _safe_normalize(np.cross(vec_from[opposite], helper))
+        angle[opposite] = 3.14159265
+    
+    half = angle * 0.5
+    quats = np.empty((len(vec_from), 4), dtype=np.float64)
+    quats[:, 0] = np.cos(half)
+    quats[:, 1:] = axis * np.sin(half)[:, np.newaxis]
+    
+    quats[(dot > 0.9999) | (from_lengths == 0.0) | (to_lengths == 0.0)] = (1.0, 0.0, 0.0, 0.0)
+    return quats
@@ -16,6 +16,8 @@ if "bpy" not in locals():
     from . import fbx_patcher
     from . import login_manager
     from . import live_data_manager
+    from . import jitter_buffer
+    from . import subscriptions
 else:
     import importlib
     importlib.reload(library_manager)
@@ -34,3 +36,5 @@ else:
     importlib.reload(fbx_patcher)
     importlib.reload(login_manager)
     importlib.reload(live_data_manager)
+    importlib.reload(jitter_buffer)
+    importlib.reload(subscriptions)
@@ -1,31 +1,49 @@
 import bpy
+import numpy as np
 from mathutils import Quaternion, Matrix
 
-from . import animation_lists, recorder
+from . import animation_lists, recorder, subscriptions
 from .live_data_manager import LiveData
 
-live_data: LiveData = LiveData()
+live_data: LiveData = LiveData(bone_names=animation_lists.get_bones().keys(), shape_names=animation_lists.face_shapes)
+
+# Precomputed retargeting data of each animated armature: {obj_name: ActorSolve}
+actor_solves = {}
+
+# Precomputed shapekey mapping of each animated face: {obj_name: FaceSolve}
+face_solves = {}
+
+# Mirrors wxyz rotations from Studio to Blender space, the remaining rotation is part of each bones offset
+STUDIO_TO_BLENDER_ROTATION = np.array((1, 1, -1, -1), dtype=np.float64)
 
 
 def clear_animations():
     live_data.clear_data()
+    clear_actor_solves()
+    clear_face_solves()
 
 
 def animate():
+    if not live_data.frame:
+        return
 
-    for obj in bpy.data.objects:
-        # Animate all trackers and props
-        if live_data.props or live_data.trackers:
+    # Only go over the objects bound to the live data in this packet
+    subscriptions.ensure_index(live_data.frame)
+
+    # Animate all trackers and props
+    for prop_id in live_data.frame.prop_index:
+        for obj in subscriptions.get_bound_objects('props_trackers', prop_id):
             animate_tracker_prop(obj)
 
-        # Animate all faces
-        if obj.type == 'MESH' and live_data.faces:
+    # Animate all faces
+    for face_id in live_data.frame.face_index:
+        for obj in subscriptions.get_bound_objects('faces', face_id):
             animate_face(obj)
 
-        # Animate all actors
-        elif obj.type == 'ARMATURE':
-            if live_data.actors:
-                animate_actor(obj)
+    # Animate all actors
+    for actor_id in live_data.frame.actor_index:
+        for obj in subscriptions.get_bound_objects('actors', actor_id):
+            animate_actor(obj)
 
 
 def animate_tracker_prop(obj):
@@ -33,8 +51,8 @@ def animate_tracker_prop(obj):
         return
 
     # Get prop
-    prop = live_data.get_prop_by_obj(obj)
-    if not prop:
+    prop_i = live_data.get_prop_index(obj)
+    if prop_i is None:
         return
 
     # Get the scene scaling
@@ -44,17 +62,8 @@ def animate_tracker_prop(obj):
 
     # Set the transforms of the object
     obj.rotation_mode = 'QUATERNION'
-    obj.location = pos_studio_to_blender(
-        prop['position']['x'] * scene_scale,
-        prop['position']['y'] * scene_scale,
-        prop['position']['z'] * scene_scale,
-    )
-    obj.rotation_quaternion = rot_studio_to_blender(
-        prop['rotation']['w'],
-        prop['rotation']['x'],
-        prop['rotation']['y'],
-        prop['rotation']['z'],
-    )
+    obj.location = pos_studio_to_blender(*(live_data.frame.prop_positions[prop_i] * scene_scale).tolist())
+    obj.rotation_quaternion = rot_studio_to_blender(*live_data.frame.prop_rotations[prop_i].tolist())
 
     # Record data
     if bpy.context.scene.rsl_recording:
@@ -68,21 +77,75 @@ def animate_face(obj):
         return
 
     # Get the face live data
-    face = live_data.get_face_by_obj(obj)
-    if not face:
+    face_i = live_data.get_face_index(obj)
+    if face_i is None:
+        return
+
+    # Get the precomputed shapekey mapping of this mesh
+    solve = get_face_solve(obj)
+    if not solve.shape_indices.size:
         return
 
-    # Set each assigned shapekey to the value of it's according live data value
-    for shapekey_name in animation_lists.face_shapes:
-        # Get assigned shapekey
-        shapekey = obj.data.shape_keys.key_blocks.get(getattr(obj, 'rsl_face_' + shapekey_name))
-        if shapekey:
-            shapekey.slider_min = -1
-            shapekey.value = face[shapekey_name] / 100
+    # Set all assigned shapekeys to the value of their according live data value at once
+    key_blocks = obj.data.shape_keys.key_blocks
+    key_blocks.foreach_get('value', solve.values)
+    solve.values[solve.key_indices] = live_data.frame.face_values[face_i, solve.shape_indices]
+    key_blocks.foreach_set('value', solve.values)
+    obj.data.shape_keys.update_tag()
+
+    if bpy.context.scene.rsl_recording:
+        for shapekey_name, value in zip(solve.shape_names, solve.values[solve.key_indices].tolist()):
+            recorder.record_face(live_data.timestamp, obj.name, shapekey_name, value)
+
+
+class FaceSolve:
+    """Mapping from the live data face shapes to the shapekeys of one mesh."""
+
+    def __init__(self, obj):
+        shape_keys = obj.data.shape_keys
+        key_blocks = shape_keys.key_blocks
+        self.shape_keys_pointer = shape_keys.as_pointer()
+        self.key_count = len(key_blocks)
+
+        # Current values of all shapekeys, the assigned ones get overwritten with the live data
+        self.values = np.zeros(self.key_count, dtype=np.float32)
 
-            if bpy.context.scene.rsl_recording:
-                # shapekey.keyframe_insert(data_path='value', group=obj.name)
-                recorder.record_face(live_data.timestamp, obj.name, shapekey_name, shapekey.value)
+        # Index of each assigned shape in the live data and of its shapekey in key_blocks
+        shape_indices = []
+        key_indices = []
+        self.shape_names = []
+        key_index = {key_block.name: i for i, key_block in enumerate(key_blocks)}
+        for shape_i, shapekey_name in enumerate(animation_lists.face_shapes):
+            key_i = key_index.get(getattr(obj, 'rsl_face_' + shapekey_name))
+            if key_i is None:
+                continue
+
+            key_blocks[key_i].slider_min = -1
+            shape_indices.append(shape_i)
+            key_indices.append(key_i)
+            self.shape_names.append(shapekey_name)
+
+        self.shape_indices = np.array(shape_indices, dtype=np.int64)
+        self.key_indices = np.array(key_indices, dtype=np.int64)
+
+    def is_valid(self, obj):
+        shape_keys = obj.data.shape_keys
+        return shape_keys.as_pointer() == self.shape_keys_pointer and len(shape_keys.key_blocks) == self.key_count
+
+
+def get_face_solve(obj):
+    solve = face_solves.get(obj.name)
+    if solve is None or not solve.is_valid(obj):
+        solve = face_solves[obj.name] = FaceSolve(obj)
+    return solve
+
+
+def clear_face_solves(obj_name=None):
+    # Call this when the shapekey assignment of a mesh changes
+    if obj_name is None:
+        face_solves.clear()
+    else:
+        face_solves.pop(obj_name, None)
 
 
 def animate_actor(obj):
@@ -91,71 +154,93 @@ def animate_actor(obj):
         return
 
     # Get the actor data assigned to the object
-    actor = live_data.get_actor_by_obj(obj)
-    if not actor:
+    actor_i = live_data.get_actor_index(obj)
+    if actor_i is None:
         return
 
-    # Get current custom data from this object
-    # The models t-pose bone rotations and locations, which are set by the user, are stored inside this custom data
-    custom_data = obj.get('CUSTOM')
-    if not custom_data:
-        # print('NO CUSTOM DATA')
+    # Get the precomputed retargeting data of this armature
+    solve = get_actor_solve(obj, live_data.has_gloves(live_data.actors[actor_i]))
+    if not solve.bones:
         return
 
-    # Get tpose data from custom data
-    tpose_bones = custom_data.get('rsl_tpose_bones')
-    if not tpose_bones:
-        # print('NO TPOSE DATA')
-        return
+    # The live bone rotations of this actor, already mirrored from Studio to Blender space
+    frame = live_data.frame
+    rotations = (frame.bone_rotations[actor_i] * STUDIO_TO_BLENDER_ROTATION).tolist()
+    valid = frame.bone_valid[actor_i]
+    recording = bpy.context.scene.rsl_recording
 
     # Go over every mapped bone and animate it
-    # bone_name:                    Name if the bone
-    # studio_reference_tpose_rot:   Studios reference t-pose rotation (still in Studio space)
-    for bone_name, studio_reference_tpose_rot in animation_lists.get_bones(with_gloves=live_data.has_gloves(actor)).items():
-
-        # Gets the name of the bone assigned to this bone live data
-        bone_name_assigned = getattr(obj, 'rsl_actor_' + bone_name)
-
-        # Gets the assigned pose bone and it's tpose data set by the user
-        bone = obj.pose.bones.get(bone_name_assigned)
-        bone_data = obj.data.bones.get(bone_name_assigned)
-        bone_tpose_data = tpose_bones.get(bone_name_assigned)
-
-        try:
-            actor_bone_data = actor[bone_name] if live_data.version <= 2 else actor['body'][bone_name]
-        except KeyError:
+    # bone_name:            Name if the bone
+    # bone_i:               Index of the bone in the live data arrays
+    # bone_name_assigned:   Name of the bone assigned to this bone live data
+    # rot_offset:           Offset from Studios reference t-pose to the models t-pose in target space
+    pose_bones = obj.pose.bones
+    for bone_name, bone_i, bone_name_assigned, rot_offset in solve.bones:
+        if not valid[bone_i]:
             print('Bone not found in live data:', bone_name)
             continue
 
-        # Skip if there is no bone assigned to this live data or if there is no tpose data for this bone
-        if not bone or not bone_tpose_data:
+        # Pose bones are looked up every packet, references to them don't survive undo or renaming
+        bone = pose_bones.get(bone_name_assigned)
+        if bone is None:
             continue
 
-        # Set the bones rotation mode to euler and disable inherit rotation
-        if bone.rotation_mode == 'QUATERNION':
-            bone.rotation_mode = 'XYZ'
-        bone_data.use_inherit_rotation = False
+        # Add the t-pose offset to the new pose and transform it back from target space
+        final_rot = solve.rot_transform_back @ Quaternion(rotations[bone_i]) @ rot_offset
 
-        # The global rotation of the models t-pose, which was set by the user
-        bone_tpose_rot_global = Quaternion(bone_tpose_data['rotation_global'])
+        # Set final bone matrix, keeping the bones location
+        matrix = final_rot.to_matrix().to_4x4()
+        matrix.translation = bone.matrix.translation
+        bone.matrix = matrix
 
-        # The new pose in which the bone should be (still in Studio space)
-        studio_new_pose = Quaternion((
-            float(actor_bone_data['rotation']['w']),
-            float(actor_bone_data['rotation']['x']),
-            float(actor_bone_data['rotation']['y']),
-            float(actor_bone_data['rotation']['z']),
-        ))
+        # If hips bone, set its position
+        if bone_name == 'hip':
+            # Get scale of studio model
+            studio_hip_height = float(frame.hip_heights[actor_i])
+            tpose_hip_location_y = solve.tpose_hip_height
+            x, y, z = frame.bone_positions[actor_i, bone_i].tolist()
+
+            location_new = pos_hips_studio_to_blender(
+                x * tpose_hip_location_y / studio_hip_height,
+                y * tpose_hip_location_y - tpose_hip_location_y * studio_hip_height,
+                z * tpose_hip_location_y / studio_hip_height)
+
+            bone.location = location_new
+
+        # Record the data
+        if recording:
+            recorder.record_bone(live_data.timestamp, obj.name, bone_name_assigned, bone.rotation_euler, location=bone.location if bone_name == 'hip' else None)
+
+
+class ActorSolve:
+    """Retargeting data of one armature that only changes with its t-pose, bone assignment or object transform."""
+
+    def __init__(self, obj, with_gloves, bone_index):
+        self.with_gloves = with_gloves
+        self.matrix_local = obj.matrix_local.copy()
+        self.bone_count = len(obj.pose.bones)
+
+        # Undo, or a different armature under the same object name, reallocates the pose and armature data
+        self.pose_pointer = obj.pose.as_pointer()
+        self.data_pointer = obj.data.as_pointer()
 
-        # Function to convert from Studio to Blender space
-        def rot_to_blender(rot):
-            return Quaternion((
-                rot.w,
-                rot.x,
-                -rot.y,
-                -rot.z,
-            )) @ Quaternion((0, 0, 0, 1))
+        # (bone_name, bone index in the live data arrays, bone_name_assigned, rotation offset) for each mapped bone
+        self.bones = []
+        self.rot_transform_back = Quaternion()
+        self.tpose_hip_height = 0
 
+        # Get current custom data from this object
+        # The models t-pose bone rotations and locations, which are set by the user, are stored inside this custom data
+        custom_data = obj.get('CUSTOM')
+        if not custom_data:
+            return
+
+        # Get tpose data from custom data
+        tpose_bones = custom_data.get('rsl_tpose_bones')
+        if not tpose_bones:
+            return
+
+        # Rotation from Blender space into the space of the object
         mat_obj = obj.matrix_local.decompose()[1].to_matrix().to_4x4()
         mat_default = Matrix((
             (1, 0, 0, 0),
@@ -164,60 +249,70 @@ def animate_actor(obj):
             (0, 0, 0, 1)
         ))
         rot_transform = (mat_default.inverted() @ mat_obj).to_quaternion()
+        self.rot_transform_back = rot_transform.inverted()
 
-        def transform(rot):
-            return rot_transform @ rot
+        # studio_reference_tpose_rot: Studios reference t-pose rotation (still in Studio space)
+        for bone_name, studio_reference_tpose_rot in animation_lists.get_bones(with_gloves=with_gloves).items():
 
-        def transform_back(rot):
-            return rot_transform.inverted() @ rot
+            # Gets the assigned pose bone and it's tpose data set by the user
+            bone_name_assigned = getattr(obj, 'rsl_actor_' + bone_name)
+            bone = obj.pose.bones.get(bone_name_assigned)
+            bone_data = obj.data.bones.get(bone_name_assigned)
+            bone_tpose_data = tpose_bones.get(bone_name_assigned)
 
-        # Transform rotation matrix of tpose to target space
-        bone_tpose_rot_global = transform(bone_tpose_rot_global)
+            # Skip if there is no bone assigned to this live data or if there is no tpose data for this bone
+            if not bone or not bone_tpose_data:
+                continue
 
-        # Calculate bone offset from tpose and add it to live data rotation
-        rot_offset_ref = rot_to_blender(studio_reference_tpose_rot).inverted() @ bone_tpose_rot_global
-        final_rot = rot_to_blender(studio_new_pose) @ rot_offset_ref
+            # Set the bones rotation mode to euler and disable inherit rotation
+            if bone.rotation_mode == 'QUATERNION':
+                bone.rotation_mode = 'XYZ'
+            bone_data.use_inherit_rotation = False
 
-        # Transform rotation matrix back from target space
-        final_rot = transform_back(final_rot)
+            # The global rotation of the models t-pose, which was set by the user, transformed to target space
+            bone_tpose_rot_global = rot_transform @ Quaternion(bone_tpose_data['rotation_global'])
 
-        # Set new bone rotation
-        orig_loc, _, _ = bone.matrix.decompose()
-        orig_loc_mat = Matrix.Translation(orig_loc)
-        rotation_mat = final_rot.to_matrix().to_4x4()
+            # Calculate bone offset from tpose. The Studio to Blender conversion of the live rotation ends with a
+            # rotation around z, which is folded into the offset as well
+            rot_offset_ref = rot_to_blender(studio_reference_tpose_rot).inverted() @ bone_tpose_rot_global
+            rot_offset = Quaternion((0, 0, 0, 1)) @ rot_offset_ref
 
-        # Set final bone matrix
-        bone.matrix = orig_loc_mat @ rotation_mat
+            self.bones.append((bone_name, bone_index[bone_name], bone_name_assigned, rot_offset))
 
-        # If hips bone, set its position
-        if bone_name == 'hip':
-            # Get correct space of hips location
-            axis = 0
-            multiplier = 1
-            if round(mat_obj[2][0], 0) == round(mat_obj[2][2], 0) == 0:
-                axis = 1
-                multiplier = mat_obj[2][1]
-            if round(mat_obj[2][0], 0) == round(mat_obj[2][1], 0) == 0:
-                axis = 2
-                multiplier = mat_obj[2][2]
+            if bone_name == 'hip':
+                # Get correct space of hips location
+                axis = 0
+                multiplier = 1
+                if round(mat_obj[2][0], 0) == round(mat_obj[2][2], 0) == 0:
+                    axis = 1
+                    multiplier = mat_obj[2][1]
+                if round(mat_obj[2][0], 0) == round(mat_obj[2][1], 0) == 0:
+                    axis = 2
+                    multiplier = mat_obj[2][2]
 
-            # Get scale of studio model
-            studio_hip_height = actor.get('hipHeight') if live_data.version <= 2 else actor.get('dimensions').get('hipHeight')
-            if not studio_hip_height:
-                studio_hip_height = 1
+                self.tpose_hip_height = bone_tpose_data['location_object'][axis] * multiplier
 
-            tpose_hip_location_y = bone_tpose_data['location_object'][axis] * multiplier
+    def is_valid(self, obj, with_gloves):
+        return self.with_gloves == with_gloves \
+            and obj.pose.as_pointer() == self.pose_pointer \
+            and obj.data.as_pointer() == self.data_pointer \
+            and self.bone_count == len(obj.pose.bones) \
+            and self.matrix_local == obj.matrix_local
 
-            location_new = pos_hips_studio_to_blender(
-                actor_bone_data['position']['x'] * tpose_hip_location_y / studio_hip_height,
-                actor_bone_data['position']['y'] * tpose_hip_location_y - tpose_hip_location_y * studio_hip_height,
-                actor_bone_data['position']['z'] * tpose_hip_location_y / studio_hip_height)
 
-            bone.location = location_new
+def get_actor_solve(obj, with_gloves):
+    solve = actor_solves.get(obj.name)
+    if solve is None or not solve.is_valid(obj, with_gloves):
+        solve = actor_solves[obj.name] = ActorSolve(obj, with_gloves, live_data.frame.bone_index)
+    return solve
 
-        # Record the data
-        if bpy.context.scene.rsl_recording:
-            recorder.record_bone(live_data.timestamp, obj.name, bone_name_assigned, bone.rotation_euler, location=bone.location if bone_name == 'hip' else None)
+
+def clear_actor_solves(obj_name=None):
+    # Call this when the t-pose or the bone assignment of an armature changes
+    if obj_name is None:
+        actor_solves.clear()
+    else:
+        actor_solves.pop(obj_name, None)
 
 
 def animate_glove(obj):
@@ -234,3 +329,13 @@ def pos_studio_to_blender(x, y, z):
 
 def rot_studio_to_blender(w, x, y, z):
     return w, x, z, -y
+
+
+def rot_to_blender(rot):
+    # Converts an actor bone rotation from Studio to Blender space
+    return Quaternion((
+        rot.w,
+        rot.x,
+        -rot.y,
+        -rot.z,
+    )) @ Quaternion((0, 0, 0, 1))
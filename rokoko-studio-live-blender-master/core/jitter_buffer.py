@@ -0,0 +1,293 @@
+import math
+import time
+import bisect
+import socket
+import struct
+import threading
+import random
+
+from .live_data_manager import get_packet_timestamp
+
+TIMESTAMP_RESET = 1.0  # A packet older than the newest one by more than this (in seconds) means Studio restarted its clock
+OFFSET_RELAX = 0.001   # How fast the clock offset estimate may grow, in seconds per second, to follow clock drift
+QUATERNION_KEYS = {'x', 'y', 'z', 'w'}
+POSITION_KEYS = {'x', 'y', 'z'}
+
+
+# Holds the recently decoded packets and plays them out at a fixed delay.
+# The Studio clock is mapped to the local clock by the fastest observed arrival, so the delay is the amount of network
+# jitter that gets absorbed. On each tick the pose at "now - delay" is interpolated between the two neighbouring packets.
+class JitterBuffer:
+
+    def __init__(self, delay=0.05, capacity=240):
+        self.delay = delay
+        self.capacity = capacity
+        self.lock = threading.Lock()
+        self.reset()
+
+    def reset(self):
+        # Packets sorted by Studio timestamp
+        self.timestamps = []
+        self.packets = []
+
+        # Local arrival time minus Studio timestamp of the fastest and of the latest packet
+        self.offset = None
+        self.last_offset = None
+        self.offset_arrival = 0
+        self.last_arrival = 0
+
+        # Studio time of the last sampled pose and if the newest packet was already played during an underrun
+        self.last_played = None
+        self.holding = False
+
+        # Stats
+        self.received = 0
+        self.played = 0
+        self.underruns = 0  # Ticks where no newer packet than the sampled time had arrived yet
+        self.late = 0       # Packets that arrived after their time was already played
+
+    def push(self, data, arrival=None):
+        timestamp = get_packet_timestamp(data)
+        if timestamp is None:
+            return
+        if arrival is None:
+            arrival = time.perf_counter()
+
+        with self.lock:
+            self.received += 1
+            self.last_arrival = arrival
+
+            # Start over if Studio restarted its clock
+            if self.timestamps and timestamp < self.timestamps[-1] - TIMESTAMP_RESET:
+                received, underruns, late = self.received, self.underruns, self.late
+                self.reset()
+                self.received, self.underruns, self.late = received, underruns, late
+
+            if self.last_played is not None and timestamp <= self.last_played:
+                self.late += 1
+                return
+
+            # Track the lowest delay, slowly letting it grow to follow clock drift
+            offset = arrival - timestamp
+            self.last_offset = offset
+            if self.offset is None:
+                self.offset = offset
+            else:
+                self.offset = min(self.offset + OFFSET_RELAX * (arrival - self.offset_arrival), offset)
+            self.offset_arrival = arrival
+
+            # Insert in timestamp order, packets can arrive out of order
+            index = bisect.bisect_right(self.timestamps, timestamp)
+            self.timestamps.insert(index, timestamp)
+            self.packets.insert(index, data)
+            if len(self.timestamps) > self.capacity:
+                del self.timestamps[0]
+                del self.packets[0]
+
+    def sample(self, now=None):
+        # Returns the packet data at "now - delay", interpolated if needed. None if there is nothing new to play
+        if now is None:
+            now = time.perf_counter()
+
+        with self.lock:
+            if not self.timestamps:
+                return None
+
+            target = now - self.delay - self.offset
+            index = bisect.bisect_right(self.timestamps, target)
+
+            # Still filling the buffer
+            if index == 0:
+                return None
+
+            # Underrun: the next packet is not there yet, play the newest one once and then wait.
+            # The clock offset is resynced to the latest arrival, so a sender that runs slower than its timestamps
+            # does not keep the buffer empty
+            if index == len(self.timestamps):
+                self.underruns += 1
+                self.offset = max(self.offset, self.last_offset)
+                if self.holding:
+                    return None
+                self.holding = True
+                self.last_played = self.timestamps[-1]
+                del self.timestamps[:-1]
+                del self.packets[:-1]
+                self.played += 1
+                return self.packets[-1]
+
+            self.holding = False
+            timestamp_prev = self.timestamps[index - 1]
+            timestamp_next = self.timestamps[index]
+            factor = (target - timestamp_prev) / (timestamp_next - timestamp_prev)
+            data = interpolate_packet(self.packets[index - 1], self.packets[index], factor, target)
+
+            # Packets before the previous neighbour are not needed anymore
+            del self.timestamps[:index - 1]
+            del self.packets[:index - 1]
+
+            self.last_played = target
+            self.played += 1
+            return data
+
+    def is_receiving(self, now=None, timeout=1.0):
+        if now is None:
+            now = time.perf_counter()
+        return now - self.last_arrival < timeout
+
+    def get_stats(self):
+        return self.received, self.played, self.underruns, self.late
+
+
+def interpolate_packet(data_prev, data_next, factor, timestamp):
+    # Interpolates two decoded packets and sets the Studio timestamp of the result
+    data = interpolate_value(data_prev, data_next, factor)
+    if isinstance(data.get('scene'), dict):
+        data['scene']['timestamp'] = timestamp
+    else:
+        data['timestamp'] = timestamp
+    return data
+
+
+def interpolate_value(value_prev, value_next, factor):
+    # Rotations are slerped and positions lerped, everything else is taken from the nearer packet
+    if isinstance(value_prev, dict) and isinstance(value_next, dict):
+        keys = value_prev.keys()
+        if keys == QUATERNION_KEYS and value_next.keys() == QUATERNION_KEYS:
+            return slerp(value_prev, value_next, factor)
+        if keys == POSITION_KEYS and value_next.keys() == POSITION_KEYS:
+            return {key: value_prev[key] + (value_next[key] - value_prev[key]) * factor for key in keys}
+        return {
+            key: interpolate_value(value, value_next[key], factor) if key in value_next else value
+            for key, value in value_prev.items()
+        }
+
+    if isinstance(value_prev, list) and isinstance(value_next, list) and len(value_prev) == len(value_next):
+        # Only pair up entries that describe the same actor, prop or tracker
+        if all(not isinstance(a, dict) or a.get('name') == b.get('name') for a, b in zip(value_prev, value_next)):
+            return [interpolate_value(a, b, factor) for a, b in zip(value_prev, value_next)]
+
+    return value_prev if factor < 0.5 else value_next
+
+
+def slerp(q_prev, q_next, factor):
+    w0, x0, y0, z0 = q_prev['w'], q_prev['x'], q_prev['y'], q_prev['z']
+    w1, x1, y1, z1 = q_next['w'], q_next['x'], q_next['y'], q_next['z']
+
+    # Take the shortest path
+    dot = w0 * w1 + x0 * x1 + y0 * y1 + z0 * z1
+    if dot < 0:
+        w1, x1, y1, z1, dot = -w1, -x1, -y1, -z1, -dot
+
+    if dot > 0.9995:
+        # Nearly identical, lerp and normalize
+        scale_prev, scale_next = 1 - factor, factor
+    else:
+        theta = math.acos(dot)
+        sin_theta = math.sin(theta)
+        scale_prev = math.sin((1 - factor) * theta) / sin_theta
+        scale_next = math.sin(factor * theta) / sin_theta
+
+    w = scale_prev * w0 + scale_next * w1
+    x = scale_prev * x0 + scale_next * x1
+    y = scale_prev * y0 + scale_next * y1
+    z = scale_prev * z0 + scale_next * z1
+    length = math.sqrt(w * w + x * x + y * y + z * z) or 1
+    return {'x': x / length, 'y': y / length, 'z': z / length, 'w': w / length}
+
+
+# Local stand-in for Rokoko Studio: sends captured packets to a UDP port with their original timing,
+# optionally with added network jitter, so the receiver and the jitter buffer can be tested without Studio.
+class UdpReplay(threading.Thread):
+
+    def __init__(self, packets, port, host='127.0.0.1', jitter=0.0, loop=False, seed=0):
+        """
+        :param packets: List of (send time in seconds, raw packet bytes)
+        :param port: Port the receiver listens on
+        :param host: Host the receiver runs on
+        :param jitter: Maximum random delay in seconds added to each packet, delayed packets can overtake others
+        :param loop: Restart from the first packet after the last one
+        :param seed: Seed of the jitter
+        """
+        super().__init__(name='RokokoUdpReplay', daemon=True)
+        self.packets = packets
+        self.address = (host, port)
+        self.jitter = jitter
+        self.loop = loop
+        self.random = random.Random(seed)
+        self.running = True
+        self.sent = 0
+
+    def run(self):
+        sock = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
+        try:
+            while self.running:
+                self.send_all(sock)
+                if not self.loop:
+                    break
+        finally:
+            sock.close()
+
+    def send_all(self, sock):
+        if not self.packets:
+            return
+
+        # Schedule each packet at its capture time plus jitter, then send in schedule order
+        start_time = self.packets[0][0]
+        schedule = sorted(
+            (send_time - start_time + self.random.uniform(0, self.jitter), i)
+            for i, (send_time, packet) in enumerate(self.packets)
+        )
+
+        clock_start = time.perf_counter()
+        for send_time, i in schedule:
+            if not self.running:
+                return
+            wait = clock_start + send_time - time.perf_counter()
+            if wait > 0:
+                time.sleep(wait)
+            sock.sendto(self.packets[i][1], self.address)
+            self.sent += 1
+
+    def stop(self):
+        self.running = False
+        self.join(1)
+
+
+def capture_packets(port, duration, packet_size=81920):
+    # Records raw packets from Rokoko Studio for later replay. Returns a list of (receive time, raw packet bytes)
+    sock = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
+    sock.bind(('', port))
+    sock.settimeout(0.1)
+
+    packets = []
+    end_time = time.perf_counter() + duration
+    try:
+        while time.perf_counter() < end_time:
+            try:
+                data_raw, address = sock.recvfrom(packet_size)
+            except socket.timeout:
+                continue
+            packets.append((time.perf_counter(), data_raw))
+    finally:
+        sock.close()
+    return packets
+
+
+def save_packets(path, packets):
+    with open(path, 'wb') as file:
+        for send_time, packet in packets:
+            file.write(struct.pack('<dI', send_time, len(packet)))
+            file.write(packet)
+
+
+def load_packets(path):
+    packets = []
+    header = struct.calcsize('<dI')
+    with open(path, 'rb') as file:
+        while True:
+            record = file.read(header)
+            if len(record) < header:
+                break
+            send_time, length = struct.unpack('<dI', record)
+            packets.append((send_time, file.read(length)))
+    return packets
@@ -1,4 +1,5 @@
 import json
+import numpy as np
 
 loaded_lz4 = False
 unsupported_os = False
@@ -11,10 +12,133 @@ except ImportError:
     print("Error: LZ4 module didn't load. Unsupported OS!")
     unsupported_os = True
 
+# Faster JSON decoder, used when it is installed
+loaded_orjson = False
+try:
+    import orjson
+    loaded_orjson = True
+except ImportError:
+    pass
+
+LZ4_FRAME_MAGIC = b'\x04\x22\x4d\x18'  # First bytes of every LZ4 frame
+
+
+def decode_packet(data):
+    """
+    Decompress and parse a raw packet. Does not touch any Blender data, so it is safe to call from other threads
+    :param data: The packet as bytes, bytearray or memoryview. A memoryview is not copied, so it can point into a
+                 reused receive buffer, as long as the buffer isn't written to until this returns
+    :return: The decoded packet
+    """
+    # Studio sends LZ4 compressed packets by default, or plain JSON if selected in its Custom panel
+    if data[:4] == LZ4_FRAME_MAGIC:
+        if not loaded_lz4:
+            # Raise an import error if the LZ4 module couldn't be loaded
+            raise ImportError("os" if unsupported_os else "")
+        try:
+            data = frame.decompress(data)
+        except RuntimeError:
+            pass
+
+    data = loads(data)
+    if not data:
+        raise ValueError
+
+    return data
+
+
+def loads(data):
+    if loaded_orjson:
+        # Parses bytes, bytearray and memoryview directly
+        return orjson.loads(data)
+
+    if isinstance(data, memoryview):
+        data = data.tobytes()
+    try:
+        return json.loads(data)
+    except UnicodeDecodeError:
+        raise TypeError('Packet is not valid JSON')
+
+
+def get_packet_timestamp(data):
+    # Studio timestamp of a decoded packet (JSON v2 and v3), None if it has none
+    scene = data.get('scene')
+    if isinstance(scene, dict):
+        return scene.get('timestamp')
+    return data.get('timestamp')
+
+
+def get_index(ids):
+    index = {}
+    for i, item_id in enumerate(ids):
+        index.setdefault(item_id, i)
+    return index
+
+
+class LiveFrame:
+    """Compact per-packet view of the live data: name to index lookups and all values as float arrays."""
+
+    def __init__(self, actors, props, faces, bone_names, shape_names, version):
+        """
+        :param actors: Actors of the packet
+        :param props: List of (prop id, prop) of all props and trackers of the packet
+        :param faces: List of (face id, face) of all faces of the packet
+        :param bone_names: Order of the bones in the bone arrays
+        :param shape_names: Order of the shapes in the face array
+        :param version: JSON version of the packet
+        """
+        # If an id is sent twice, the first one is used
+        self.bone_index = {bone_name: i for i, bone_name in enumerate(bone_names)}
+        self.actor_index = get_index([actor['name'] for actor in actors])
+        self.prop_index = get_index([prop_id for prop_id, prop in props])
+        self.face_index = get_index([face_id for face_id, face in faces])
+
+        # Actors: (n_actors, n_bones, 4) rotations as wxyz, (n_actors, n_bones, 3) positions and which bones were sent
+        self.bone_rotations = np.zeros((len(actors), len(bone_names), 4))
+        self.bone_positions = np.zeros((len(actors), len(bone_names), 3))
+        self.bone_valid = np.zeros((len(actors), len(bone_names)), dtype=bool)
+        self.hip_heights = np.ones(len(actors))
+
+        for actor_i, actor in enumerate(actors):
+            body = actor if version <= 2 else actor['body']
+            hip_height = actor.get('hipHeight') if version <= 2 else actor.get('dimensions', {}).get('hipHeight')
+            if hip_height:
+                self.hip_heights[actor_i] = hip_height
+
+            rotations = self.bone_rotations[actor_i]
+            positions = self.bone_positions[actor_i]
+            valid = self.bone_valid[actor_i]
+            for bone_i, bone_name in enumerate(bone_names):
+                bone = body.get(bone_name)
+                if not bone:
+                    continue
+                rotation = bone['rotation']
+                position = bone['position']
+                rotations[bone_i] = (rotation['w'], rotation['x'], rotation['y'], rotation['z'])
+                positions[bone_i] = (position['x'], position['y'], position['z'])
+                valid[bone_i] = True
+
+        # Props and trackers: (n_props, 3) positions and (n_props, 4) rotations as wxyz
+        self.prop_positions = np.array([
+            (prop['position']['x'], prop['position']['y'], prop['position']['z'])
+            for prop_id, prop in props
+        ], dtype=np.float64).reshape(-1, 3)
+        self.prop_rotations = np.array([
+            (prop['rotation']['w'], prop['rotation']['x'], prop['rotation']['y'], prop['rotation']['z'])
+            for prop_id, prop in props
+        ], dtype=np.float64).reshape(-1, 4)
+
+        # Faces: (n_faces, n_shapes) shape values from 0 to 1
+        self.face_values = np.array([
+            [face.get(shape_name, 0) for shape_name in shape_names]
+            for face_id, face in faces
+        ], dtype=np.float64).reshape(-1, len(shape_names)) / 100
+
 
 class LiveData:
     data = None
     version = 0
+    frame = None
 
     # JSON v2
     timestamp = 0
@@ -28,12 +152,23 @@ class LiveData:
     timestamp_prev = 0
     timedelta_prev = 0
 
+    def __init__(self, bone_names=(), shape_names=()):
+        # Order of the bones and face shapes in the arrays of each LiveFrame
+        self.bone_names = list(bone_names)
+        self.shape_names = list(shape_names)
+
     def init(self, data):
         self.data = data
         self._decode_data()
         self.clear_data()
         self._process_data()
 
+    def init_decoded(self, data):
+        # Same as init, for packets already decoded with decode_packet (e.g. on the receiver thread)
+        self.data = data
+        self.clear_data()
+        self._process_data()
+
     def clear_data(self):
         self.version = 0
 
@@ -43,6 +178,9 @@ class LiveData:
         self.trackers = []
         self.faces = []
         self.actors = []
+        self.frame = None
+        self._props_by_id = []
+        self._faces_by_id = []
 
         # JSON v3
         self.fps = 60
@@ -50,21 +188,7 @@ class LiveData:
         # self.timedelta_prev = 0
 
     def _decode_data(self):
-        try:
-            self.data = frame.decompress(self.data)
-        except (RuntimeError, NameError):
-            pass
-
-        try:
-            self.data = json.loads(self.data)
-        except UnicodeDecodeError as e:
-            if loaded_lz4:
-                raise UnicodeDecodeError
-            # Raise an import error if the LZ4 module couldn't be loaded
-            raise ImportError("os" if unsupported_os else "")
-
-        if not self.data:
-            raise ValueError
+        self.data = decode_packet(self.data)
 
     def _process_data(self):
         self.version = self.data.get('version')
@@ -100,6 +224,14 @@ class LiveData:
 
             self._calc_timestamp()
 
+        # Build the array view of this packet
+        props = [(self.get_prop_id(prop), prop) for prop in self.props]
+        props += [(self.get_prop_id(tracker, is_tracker=True), tracker) for tracker in self.trackers]
+        faces = [(self.get_face_id(face), face) for face in self.faces]
+        self.frame = LiveFrame(self.actors, props, faces, self.bone_names, self.shape_names, self.version)
+        self._props_by_id = props
+        self._faces_by_id = faces
+
     def _calc_timestamp(self):
         timestamp_new = self.data['scene']['timestamp']
         delta = timestamp_new - self.timestamp_prev
@@ -121,16 +253,26 @@ class LiveData:
     # Get data for and from the live data selection lists
 
     def get_actor_by_obj(self, obj):
-        actors = [actor for actor in self.actors if actor['name'] == obj.rsl_animations_actors]
-        return actors[0] if actors else None
+        actor_i = self.get_actor_index(obj)
+        return self.actors[actor_i] if actor_i is not None else None
+
+    def get_actor_index(self, obj):
+        # Index of the actor assigned to this object in the arrays of the current frame
+        if not self.frame:
+            return None
+        return self.frame.actor_index.get(obj.rsl_animations_actors)
 
     def get_actor_id(self, actor):
         return actor['name']
 
     def get_face_by_obj(self, obj):
-        face_id = 'faceId' if self.version <= 2 else 'parentName'
-        faces = [face for face in self.faces if face[face_id] == obj.rsl_animations_faces]
-        return faces[0] if faces else None
+        face_i = self.get_face_index(obj)
+        return self._faces_by_id[face_i][1] if face_i is not None else None
+
+    def get_face_index(self, obj):
+        if not self.frame:
+            return None
+        return self.frame.face_index.get(obj.rsl_animations_faces)
 
     def get_face_id(self, face):
         face_id = 'faceId' if self.version <= 2 else 'parentName'
@@ -141,20 +283,14 @@ class LiveData:
         return face[face_id]
 
     def get_prop_by_obj(self, obj):
-        if self.version <= 2:
-            obj_id = obj.rsl_animations_props_trackers.split('|')
-            obj_type = obj_id[0]
-            obj_name = obj_id[1]
-
-            if obj_type == 'PR':
-                props = [prop for prop in self.props if prop['name'] == obj_name]
-            else:
-                props = [tracker for tracker in self.trackers if tracker['name'] == obj_name]
-
-            return props[0] if props else None
-
-        props = [prop for prop in self.props if prop['name'] == obj.rsl_animations_props_trackers]
-        return props[0] if props else None
+        prop_i = self.get_prop_index(obj)
+        return self._props_by_id[prop_i][1] if prop_i is not None else None
+
+    def get_prop_index(self, obj):
+        # Props and trackers share one index, their ids are the values of the objects selection list
+        if not self.frame:
+            return None
+        return self.frame.prop_index.get(obj.rsl_animations_props_trackers)
 
     def get_prop_id(self, prop, is_tracker=False):
         if self.version <= 2:
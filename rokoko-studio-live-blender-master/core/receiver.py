@@ -2,17 +2,145 @@
 import bpy
 import time
 import socket
+import threading
 import traceback
 from . import animations, utils
+from .live_data_manager import decode_packet, get_packet_timestamp
+from .jitter_buffer import JitterBuffer
 
 error_temp = ''
 show_error = []
 
+PACKET_SIZE = 81920  # Prev 65536
+SOCKET_TIMEOUT = 0.1  # How often the receiver thread checks if it should stop
+TIMESTAMP_RESET = 1.0  # Packets older than the newest one by more than this (in seconds) mean Studio restarted its clock
+
+
+def get_packet_error(e) -> ([str], bool):
+    """
+    Converts an exception raised while decoding or processing a packet into the error message to show
+    and if the error should be forced to show immediately instead of after a couple of packages
+    :param e:
+    :return:
+    """
+    if isinstance(e, ValueError):
+        print('Packet contained no data')
+        print(e)
+        return ['Packets contain no data!'], False
+    if isinstance(e, (UnicodeDecodeError, TypeError)):
+        print('Wrong live data format! Use JSON v2 or higher!')
+        print(e)
+        print(traceback.format_exc())
+        return ['Wrong data format!', 'Use JSON v2 or higher!'], True
+    if isinstance(e, KeyError):
+        print('KeyError:', e)
+        return ['Incompatible JSON version!', 'Use the latest Studio', 'and plugin versions.'], True
+
+    # ImportError: This error occurs specifically when LZ4 isn't supported by the operating system
+    if "os" in e.msg:
+        print('LZ4 unsupported by OS!', 'Use "Json" in the', 'Custom panel in Studio.')
+        return ['LZ4 unsupported by OS!', 'Use "Json" in the', 'Custom panel in Studio.'], True
+
+    # This error occurs, when the LZ4 package could not be loaded while it was needed
+    print('LZ4 unsupported by OS or', 'Blender! Use "Json" in the', 'Custom panel in Studio.')
+    return ['LZ4 unsupported by OS or', 'Blender! Use "Json" in the', 'Custom panel in Studio.'], True
+
+
+PACKET_ERRORS = (ValueError, UnicodeDecodeError, TypeError, KeyError, ImportError)
+
+
+# Drains the socket continuously and decodes the packets in the background.
+# Only the newest decoded packet is kept for the main thread, so the latency stays bounded no matter how the
+# receiver fps relates to the rate Studio sends at.
+class ReceiverThread(threading.Thread):
+
+    def __init__(self, sock, jitter_buffer=None):
+        super().__init__(name='RokokoReceiver', daemon=True)
+        self.sock = sock
+        self.jitter_buffer = jitter_buffer
+        self.running = True
+        self.lock = threading.Lock()
+
+        # Every packet is received into the same buffer and decoded straight from it
+        self.buffer = bytearray(PACKET_SIZE)
+        self.buffer_view = memoryview(self.buffer)
+
+        # Newest packet as (data, error, force_error) and its Studio timestamp
+        self.packet = None
+        self.timestamp = None
+
+        # Packet counters
+        self.received = 0
+        self.dropped = 0  # Replaced by a newer packet before the main thread took them
+        self.stale = 0    # Arrived after a newer packet and got discarded
+
+    def run(self):
+        while self.running:
+            try:
+                size, address = self.sock.recvfrom_into(self.buffer)
+            except socket.timeout:
+                continue
+            except OSError as e:
+                if not self.running:
+                    break
+                print('Packet error:', e.strerror)
+                self.put(None, ['Packets too big!'], True)
+                continue
+
+            try:
+                data = decode_packet(self.buffer_view[:size])
+            except PACKET_ERRORS as e:
+                self.put(None, *get_packet_error(e))
+                continue
+
+            # With a jitter buffer, decoded packets are played out from there
+            if self.jitter_buffer:
+                self.jitter_buffer.push(data)
+                with self.lock:
+                    self.received += 1
+                continue
+
+            self.put(data, None, False)
+
+    def put(self, data, error, force_error):
+        timestamp = get_packet_timestamp(data) if data else None
+
+        with self.lock:
+            self.received += 1
+
+            # Discard packets that were overtaken by a newer one
+            if timestamp is not None and self.timestamp is not None:
+                if self.timestamp - TIMESTAMP_RESET < timestamp < self.timestamp:
+                    self.stale += 1
+                    return
+
+            if self.packet is not None:
+                self.dropped += 1
+            self.packet = (data, error, force_error)
+            if timestamp is not None:
+                self.timestamp = timestamp
+
+    def take(self):
+        # Returns the newest packet as (data, error, force_error), or None if no new packet arrived since the last call
+        with self.lock:
+            packet, self.packet = self.packet, None
+        return packet
+
+    def stop(self):
+        self.running = False
+        self.join(SOCKET_TIMEOUT * 5)
+
 
 # Starts UPD server and handles data received from Rokoko Studio
 class Receiver:
 
     sock = None
+    thread: ReceiverThread = None
+    jitter_buffer: JitterBuffer = None
+
+    # Receive buffer that is reused for every packet
+    buffer = None
+    buffer_view = None
 
     # Redraw counters
     i = -1    # Number of continuous received packets
@@ -23,6 +151,10 @@ class Receiver:
     error_count = 0
 
     def run(self):
+        if self.thread:
+            self.run_threaded()
+            return
+
         data_raw = None
         received = True
         error = []
@@ -30,7 +162,8 @@ class Receiver:
 
         # Try to receive a packet
         try:
-            data_raw, address = self.sock.recvfrom(81920)  # Prev 65536
+            size, address = self.sock.recvfrom_into(self.buffer)
+            data_raw = self.buffer_view[:size]
         except BlockingIOError as e:
             print('Blocking error:', e)
             error = ['Receiving no data!']
@@ -58,6 +191,37 @@ class Receiver:
         self.handle_ui_updates(received)
         self.handle_error(error, force_error)
 
+    def run_threaded(self):
+        error = []
+        force_error = False
+
+        # Get the newest packet the receiver thread decoded since the last tick
+        packet = self.thread.take()
+
+        # With a jitter buffer, play the delayed and interpolated pose instead
+        if self.jitter_buffer:
+            now = time.perf_counter()
+            data = self.jitter_buffer.sample(now)
+            if data:
+                packet = (data, None, False)
+            elif not packet and self.jitter_buffer.is_receiving(now):
+                self.handle_ui_updates(True)
+                self.handle_error(None, False)
+                return
+
+        if packet:
+            data, error, force_error = packet
+            if data:
+                error, force_error = self.process_decoded_data(data)
+        elif not self.thread.is_alive():
+            error = ['Socket not running!']
+            force_error = True
+        else:
+            error = ['Receiving no data!']
+
+        self.handle_ui_updates(True)
+        self.handle_error(error, force_error)
+
     def process_data(self, data_raw) -> ([str], bool):
         """
         Processes the received data. If there was an error it returns a list of strings creating the error message
@@ -67,32 +231,36 @@ class Receiver:
         """
         try:
             animations.live_data.init(data_raw)
-        except ValueError as e:
-            print('Packet contained no data')
-            print(e)
-            return ['Packets contain no data!'], False
-        except (UnicodeDecodeError, TypeError) as e:
-            print('Wrong live data format! Use JSON v2 or higher!')
-            print(e)
-            print(traceback.format_exc())
-            return ['Wrong data format!', 'Use JSON v2 or higher!'], True
-        except KeyError as e:
-            print('KeyError:', e)
-            return ['Incompatible JSON version!', 'Use the latest Studio', 'and plugin versions.'], True
-        except ImportError as e:
-            # This error occurs specifically when LZ4 isn't supported by the operating system
-            if "os" in e.msg:
-                print('LZ4 unsupported by OS!', 'Use "Json" in the', 'Custom panel in Studio.')
-                return ['LZ4 unsupported by OS!', 'Use "Json" in the', 'Custom panel in Studio.'], True
-
-            # This error occurs, when the LZ4 package could not be loaded while it was needed
-            print('LZ4 unsupported by OS or', 'Blender! Use "Json" in the', 'Custom panel in Studio.')
-            return ['LZ4 unsupported by OS or', 'Blender! Use "Json" in the', 'Custom panel in Studio.'], True
+        except PACKET_ERRORS as e:
+            return get_packet_error(e)
 
         animations.animate()
 
         return None, False
 
+    def process_decoded_data(self, data) -> ([str], bool):
+        try:
+            animations.live_data.init_decoded(data)
+        except PACKET_ERRORS as e:
+            return get_packet_error(e)
+
+        animations.animate()
+
+        return None, False
+
+    def get_jitter_stats(self):
+        # Returns the number of played packets, underruns and late packets of the jitter buffer
+        if not self.jitter_buffer:
+            return 0, 0, 0
+        received, played, underruns, late = self.jitter_buffer.get_stats()
+        return played, underruns, late
+
+    def get_packet_stats(self):
+        # Returns the number of received, dropped and stale packets of the receiver thread
+        if not self.thread:
+            return 0, 0, 0
+        return self.thread.received, self.thread.dropped, self.thread.stale
+
     def handle_ui_updates(self, received):
         # Update UI every 5 seconds when packets are received continuously
         if received:
@@ -140,11 +308,25 @@ class Receiver:
             utils.ui_refresh_view_3d()
             print('REFRESH')
 
-    def start(self, port):
+    def start(self, port, threaded=False, jitter_delay=None):
         self.sock = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
-        self.sock.setblocking(False)
         self.sock.bind(('', port))
 
+        self.buffer = bytearray(PACKET_SIZE)
+        self.buffer_view = memoryview(self.buffer)
+
+        # Either receive on a background thread or poll the socket on every timer tick
+        # The jitter buffer needs the receiver thread, as it relies on the arrival time of every packet
+        if threaded:
+            self.jitter_buffer = JitterBuffer(jitter_delay) if jitter_delay is not None else None
+            self.sock.settimeout(SOCKET_TIMEOUT)
+            self.thread = ReceiverThread(self.sock, self.jitter_buffer)
+            self.thread.start()
+        else:
+            self.sock.setblocking(False)
+            self.thread = None
+            self.jitter_buffer = None
+
         self.i = -1
         self.i_np = 0
 
@@ -157,5 +339,9 @@ class Receiver:
         print("Rokoko Studio Live started listening on port " + str(port))
 
     def stop(self):
+        if self.thread:
+            self.thread.stop()
+            self.thread = None
+        self.jitter_buffer = None
         self.sock.close()
         print("Rokoko Studio Live stopped listening")
@@ -1,11 +1,38 @@
 import bpy
-import copy
-from math import radians, degrees
-
-from collections import OrderedDict
+import numpy as np
 
+# Recorded channels: {data_type: {obj_name: {channel_key: RecordedChannel}}}
 recorded_data = {}
-recorded_timestamps = OrderedDict()
+
+# Shared time axis: one entry per received packet, channels refer to it by packet number
+recorded_timestamps = np.empty(0, dtype=np.float64)
+recorded_packet_count = 0
+
+# Value of 'LINEAR' in the Keyframe.interpolation enum
+INTERPOLATION_LINEAR = 1
+
+
+class RecordedChannel:
+    """Growable float32 columns of one recorded channel, one row per packet it was recorded in."""
+
+    def __init__(self, width, capacity=256):
+        self.count = 0
+        self.packets = np.empty(capacity, dtype=np.int32)
+        self.values = np.empty((capacity, width), dtype=np.float32)
+
+    def append(self, packet, values):
+        if self.count == len(self.packets):
+            self.packets = np.resize(self.packets, 2 * self.count)
+            self.values = np.resize(self.values, (2 * self.count, self.values.shape[1]))
+        self.packets[self.count] = packet
+        self.values[self.count] = values
+        self.count += 1
+
+    def get_packets(self):
+        return self.packets[:self.count]
+
+    def get_values(self):
+        return self.values[:self.count]
 
 
 def toggle_recording(self, context):
@@ -32,7 +59,7 @@ def stop_recorder(context):
     context.scene.render.fps = context.scene.rsl_receiver_fps
 
     # Convert timestamps to keyframes to have a shared time axis
-    convert_timestamps_to_keyframes()
+    frames = convert_timestamps_to_keyframes()
 
     # Process each type of recorded data
     for data_type, objects in recorded_data.items():
@@ -40,25 +67,24 @@ def stop_recorder(context):
             continue
 
         if data_type == 'actors':
-            for obj_name, data in objects.items():
-                process_actor_recording(obj_name, data)
+            for obj_name, channels in objects.items():
+                process_actor_recording(obj_name, channels, frames)
 
         elif data_type == 'faces':
-            for obj_name, data in objects.items():
-                process_face_recording(obj_name, data)
+            for obj_name, channels in objects.items():
+                process_face_recording(obj_name, channels, frames)
 
         elif data_type == 'objects':
-            for obj_name, data in objects.items():
-                process_object_recording(obj_name, data)
+            for obj_name, channels in objects.items():
+                process_object_recording(obj_name, channels, frames)
 
     # Clear recorded data
-    recorded_data.clear()
-    recorded_timestamps.clear()
+    clear_recording()
 
     print('\nSuccessfully saved the recording!')
 
 
-def process_actor_recording(obj_name, data):
+def process_actor_recording(obj_name, channels, frames):
     armature = bpy.data.objects.get(obj_name)
     if not armature:
         print('Armature', obj_name, 'not found!')
@@ -69,83 +95,27 @@ def process_actor_recording(obj_name, data):
     action.use_fake_user = True
     armature.animation_data_create().action = action
 
-    # Handle recorded data
-    data_paths = OrderedDict()
-    prev_rotations = {}
-    rotation_modifiers = {}
-    for item in data:
-        bone_name = item["bone_name"]
+    # Go through each recorded bone channel and add all keyframes of its fcurves at once
+    for (bone_name, channel_type), channel in channels.items():
+        packets = channel.get_packets()
 
-        if item['location']:
+        if channel_type == 'location':
             data_path = 'pose.bones["%s"].location' % bone_name
-            if not data_paths.get(data_path):
-                data_paths[data_path] = []
-            data_paths[data_path].append((item['timestamp'], item['location']))
-
-        if item['rotation']:
-            rotation = item['rotation']
-            data_path = 'pose.bones["%s"].rotation_euler' % bone_name
-            if not data_paths.get(data_path):
-                data_paths[data_path] = []
-
-            # Load previous rotation from dict
-            prev_rot = prev_rotations.get(bone_name)
-            if not prev_rot:
-                prev_rot = rotation
-
-            # Fix each rotation axis separately
-            for i in [0, 1, 2]:
-                # Load rotation modifier of the bone rotation axis
-                # The rotation modifier is used to cut down on processing time. It gets set when a axis had been normalized
-                # and then is used to apply the same fix to subsequent rotations. This prevents having to normalize subsequent rotations
-                rotation_mod = rotation_modifiers.get((bone_name, i))
-                if not rotation_mod:
-                    rotation_mod = 0
-
-                # Get axis rotation in degrees, since they are stored as radians. Also add the rotation modifier to the rotation
-                axis = degrees(rotation[i]) + rotation_mod
-                axis_prev = degrees(prev_rot[i])
-
-                # Normalize the rotation
-                axis_normalized, rotation_mod_new = normalize_rotation(axis, axis_prev)
-
-                # Save the normalized axis to the rotation and save the rotation modifier
-                rotation[i] = radians(axis_normalized)
-                rotation_modifiers[bone_name, i] = rotation_mod + rotation_mod_new
-
-            # Save the rotation to the data paths and save the current rotation as the previous rotation
-            data_paths[data_path].append((item['timestamp'], rotation))
-            prev_rotations[bone_name] = rotation
-
-        use_inherit_rotation = False
+            add_fcurves(action, data_path, frames[packets], channel.get_values())
+            continue
+
+        # Fix rotation discontinuities of all axes at once
+        rotations = unwrap_rotations(channel.get_values())
+
+        data_path = 'pose.bones["%s"].rotation_euler' % bone_name
+        add_fcurves(action, data_path, frames[packets], rotations)
+
+        # Disable rotation inheritance while the recording plays
         data_path = 'data.bones["%s"].use_inherit_rotation' % bone_name
-        if not data_paths.get(data_path):
-            data_paths[data_path] = []
-        data_paths[data_path].append((item['timestamp'], [use_inherit_rotation]))
-
-    # Go through each datapath (fcurve) and add all keyframes at once
-    for data_path, values_tmp in data_paths.items():
-        frame_count = len(values_tmp)
-        values_tmp = list(zip(*values_tmp))  # This unzips the list of tuples into two separate lists
-        timestamps = list(values_tmp[0])
-        values = list(values_tmp[1])
-        index_len = len(values[0])
-
-        for axis_i in range(index_len):
-            curve = action.fcurves.new(data_path=data_path, index=axis_i)
-            keyframe_points = curve.keyframe_points
-            keyframe_points.add(frame_count)
-
-            for frame_i in range(frame_count):
-                timestamp = timestamps[frame_i]
-                transform = values[frame_i][axis_i]
-                keyframe_points[frame_i].co = (
-                    recorded_timestamps[timestamp],
-                    transform)
-                keyframe_points[frame_i].interpolation = 'LINEAR'
-
-
-def process_object_recording(obj_name, data):
+        add_fcurves(action, data_path, frames[packets], np.zeros((len(packets), 1), dtype=np.float32))
+
+
+def process_object_recording(obj_name, channels, frames):
     obj = bpy.data.objects.get(obj_name)
     if not obj:
         print('Object', obj_name, 'not found!')
@@ -156,43 +126,12 @@ def process_object_recording(obj_name, data):
     action.use_fake_user = True
     obj.animation_data_create().action = action
 
-    # Handle recording data
-    data_paths = OrderedDict()
-    for item in data:
-        if item['location']:
-            data_path = 'location'
-            if not data_paths.get(data_path):
-                data_paths[data_path] = []
-
-            data_paths[data_path].append((item['timestamp'], item['location']))
-
-        if item['rotation']:
-            data_path = 'rotation_quaternion'
-            if not data_paths.get(data_path):
-                data_paths[data_path] = []
+    for channel_type, channel in channels.items():
+        data_path = 'location' if channel_type == 'location' else 'rotation_quaternion'
+        add_fcurves(action, data_path, frames[channel.get_packets()], channel.get_values())
 
-            data_paths[data_path].append((item['timestamp'], item['rotation']))
 
-    for data_path, values in data_paths.items():
-        # print(data_path)
-        frame_count = len(values)
-        index_len = 3 if data_path.endswith('location') else 4
-
-        for axis_i in range(index_len):
-            curve = action.fcurves.new(data_path=data_path, index=axis_i)
-            keyframe_points = curve.keyframe_points
-            keyframe_points.add(frame_count)
-
-            for frame_i in range(frame_count):
-                timestamp = values[frame_i][0]
-                transform = values[frame_i][1]
-                keyframe_points[frame_i].co = (
-                    recorded_timestamps[timestamp],
-                    transform[axis_i])
-                keyframe_points[frame_i].interpolation = 'LINEAR'
-
-
-def process_face_recording(obj_name, data):
+def process_face_recording(obj_name, channels, frames):
     mesh = bpy.data.objects.get(obj_name)
     if not mesh:
         print('Object', obj_name, 'not found!')
@@ -203,121 +142,104 @@ def process_face_recording(obj_name, data):
     action.use_fake_user = True
     mesh.animation_data_create().action = action
 
-    # Handle recording data
-    data_paths = OrderedDict()
-    for item in data:
-        data_path = 'data.shape_keys.key_blocks["%s"].value' % item['shapekey_name']
-        if not data_paths.get(data_path):
-            data_paths[data_path] = []
+    for shapekey_name, channel in channels.items():
+        data_path = 'data.shape_keys.key_blocks["%s"].value' % shapekey_name
+        add_fcurves(action, data_path, frames[channel.get_packets()], channel.get_values())
 
-        data_paths[data_path].append((item['timestamp'], item['value']))
 
-    for data_path, values in data_paths.items():
-        # print(data_path)
-        frame_count = len(values)
+def add_fcurves(action, data_path, frames, values):
+    # Create one fcurve per value column and fill all its keyframes at once
+    co = np.empty((len(frames), 2), dtype=np.float32)
+    co[:, 0] = frames
+    interpolation = np.full(len(frames), INTERPOLATION_LINEAR, dtype=np.int32)
 
-        curve = action.fcurves.new(data_path=data_path, index=0)
+    for axis_i in range(values.shape[1]):
+        curve = action.fcurves.new(data_path=data_path, index=axis_i)
         keyframe_points = curve.keyframe_points
-        keyframe_points.add(frame_count)
-
-        for frame_i in range(frame_count):
-            timestamp = values[frame_i][0]
-            shapekey_value = values[frame_i][1]
-            keyframe_points[frame_i].co = (
-                recorded_timestamps[timestamp],
-                shapekey_value)
-            keyframe_points[frame_i].interpolation = 'LINEAR'
-
-
-def normalize_rotation(axis, axis_prev):
-    rotation_mod = 0
-    if abs(axis - axis_prev) > 180:
-        desired_axis = axis
-        if axis_prev > axis:
-            while abs(desired_axis - axis_prev) > 180 and axis_prev > axis:
-                print(axis_prev, axis, desired_axis)
-                desired_axis += 360
-                rotation_mod += 360
-            axis = desired_axis
-        else:
-            while abs(desired_axis - axis_prev) > 180 and axis_prev < axis:
-                print(axis_prev, axis, desired_axis)
-                desired_axis -= 360
-                rotation_mod -= 360
-            axis = desired_axis
-    return axis, rotation_mod
+        keyframe_points.add(len(frames))
 
+        co[:, 1] = values[:, axis_i]
+        keyframe_points.foreach_set('co', co.ravel())
+        try:
+            keyframe_points.foreach_set('interpolation', interpolation)
+        except (TypeError, RuntimeError):
+            for keyframe in keyframe_points:
+                keyframe.interpolation = 'LINEAR'
+        curve.update()
 
-def convert_timestamps_to_keyframes():
-    timestamps = list(recorded_timestamps.keys())
 
-    def get_frame(frame_number):
-        return int(round((timestamps[frame_number] - timestamps[0]) * bpy.context.scene.rsl_receiver_fps, 0))
+def unwrap_rotations(rotations):
+    # Shift each angle by multiples of 360 degrees so it stays within 180 degrees of the previous one
+    return np.unwrap(rotations.astype(np.float64), axis=0).astype(np.float32)
+
+
+def convert_timestamps_to_keyframes():
+    timestamps = recorded_timestamps[:recorded_packet_count]
+    raw_frames = np.round((timestamps - timestamps[0]) * bpy.context.scene.rsl_receiver_fps)
+    frames = raw_frames.copy()
 
     # Fix frame numbers that are incorrect because of rounding errors
-    for i, timestamp in enumerate(timestamps):
-        curr_frame = get_frame(i)
+    if len(frames) > 2:
+        prev_frames = raw_frames[:-2]
+        next_frames = raw_frames[2:]
+        curr_frames = raw_frames[1:-1]
+        curr_frames = np.where((prev_frames == curr_frames) & (next_frames == curr_frames + 2), curr_frames + 1, curr_frames)
+        curr_frames = np.where((next_frames == curr_frames) & (prev_frames == curr_frames - 2), curr_frames - 1, curr_frames)
+        frames[1:-1] = curr_frames
 
-        if 0 < i < len(timestamps) - 1:
-            prev_frame = get_frame(i - 1)
-            next_frame = get_frame(i + 1)
-            if prev_frame == curr_frame and next == curr_frame + 2:
-                curr_frame += 1
-            if next_frame == curr_frame and prev_frame == curr_frame - 2:
-                curr_frame -= 1
+    if len(frames) > 1 and raw_frames[-2] == raw_frames[-1]:
+        frames[-1] += 1
 
-        if i == len(timestamps) - 1:
-            prev_frame = get_frame(i - 1)
-            if prev_frame == curr_frame:
-                curr_frame += 1
+    return frames.astype(np.float32)
 
-        recorded_timestamps[timestamp] = curr_frame
 
+def get_packet_index(timestamp):
+    # All data of one packet shares its timestamp, a new timestamp starts a new packet
+    global recorded_timestamps, recorded_packet_count
+    if recorded_packet_count and recorded_timestamps[recorded_packet_count - 1] == timestamp:
+        return recorded_packet_count - 1
 
-def record_bone(timestamp, arm_name, bone_name, rotation, location=None):
-    if not recorded_data.get('actors'):
-        recorded_data['actors'] = {}
-    if not recorded_data['actors'].get(arm_name):
-        recorded_data['actors'][arm_name] = []
+    if recorded_packet_count == len(recorded_timestamps):
+        recorded_timestamps = np.resize(recorded_timestamps, max(1024, 2 * recorded_packet_count))
+    recorded_timestamps[recorded_packet_count] = timestamp
+    recorded_packet_count += 1
+    return recorded_packet_count - 1
 
-    data = {
-        'timestamp': timestamp,
-        'bone_name': bone_name,
-        'rotation': copy.deepcopy(rotation),
-        'location': copy.deepcopy(location)
-    }
 
-    recorded_data['actors'][arm_name].append(data)
-    recorded_timestamps[timestamp] = 0
+def get_channel(data_type, obj_name, channel_key, width):
+    channels = recorded_data.setdefault(data_type, {}).setdefault(obj_name, {})
+    channel = channels.get(channel_key)
+    if channel is None:
+        channel = channels[channel_key] = RecordedChannel(width)
+    return channel
 
 
-def record_face(timestamp, mesh_name, shapekey_name, value):
-    if not recorded_data.get('faces'):
-        recorded_data['faces'] = {}
-    if not recorded_data['faces'].get(mesh_name):
-        recorded_data['faces'][mesh_name] = []
+def get_recording_duration():
+    if recorded_packet_count < 2:
+        return 0
+    return recorded_timestamps[recorded_packet_count - 1] - recorded_timestamps[0]
+
+
+def clear_recording():
+    global recorded_timestamps, recorded_packet_count
+    recorded_data.clear()
+    recorded_timestamps = np.empty(0, dtype=np.float64)
+    recorded_packet_count = 0
 
-    data = {
-        'timestamp': timestamp,
-        'shapekey_name': shapekey_name,
-        'value': copy.deepcopy(value)
-    }
 
-    recorded_data['faces'][mesh_name].append(data)
-    recorded_timestamps[timestamp] = 0
+def record_bone(timestamp, arm_name, bone_name, rotation, location=None):
+    packet = get_packet_index(timestamp)
+    get_channel('actors', arm_name, (bone_name, 'rotation'), 3).append(packet, rotation)
+    if location is not None:
+        get_channel('actors', arm_name, (bone_name, 'location'), 3).append(packet, location)
+
+
+def record_face(timestamp, mesh_name, shapekey_name, value):
+    packet = get_packet_index(timestamp)
+    get_channel('faces', mesh_name, shapekey_name, 1).append(packet, value)
 
 
 def record_object(timestamp, obj_name, rotation, location):
-    if not recorded_data.get('objects'):
-        recorded_data['objects'] = {}
-    if not recorded_data['objects'].get(obj_name):
-        recorded_data['objects'][obj_name] = []
-
-    data = {
-        'timestamp': timestamp,
-        'rotation': copy.deepcopy(rotation),
-        'location': copy.deepcopy(location)
-    }
-
-    recorded_data['objects'][obj_name].append(data)
-    recorded_timestamps[timestamp] = 0
+    packet = get_packet_index(timestamp)
+    get_channel('objects', obj_name, 'location', 3).append(packet, location)
+    get_channel('objects', obj_name, 'rotation', 4).append(packet, rotation)
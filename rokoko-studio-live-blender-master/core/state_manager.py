@@ -1,7 +1,7 @@
 import bpy
 import copy
 
-from . import utils
+from . import utils, subscriptions, animations
 from ..operators import receiver
 
 objects = {}
@@ -185,6 +185,7 @@ def update_object(self, context):
         return
 
     obj = context.object
+    subscriptions.bind(obj, 'props_trackers')
     new_state = obj.rsl_animations_props_trackers
 
     if new_state != 'None':
@@ -199,6 +200,8 @@ def update_face(self, context):
         return
 
     obj = context.object
+    subscriptions.bind(obj, 'faces')
+    animations.clear_face_solves(obj.name)
     new_state = obj.rsl_animations_faces
 
     if new_state != 'None':
@@ -213,6 +216,8 @@ def update_actor(self, context):
         return
 
     obj = context.object
+    subscriptions.bind(obj, 'actors')
+    animations.clear_actor_solves(obj.name)
     new_state = obj.rsl_animations_actors
 
     if new_state != 'None':
@@ -222,6 +227,16 @@ def update_actor(self, context):
         load_armature(obj)
 
 
+def update_face_shape(self, context):
+    # The assigned shapekeys changed, the shapekey mapping of this mesh has to be recomputed
+    animations.clear_face_solves(self.name)
+
+
+def update_actor_bone(self, context):
+    # The assigned bones changed, the retargeting data of this armature has to be recomputed
+    animations.clear_actor_solves(self.name)
+
+
 def update_glove(self, context):
     if not receiver.receiver_enabled:
         return
@@ -0,0 +1,113 @@
+import bpy
+
+# Index of the objects bound to live data, so animating a packet only touches those objects instead of the whole scene
+# {kind: {live data id: [object names]}}
+bound_objects = {
+    'props_trackers': {},
+    'faces': {},
+    'actors': {},
+}
+
+# {object name: {kind: live data id}}
+object_bindings = {}
+
+# Number of objects in the blend file when the index was built. A different count means objects were added,
+# duplicated or deleted since, which the property update callbacks don't catch
+indexed_object_count = -1
+needs_rebuild = True
+
+# Ids of the live data when the index was built. The binding properties are dynamic enums that store an item index,
+# not the id, so the id an object reads as bound to changes whenever the live data ids change
+indexed_live_data_ids = None
+
+BINDING_PROPERTIES = {
+    'props_trackers': 'rsl_animations_props_trackers',
+    'faces': 'rsl_animations_faces',
+    'actors': 'rsl_animations_actors',
+}
+BINDING_TYPES = {
+    'props_trackers': None,
+    'faces': 'MESH',
+    'actors': 'ARMATURE',
+}
+
+
+def rebuild(live_data_ids=None):
+    global indexed_object_count, needs_rebuild, indexed_live_data_ids
+
+    for objects in bound_objects.values():
+        objects.clear()
+    object_bindings.clear()
+
+    for obj in bpy.data.objects:
+        for kind in bound_objects.keys():
+            bind(obj, kind)
+
+    indexed_object_count = len(bpy.data.objects)
+    indexed_live_data_ids = live_data_ids
+    needs_rebuild = False
+
+
+def invalidate():
+    # Rebuilds the index with the next frame. Used when the live data is cleared, because the binding properties
+    # can only be read back once the live data ids they refer to are known again
+    global needs_rebuild
+    needs_rebuild = True
+
+
+def get_live_data_ids(frame):
+    return tuple(frame.prop_index), tuple(frame.face_index), tuple(frame.actor_index)
+
+
+def ensure_index(frame):
+    # Rebuilds the index if objects were added or removed, or the live data ids changed since it was built
+    live_data_ids = get_live_data_ids(frame)
+    if needs_rebuild or live_data_ids != indexed_live_data_ids or len(bpy.data.objects) != indexed_object_count:
+        rebuild(live_data_ids)
+
+
+def bind(obj, kind):
+    # Adds or moves the object in the index according to its current binding property
+    unbind(obj.name, kind)
+
+    object_type = BINDING_TYPES[kind]
+    if object_type and obj.type != object_type:
+        return
+
+    live_data_id = getattr(obj, BINDING_PROPERTIES[kind])
+    if not live_data_id or live_data_id == 'None':
+        return
+
+    bound_objects[kind].setdefault(live_data_id, []).append(obj.name)
+    object_bindings.setdefault(obj.name, {})[kind] = live_data_id
+
+
+def unbind(obj_name, kind):
+    live_data_id = object_bindings.get(obj_name, {}).pop(kind, None)
+    if live_data_id is None:
+        return
+
+    names = bound_objects[kind].get(live_data_id)
+    if names and obj_name in names:
+        names.remove(obj_name)
+        if not names:
+            bound_objects[kind].pop(live_data_id)
+
+
+def get_bound_objects(kind, live_data_id):
+    # Returns the objects bound to this live data id
+    global needs_rebuild
+
+    names = bound_objects[kind].get(live_data_id)
+    if not names:
+        return []
+
+    objects = []
+    for name in names:
+        obj = bpy.data.objects.get(name)
+        if obj is None:
+            # The object was renamed or deleted, rebuild the index before the next packet
+            needs_rebuild = True
+            continue
+        objects.append(obj)
+    return objects
@@ -2,6 +2,7 @@ import bpy
 import copy
 
 from . import receiver
+from ..core import animations
 
 
 class InitTPose(bpy.types.Operator):
@@ -46,6 +47,7 @@ class InitTPose(bpy.types.Operator):
         # Save tpose data to custom data
         custom_data['rsl_tpose_bones'] = copy.deepcopy(bones)
         obj['CUSTOM'] = custom_data
+        animations.clear_actor_solves(obj.name)
 
         self.report({'INFO'}, 'T-Pose successfully saved!')
         return {'FINISHED'}
@@ -2,7 +2,7 @@ import bpy
 import time
 from threading import Thread
 
-from ..core import state_manager
+from ..core import state_manager, subscriptions
 from ..core.receiver import Receiver
 from ..core.utils import ui_refresh_all
 from ..core.animations import clear_animations
@@ -37,7 +37,8 @@ class ReceiverStart(bpy.types.Operator):
 
         # Start the receiver
         try:
-            receiver.start(context.scene.rsl_receiver_port)
+            jitter_delay = context.scene.rsl_jitter_buffer_delay / 1000 if context.scene.rsl_jitter_buffer else None
+            receiver.start(context.scene.rsl_receiver_port, threaded=context.scene.rsl_receiver_threaded, jitter_delay=jitter_delay)
         except OSError as e:
             print('Socket error:', e.strerror)
             self.report({'ERROR'}, 'This port is already in use!')
@@ -55,6 +56,9 @@ class ReceiverStart(bpy.types.Operator):
         # Save the scene
         state_manager.save_scene()
 
+        # Index the objects bound to live data once the first packet arrived, the bindings can't be read before
+        subscriptions.invalidate()
+
         # Register this classes modal operator in Blenders event handling system and execute it at the specified fps
         context.window_manager.modal_handler_add(self)
         timer = context.window_manager.event_timer_add(1 / context.scene.rsl_receiver_fps, window=bpy.context.window)
@@ -65,6 +65,17 @@ class ReceiverPanel(ToolPanel, bpy.types.Panel):
         row = layout.row(align=True)
         row.prop(context.scene, 'rsl_hide_mesh_during_play')
 
+        row = layout.row(align=True)
+        row.enabled = not receiver.receiver_enabled
+        row.prop(context.scene, 'rsl_receiver_threaded')
+
+        row = layout.row(align=True)
+        row.enabled = not receiver.receiver_enabled and context.scene.rsl_receiver_threaded
+        row.prop(context.scene, 'rsl_jitter_buffer')
+        sub = row.row(align=True)
+        sub.enabled = context.scene.rsl_jitter_buffer
+        sub.prop(context.scene, 'rsl_jitter_buffer_delay', text='')
+
         row = layout.row(align=True)
         row.scale_y = 1.3
         if receiver.receiver_enabled:
@@ -72,6 +83,19 @@ class ReceiverPanel(ToolPanel, bpy.types.Panel):
         else:
             row.operator(receiver.ReceiverStart.bl_idname, icon='PLAY')
 
+        # Show how many packets the background receiver skipped
+        if receiver.receiver_enabled and receiver.receiver.thread:
+            received, dropped, stale = receiver.receiver.get_packet_stats()
+            row = layout.row(align=True)
+            row.scale_y = 0.6
+            row.label(text='Packets: %d | Dropped: %d | Stale: %d' % (received, dropped, stale))
+
+            if receiver.receiver.jitter_buffer:
+                played, underruns, late = receiver.receiver.get_jitter_stats()
+                row = layout.row(align=True)
+                row.scale_y = 0.6
+                row.label(text='Played: %d | Underruns: %d | Late: %d' % (played, underruns, late))
+
         row = layout.row(align=True)
         row.scale_y = 1.3
         row.enabled = receiver.receiver_enabled
@@ -81,9 +105,8 @@ class ReceiverPanel(ToolPanel, bpy.types.Panel):
             row.operator(recorder.RecorderStop.bl_idname, icon='SNAP_FACE', depress=True)
 
             # Calculate recording time
-            timestamps = list(recorder_manager.recorded_timestamps.keys())
-            if timestamps:
-                time_recorded = int(timestamps[-1] - timestamps[0])
+            if recorder_manager.recorded_packet_count:
+                time_recorded = int(recorder_manager.get_recording_duration())
                 row = layout.row(align=True)
                 row.label(text='Recording time: ' + str(datetime.timedelta(seconds=time_recorded)))
 
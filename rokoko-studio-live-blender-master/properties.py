@@ -21,6 +21,27 @@ def register():
         min=1,
         max=100
     )
+    Scene.rsl_receiver_threaded = BoolProperty(
+        name='Background Receiver',
+        description='Receive and decode the data on a background thread and only apply the newest packet on each update.'
+                    '\nKeeps the delay low when Rokoko Studio sends faster or slower than the receiver FPS',
+        default=True
+    )
+    Scene.rsl_jitter_buffer = BoolProperty(
+        name='Jitter Buffer',
+        description='Play the data back with a fixed delay and interpolate between packets.'
+                    '\nSmooths out stutter from network jitter and packet bursts. Needs the background receiver',
+        default=False
+    )
+    Scene.rsl_jitter_buffer_delay = FloatProperty(
+        name='Delay (ms)',
+        description='Playout delay of the jitter buffer in milliseconds.'
+                    '\nHigher values absorb more network jitter but add latency',
+        default=50,
+        min=0,
+        max=500,
+        precision=0
+    )
     Scene.rsl_scene_scaling = FloatProperty(
         name='Scene Scaling',
         description="This allows you to scale the position of props and trackers."
@@ -144,12 +165,14 @@ def register():
     for shape in animation_lists.face_shapes:
         setattr(Object, 'rsl_face_' + shape, StringProperty(
             name=shape,
-            description='Select the shapekey that should be animated by this shape'
+            description='Select the shapekey that should be animated by this shape',
+            update=state_manager.update_face_shape
         ))
 
     # Actor bones
     for bone in animation_lists.get_bones().keys():
         setattr(Object, 'rsl_actor_' + bone, StringProperty(
             name=bone,
-            description='Select the bone that corresponds to the actors bone'
+            description='Select the bone that corresponds to the actors bone',
+            update=state_manager.update_actor_bone
         ))
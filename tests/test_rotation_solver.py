@@ -0,0 +1,152 @@
+"""
+Parity tests for the batched rotation solver in utils/coords.py.
+
+The batched NumPy functions must match the scalar mathutils functions they
+replace, including the zero-length, parallel and anti-parallel inputs the
+scalar code special-cases. Skipped where mathutils isn't installed (it
+ships with Blender, or as the standalone 'mathutils' package).
+
+    python -m pytest tests
+"""
+
+import importlib.util
+from pathlib import Path
+
+import numpy as np
+import pytest
+
+mathutils = pytest.importorskip("mathutils")
+Vector = mathutils.Vector
+
+
+# Load coords.py on its own: the add-on package's __init__ imports bpy
+_COORDS_PATH = Path(__file__).resolve().parents[1] / "live_mocap_addon" / "utils" / "coords.py"
+_spec = importlib.util.spec_from_file_location("live_mocap_coords", _COORDS_PATH)
+coords = importlib.util.module_from_spec(_spec)
+_spec.loader.exec_module(coords)
+
+
+TOLERANCE = 1e-4  # mathutils works in float32
+COUNT = 500
+
+
+def quaternion_errors(batch, scalars):
+    """Sign-invariant distance per row (q and -q are the same rotation)."""
+    expected = np.array([tuple(q) for q in scalars])
+    return np.minimum(np.abs(batch - expected).max(axis=1), np.abs(batch + expected).max(axis=1))
+
+
+def random_vectors(count, seed):
+    return np.random.default_rng(seed).normal(size=(count, 3))
+
+
+def edge_case_directions():
+    """Directions the scalar direction_to_quaternion special-cases."""
+    return np.array([
+        (0.0, 0.0, 1.0),        # parallel to default up
+        (0.0, 0.0, -3.0),       # anti-parallel to default up
+        (0.0, 0.0, 0.0),        # zero length
+        (0.0005, 0.0, 0.0),     # below length threshold
+        (1.0, 0.0, 0.0),
+        (0.0, 1.0, 0.0),
+        (0.0, -1.0, 0.0),
+        (1e-4, 1e-4, 1.0),      # nearly parallel to default up
+    ])
+
+
+def scalar_directions(directions, up_hints=None):
+    result = []
+    for i, direction in enumerate(directions):
+        up = None
+        if up_hints is not None:
+            up = Vector(up_hints if np.ndim(up_hints) == 1 else up_hints[i])
+        result.append(coords.direction_to_quaternion(Vector(direction), up))
+    return result
+
+
+def scalar_two_vectors(vec_from, vec_to):
+    return [coords.quaternion_from_two_vectors(Vector(a), Vector(b)) for a, b in zip(vec_from, vec_to)]
+
+
+@pytest.mark.parametrize("directions", [
+    random_vectors(COUNT, seed=0),
+    edge_case_directions(),
+], ids=["random", "edge_cases"])
+def test_directions_default_up(directions):
+    batch = coords.directions_to_quaternions(directions)
+    assert batch.shape == (len(directions), 4)
+    assert quaternion_errors(batch, scalar_directions(directions)).max() < TOLERANCE
+
+
+@pytest.mark.parametrize("up_hint", [
+    np.array((1.0, 0.0, 0.0)),
+    np.array((0.0, 0.0, 2.0)),
+    np.array((0.95, 0.3, 0.0)),  # selects the other fallback axis
+], ids=["x", "z_unnormalized", "mostly_x"])
+def test_directions_fixed_up(up_hint):
+    directions = np.concatenate([
+        random_vectors(COUNT, seed=1),
+        edge_case_directions(),
+        up_hint[np.newaxis] * 2.0,              # parallel to the hint
+        -up_hint[np.newaxis],                   # anti-parallel to the hint
+    ])
+    batch = coords.directions_to_quaternions(directions, up_hint)
+    assert quaternion_errors(batch, scalar_directions(directions, up_hint)).max() < TOLERANCE
+
+
+def test_directions_per_row_up():
+    directions = random_vectors(COUNT, seed=2)
+    up_hints = random_vectors(COUNT, seed=3)
+    up_hints[:10] = directions[:10] * 3.0       # parallel
+    up_hints[10:20] = -directions[10:20]        # anti-parallel
+    batch = coords.directions_to_quaternions(directions, up_hints)
+    assert quaternion_errors(batch, scalar_directions(directions, up_hints)).max() < TOLERANCE
+
+
+def test_degenerate_directions_are_identity():
+    batch = coords.directions_to_quaternions(np.array([(0.0, 0.0, 0.0), (0.0, 0.0005, 0.0)]))
+    np.testing.assert_allclose(batch, [(1.0, 0.0, 0.0, 0.0)] * 2)
+
+
+def test_two_vectors_random():
+    vec_from = random_vectors(COUNT, seed=4)
+    vec_to = random_vectors(COUNT, seed=5)
+    batch = coords.quaternions_from_two_vectors(vec_from, vec_to)
+    assert batch.shape == (COUNT, 4)
+    assert quaternion_errors(batch, scalar_two_vectors(vec_from, vec_to)).max() < TOLERANCE
+
+
+def test_two_vectors_parallel():
+    vec_from = random_vectors(50, seed=6)
+    vec_to = vec_from * 2.5
+    batch = coords.quaternions_from_two_vectors(vec_from, vec_to)
+    assert quaternion_errors(batch, scalar_two_vectors(vec_from, vec_to)).max() < TOLERANCE
+    np.testing.assert_allclose(batch, np.tile((1.0, 0.0, 0.0, 0.0), (50, 1)))
+
+
+def test_two_vectors_antiparallel():
+    vec_from = np.concatenate([
+        random_vectors(50, seed=7),
+        np.array([(1.0, 0.0, 0.0), (-2.0, 0.0, 0.0), (0.0, 0.0, 1.0)]),  # both helper axes
+    ])
+    vec_to = -vec_from
+    batch = coords.quaternions_from_two_vectors(vec_from, vec_to)
+    assert quaternion_errors(batch, scalar_two_vectors(vec_from, vec_to)).max() < TOLERANCE
+
+    # A half turn maps every source direction onto its opposite
+    rotated = [Vector(a).copy() for a in vec_from]
+    for vector, q in zip(rotated, batch):
+        vector.rotate(mathutils.Quaternion(q))
+    np.testing.assert_allclose(np.array([tuple(v) for v in rotated]), vec_to, atol=1e-4)
+
+
+def test_two_vectors_zero_length():
+    vec_from = np.array([(0.0, 0.0, 0.0), (1.0, 2.0, 3.0), (0.0, 0.0, 0.0)])
+    vec_to = np.array([(1.0, 0.0, 0.0), (0.0, 0.0, 0.0), (0.0, 0.0, 0.0)])
+    batch = coords.quaternions_from_two_vectors(vec_from, vec_to)
+    np.testing.assert_allclose(batch, np.tile((1.0, 0.0, 0.0, 0.0), (3, 1)))
+
+    # The scalar version has no defined result here
+    for a, b in zip(vec_from, vec_to):
+        with pytest.raises(ValueError):
+            coords.quaternion_from_two_vectors(Vector(a), Vector(b))